@@ -1,13 +1,15 @@
 import random
 import pygame
+import text_render
+from gfx_cache import BACKGROUNDS
 
 
 def run(screen) -> None:
     clock = pygame.time.Clock()
     w, h = screen.get_size()
 
-    font_big = pygame.font.SysFont("consolas", 40, bold=True)
-    font = pygame.font.SysFont("consolas", 22)
+    font_big = text_render.FONTS.sys("consolas", 40, bold=True)
+    font = text_render.FONTS.sys("consolas", 22)
 
     # --- Player ---
     player = pygame.Rect(0, 0, 18, 18)
@@ -58,6 +60,20 @@ def run(screen) -> None:
     RED_MIN, RED_MAX = 30, 100
     GREEN_MIN, GREEN_MAX = 70, 150
     BLUE_MIN, BLUE_MAX = 30, 70  # much smaller
+    def draw_backdrop(surf):
+        w, h = surf.get_size()
+        surf.fill((10, 10, 18))
+
+        grid_gap = 64
+        for x in range(0, w, grid_gap):
+            pygame.draw.line(surf, (255, 255, 255), (x, 0), (x, h), 1)
+        for y in range(0, h, grid_gap):
+            pygame.draw.line(surf, (255, 255, 255), (0, y), (w, y), 1)
+
+        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 210))
+        surf.blit(overlay, (0, 0))
+
     def circle_collide(r1: pygame.Rect, r2: pygame.Rect) -> bool:
         c1x, c1y = r1.center
         c2x, c2y = r2.center
@@ -181,18 +197,8 @@ def run(screen) -> None:
                         orbs.remove(o)
 
         # --- Draw ---
-        screen.fill((10, 10, 18))
-
-        # subtle background grid
-        grid_gap = 64
-        for x in range(0, w, grid_gap):
-            pygame.draw.line(screen, (255, 255, 255), (x, 0), (x, h), 1)
-        for y in range(0, h, grid_gap):
-            pygame.draw.line(screen, (255, 255, 255), (0, y), (w, y), 1)
-
-        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 210))
-        screen.blit(overlay, (0, 0))
+        # subtle background grid (ritas en gång per upplösning)
+        BACKGROUNDS.blit(screen, "asteroid", draw_backdrop)
 
         # orbs
         for o in orbs:
@@ -224,19 +230,15 @@ def run(screen) -> None:
             pygame.draw.circle(screen, (140, 200, 255), (cx, cy), rad + 6, 1)
 
         # HUD
-        s = font.render(f"SCORE: {score:0.1f}", True, (230, 230, 240))
-        b = font.render(f"BEST:  {best:0.1f}", True, (180, 180, 200))
-        screen.blit(s, (24, 18))
-        screen.blit(b, (24, 44))
+        text_render.glyphs(font, (230, 230, 240)).draw(screen, f"SCORE: {score:0.1f}", (24, 18))
+        text_render.glyphs(font, (180, 180, 200)).draw(screen, f"BEST:  {best:0.1f}", (24, 44))
 
         if shield_time > 0 and not dead:
-            sh = font.render(f"SHIELD: {shield_time:0.1f}s", True, (160, 210, 255))
-            screen.blit(sh, (24, 70))
+            text_render.glyphs(font, (160, 210, 255)).draw(screen, f"SHIELD: {shield_time:0.1f}s", (24, 70))
 
         if dead:
-            msg = font_big.render("GAME OVER", True, (240, 240, 255))
-            screen.blit(msg, msg.get_rect(center=(w // 2, int(h * 0.42))))
-            msg2 = font.render("Enter/Space = retry   ESC = tillbaka", True, (200, 200, 215))
-            screen.blit(msg2, msg2.get_rect(center=(w // 2, int(h * 0.50))))
+            text_render.glyphs(font_big, (240, 240, 255)).draw_centered(screen, "GAME OVER", (w // 2, int(h * 0.42)))
+            text_render.glyphs(font, (200, 200, 215)).draw_centered(
+                screen, "Enter/Space = retry   ESC = tillbaka", (w // 2, int(h * 0.50)))
 
         pygame.display.flip()
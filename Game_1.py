@@ -2,7 +2,15 @@ import os
 import random
 import pygame
 import math
+import numpy as np
 import joystick_keys as jk
+import text_render
+from gfx_cache import TRANSFORMS
+from quality import GOVERNOR
+from atlas import ATLASES
+from present import alpha_kind
+from particles import ParticleSystem, rng
+from sprite_batch import STAMPS
 
 def run(screen):
     # ----------------------------
@@ -25,42 +33,56 @@ def run(screen):
     # Init
     # ----------------------------
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont("consolas", 26, bold=True)
+    font = text_render.FONTS.sys("consolas", 26, bold=True)
+    # Loopen tickar i 120, men kvaliteten ska bara sänkas om vi tappar 60.
+    GOVERNOR.set_fps(60)
+    hud_main = text_render.glyphs(font, (245, 245, 255))
+    hud_sub = text_render.glyphs(font, (180, 180, 210))
 
     W, H = screen.get_size()
 
     # ----------------------------
-    # Load images
+    # Load + scale images (en atlas per upplösning)
     # ----------------------------
     def load_img(name):
         return pygame.image.load(asset_path(name)).convert_alpha()
 
-    # bird variants
-    bird_base_img = load_img("bird_base.png")
-    bird_power_img = load_img("bird.png")
-
-    pipe_img = load_img("pipe.png")
-    base_img = load_img("base.png")
-    bg_img = load_img("bg.png")
-
-    # ----------------------------
-    # Scale
-    # ----------------------------
     def scale_to_height(img, target_h):
         w = int(img.get_width() * (target_h / img.get_height()))
         return pygame.transform.smoothscale(img, (w, int(target_h)))
 
-    base_h = int(H * 0.15)
-    base_img = scale_to_height(base_img, base_h)
+    def scaled(name, target_h):
+        # Alpha-sorten klassas på källbilden: den avgör formatet i atlasen
+        # (bg/base -> convert(), rör/fågel -> colorkey).
+        img = load_img(name)
+        return scale_to_height(img, target_h), alpha_kind(img)
+
+    def build_sprites(atlas):
+        bird_h = int(H * 0.055)
+        pipe_img, pipe_kind = scaled("pipe.png", int(H * 0.88))
+        atlas.add("bird_base", *scaled("bird_base.png", bird_h))
+        atlas.add("bird_power", *scaled("bird.png", bird_h))
+        atlas.add("pipe", pipe_img, pipe_kind)
+        atlas.add("pipe_top", pygame.transform.flip(pipe_img, False, True), pipe_kind)
+        atlas.add("base", *scaled("base.png", int(H * 0.15)))
+        # Helskärmsbakgrunden delar inte ark med sprites (eget ark, exakt storlek).
+        atlas.add("bg", *scaled("bg.png", H), own_sheet=True)
+
+    sprites = ATLASES.get(("flappy", W, H), build_sprites)
 
-    bg_img = scale_to_height(bg_img, H)
+    # bird variants
+    bird_base_img = sprites.region("bird_base")
+    bird_power_img = sprites.region("bird_power")
 
-    pipe_h = int(H * 0.88)
-    pipe_img = scale_to_height(pipe_img, pipe_h)
+    pipe_img = sprites.region("pipe")
+    pipe_top_img = sprites.region("pipe_top")
+    base_img = sprites.region("base")
+    bg_img = sprites.region("bg")
 
-    bird_h = int(H * 0.055)
-    bird_base_img = scale_to_height(bird_base_img, bird_h)
-    bird_power_img = scale_to_height(bird_power_img, bird_h)
+    # Fågelns lutning är -25..70 grader (blittas som -bird_rot): rotera alla
+    # kvantiserade vinklar en gång här i stället för transform.rotate per frame.
+    for img in (bird_base_img, bird_power_img):
+        TRANSFORMS.prewarm(img, -70.0, 25.0)
 
     # ----------------------------
     # Game constants
@@ -107,69 +129,50 @@ def run(screen):
     # ----------------------------
     # FX: simple "explosion" on bird swap
     # ----------------------------
-    particles = []  # each: {x,y,vx,vy,life,ttl,size}
+    FX_COLOR = (255, 230, 140)
+    particles = ParticleSystem(drag=0.9)  # slight drag
     swap_fx_time = 0.0  # ring/flash timer
 
+    # Blixten: en ogenomskinlig yta, ytalpha sätts per frame.
+    flash = pygame.Surface((W, H)).convert()
+    flash.fill(FX_COLOR)
+
     def spawn_swap_explosion(cx, cy):
         nonlocal swap_fx_time
         swap_fx_time = 0.35  # ring duration
 
-        for _ in range(28):
-            ang = random.uniform(0, math.tau)
-            spd = random.uniform(220.0, 520.0)
-            vx = math.cos(ang) * spd
-            vy = math.sin(ang) * spd
-            ttl = random.uniform(0.25, 0.55)
-            particles.append({
-                "x": float(cx),
-                "y": float(cy),
-                "vx": vx,
-                "vy": vy,
-                "life": ttl,
-                "ttl": ttl,
-                "size": random.uniform(2.0, 5.0),
-            })
+        n = max(4, int(28 * GOVERNOR.get("particles", 1.0)))
+        r = rng()
+        ang = r.uniform(0, math.tau, n)
+        spd = r.uniform(220.0, 520.0, n)
+        particles.emit(float(cx), float(cy), np.cos(ang) * spd, np.sin(ang) * spd,
+                       r.uniform(0.25, 0.55, n), r.uniform(2.0, 5.0, n), FX_COLOR)
 
     def update_fx(dt):
-        nonlocal swap_fx_time, particles
+        nonlocal swap_fx_time
         if swap_fx_time > 0:
             swap_fx_time = max(0.0, swap_fx_time - dt)
+        particles.update(dt)
 
-        newp = []
-        for p in particles:
-            p["life"] -= dt
-            if p["life"] <= 0:
-                continue
-            # slight drag
-            p["vx"] *= (1.0 - 0.9 * dt)
-            p["vy"] *= (1.0 - 0.9 * dt)
-            p["x"] += p["vx"] * dt
-            p["y"] += p["vy"] * dt
-            newp.append(p)
-        particles = newp
+    def ring_stamp(radius):
+        def draw(s):
+            pygame.draw.circle(s, FX_COLOR, (radius + 2, radius + 2), radius, width=3)
+        surf, _off = STAMPS.custom(("flappy_ring", radius), (radius * 2 + 4, radius * 2 + 4), draw)
+        return surf
 
     def draw_fx():
-        # particles
-        for p in particles:
-            a = p["life"] / max(0.0001, p["ttl"])
-            alpha = int(255 * a)
-            r = int(p["size"])
-            surf = pygame.Surface((r * 2 + 2, r * 2 + 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (255, 230, 140, alpha), (r + 1, r + 1), r)
-            screen.blit(surf, (int(p["x"]) - r - 1, int(p["y"]) - r - 1))
+        particles.draw(screen)
 
         # ring pulse
         if swap_fx_time > 0:
             a = swap_fx_time / 0.35
             radius = int((1.0 - a) * 60) + 10
-            alpha = int(220 * a)
-            ring = pygame.Surface((radius * 2 + 4, radius * 2 + 4), pygame.SRCALPHA)
-            pygame.draw.circle(ring, (255, 230, 140, alpha), (radius + 2, radius + 2), radius, width=3)
+            ring = ring_stamp(radius)
+            ring.set_alpha(int(220 * a), pygame.RLEACCEL)
             screen.blit(ring, (bird_x - radius - 2, int(bird_y) - radius - 2))
 
             # quick flash
-            flash = pygame.Surface((W, H), pygame.SRCALPHA)
-            flash.fill((255, 230, 140, int(70 * a)))
+            flash.set_alpha(int(70 * a))
             screen.blit(flash, (0, 0))
 
     # ----------------------------
@@ -227,7 +230,7 @@ def run(screen):
         gap_y = current_gap_y(p, time_s)
         pw = pipe_img.get_width()
 
-        top_img = pygame.transform.flip(pipe_img, False, True)
+        top_img = pipe_top_img
         top_rect = top_img.get_rect()
         top_rect.midbottom = (x + pw // 2, gap_y - PIPE_GAP // 2)
 
@@ -244,7 +247,7 @@ def run(screen):
         nonlocal score, t, alive
         nonlocal bg_x, base_x, pipes, spawn_timer
         nonlocal bird_y, bird_vy, bird_rot, bird_using_power, bird_img
-        nonlocal particles, swap_fx_time
+        nonlocal swap_fx_time
 
         score = 0
         t = 0.0
@@ -263,7 +266,7 @@ def run(screen):
         bird_using_power = False
         bird_img = bird_base_img
 
-        particles = []
+        particles.clear()
         swap_fx_time = 0.0
 
 
@@ -371,23 +374,17 @@ def run(screen):
             screen.blit(bot_img, bot_rect.topleft)
 
         # bird
-        b = pygame.transform.rotate(bird_img, -bird_rot)
-        br = b.get_rect(center=(bird_x, int(bird_y)))
-        screen.blit(b, br.topleft)
+        TRANSFORMS.blit(screen, bird_img, (bird_x, int(bird_y)), -bird_rot)
 
         draw_tiled(base_img, base_x, GROUND_Y)
 
         # FX on top
         draw_fx()
 
-        hud = font.render(f"SCORE: {score}", True, (245, 245, 255))
-        spd = font.render(f"SPEED: {scroll:0.0f}", True, (180, 180, 210))
-        rule = font.render(f"PIPE SCORE: {score_per_pipe}", True, (180, 180, 210))
-        mode = font.render("BIRD: POWER" if bird_using_power else "BIRD: BASE", True, (180, 180, 210))
-
-        screen.blit(hud, (24, 18))
-        screen.blit(spd, (24, 46))
-        screen.blit(rule, (24, 74))
-        screen.blit(mode, (24, 102))
+        # HUD via glyph-atlas (ingen font.render per frame)
+        hud_main.draw(screen, f"SCORE: {score}", (24, 18))
+        hud_sub.draw(screen, f"SPEED: {scroll:0.0f}", (24, 46))
+        hud_sub.draw(screen, f"PIPE SCORE: {score_per_pipe}", (24, 74))
+        hud_sub.draw(screen, "BIRD: POWER" if bird_using_power else "BIRD: BASE", (24, 102))
 
         pygame.display.flip()
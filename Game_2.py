@@ -1,12 +1,18 @@
 import random
 import pygame
 import joystick_keys as jk
+import text_render
+import hud
+from gfx_cache import BACKGROUNDS
+from sprite_batch import BATCH
 from typing import Set, Tuple
 
 def run(screen):
     clock = pygame.time.Clock()
-    font_big = pygame.font.SysFont("consolas", 40, bold=True)
-    font = pygame.font.SysFont("consolas", 22)
+    font_big = text_render.FONTS.sys("consolas", 40, bold=True)
+    font = text_render.FONTS.sys("consolas", 22)
+    txt_msg = text_render.glyphs(font, (200, 200, 215))
+    txt_big = text_render.glyphs(font_big, (240, 240, 255))
 
     # ---- Settings ----
     CELL = 30
@@ -21,6 +27,10 @@ def run(screen):
     MAX_TPS = 28.0
     JITTER = 0.12  # +-12% tick interval jitter
 
+    # Ritningen interpoleras mellan förra och senaste ticket, så render-FPS
+    # är oberoende av tick-takten.
+    RENDER_FPS = 120
+
     # Powerups
     POWERUPS_LOCK_SECONDS = 3.0  # inga bonusar första sek
 
@@ -61,8 +71,32 @@ def run(screen):
         return (random.randint(min_x, max_x), random.randint(min_y, max_y))
 
     def draw_cell(x, y, color, ox, oy, r=6):
-        rect = pygame.Rect(ox + x * CELL, oy + y * CELL, CELL, CELL)
-        pygame.draw.rect(screen, color, rect, border_radius=r)
+        # Köas i BATCH; flush efter ormen.
+        BATCH.rect((ox + x * CELL, oy + y * CELL, CELL, CELL), color, radius=r)
+
+    def draw_cell_lerp(a, b, f, color, ox, oy, r=6):
+        # Cell på väg från a till b, f = 0..1 av ticket.
+        x = a[0] + (b[0] - a[0]) * f
+        y = a[1] + (b[1] - a[1]) * f
+        BATCH.rect((ox + round(x * CELL), oy + round(y * CELL), CELL, CELL), color, radius=r)
+
+    def draw_backdrop(surf):
+        w, h, cols, rows, ox, oy = grid_size()
+        surf.fill((10, 10, 18))
+
+        for x in range(cols + 1):
+            px = ox + x * CELL
+            pygame.draw.line(surf, (255, 255, 255), (px, oy), (px, oy + rows * CELL), 1)
+        for y in range(rows + 1):
+            py = oy + y * CELL
+            pygame.draw.line(surf, (255, 255, 255), (ox, py), (ox + cols * CELL, py), 1)
+
+        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 220))
+        surf.blit(overlay, (0, 0))
+
+        border = pygame.Rect(ox, oy, cols * CELL, rows * CELL)
+        pygame.draw.rect(surf, (255, 170, 170, 100), border, width=2, border_radius=14)
 
     def spawn_free_cell(cols, rows, occupied):
 
@@ -108,6 +142,8 @@ def run(screen):
 
     t = 0.0
     tick_accum = 0.0
+    tick_frac = 1.0  # hur långt in i nästa tick vi är (för interpolering)
+    prev_head = prev_tail = (0, 0)  # huvud/svans före senaste ticket
 
     rage_time = 0.0
     slowmo_time = 0.0
@@ -167,12 +203,14 @@ def run(screen):
 
     def reset():
         nonlocal snake, direction, next_dir, powerups, score, dead, t, tick_accum
+        nonlocal tick_frac, prev_head, prev_tail
         nonlocal rage_time, slowmo_time, prev_rage_time, ticks_moved, extra_apples
 
         w, h, cols, rows, ox, oy = grid_size()
         cx, cy = cols // 2, rows // 2
 
         snake = [(cx - i, cy) for i in range(START_LEN)]
+        prev_head, prev_tail = snake[0], snake[-1]
         direction = (1, 0)
         next_dir = direction
 
@@ -181,6 +219,7 @@ def run(screen):
         dead = False
         t = 0.0
         tick_accum = 0.0
+        tick_frac = 1.0
 
         rage_time = 0.0
         slowmo_time = 0.0
@@ -192,9 +231,17 @@ def run(screen):
 
     reset()
 
+    # ---- Retained HUD: rasteriseras bara om när den visade texten ändras ----
+    top_hud = hud.HUD()
+    hud_score = top_hud.add(hud.Field(font, (230, 230, 240), (24, 18), fmt="SCORE: {}"))
+    hud_speed = top_hud.add(hud.Field(font, (180, 180, 200), (24, 44), fmt="SPEED: {:0.1f} tps"))
+    hud_lock = top_hud.add(hud.Label(font, "", (160, 160, 190), (24, 70)))
+    hud_rage = hud.Field(font, (255, 230, 140), fmt=f"RAGE: {{:0.1f}}s  (var {RAGE_EVERY_N_TICKS}:e ruta -> vitt äpple)")
+    hud_slow = hud.Field(font, (140, 200, 255), fmt="SLOWMO: {:0.1f}s")
+
     # ---- Main loop ----
     while True:
-        dt = clock.tick(120) / 1000.0
+        dt = clock.tick(RENDER_FPS) / 1000.0
         jk.update()
         if dt > 0.05:
             dt = 0.05
@@ -266,6 +313,7 @@ def run(screen):
 
                 direction = next_dir
                 ticks_moved += 1
+                prev_head, prev_tail = snake[0], snake[-1]
 
                 hx, hy = snake[0]
                 dx, dy = direction
@@ -308,22 +356,13 @@ def run(screen):
                     slowmo_time = SLOWMO_DURATION
                     powerups.pop("slowmo", None)
 
-        # ---- Draw ----
-        screen.fill((10, 10, 18))
-
-        for x in range(cols + 1):
-            px = ox + x * CELL
-            pygame.draw.line(screen, (255, 255, 255), (px, oy), (px, oy + rows * CELL), 1)
-        for y in range(rows + 1):
-            py = oy + y * CELL
-            pygame.draw.line(screen, (255, 255, 255), (ox, py), (ox + cols * CELL, py), 1)
+            # Intervallet jittras per tick; medelintervallet räcker för att
+            # rörelsen ska se jämn ut.
+            tick_frac = min(1.0, tick_accum / base_interval)
 
-        overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 220))
-        screen.blit(overlay, (0, 0))
-
-        border = pygame.Rect(ox, oy, cols * CELL, rows * CELL)
-        pygame.draw.rect(screen, (255, 170, 170, 100), border, width=2, border_radius=14)
+        # ---- Draw ----
+        # Rutnät + overlay + ram ritas en gång per upplösning.
+        BACKGROUNDS.blit(screen, "snake", draw_backdrop, (cols, rows, ox, oy))
 
         # apples
         ax, ay = main_apple
@@ -346,44 +385,41 @@ def run(screen):
             c = 120 + int(135 * rem)
             draw_cell(x, y, (140, c, 255), ox, oy, r=6)
 
-        # snake
-        for i, (sx, sy) in enumerate(snake):
-            if i == 0:
-                color = (180, 220, 255)
-                r = 8
-            else:
-                color = (140, 200, 255)
-                r = 7
-            draw_cell(sx, sy, color, ox, oy, r=r)
+        # snake: kroppen står på sina celler (de täcks både före och efter
+        # ticket), huvudet glider in i nästa cell och en extra svansbit
+        # glider ut ur den som lämnas, så hörnen blir hela.
+        if len(snake) > 1 and prev_tail != snake[-1]:
+            draw_cell_lerp(prev_tail, snake[-1], tick_frac, (140, 200, 255), ox, oy, r=7)
+        for (sx, sy) in snake[1:]:
+            draw_cell(sx, sy, (140, 200, 255), ox, oy, r=7)
+        draw_cell_lerp(prev_head, snake[0], tick_frac, (180, 220, 255), ox, oy, r=8)
+        BATCH.flush(screen)
 
         # HUD
         base_tps = min(MAX_TPS, BASE_TPS + TPS_RAMP * t)
         speed_mult = (RAGE_SPEED_MULT if rage_time > 0 else 1.0) * (SLOWMO_SPEED_MULT if slowmo_time > 0 else 1.0)
         shown_tps = min(MAX_TPS * 1.5, base_tps * speed_mult)
 
-        hud1 = font.render(f"SCORE: {score}", True, (230, 230, 240))
-        hud2 = font.render(f"SPEED: {shown_tps:0.1f} tps", True, (180, 180, 200))
+        hud_score.set(score)
+        hud_speed.set(shown_tps)
         lock = max(0.0, POWERUPS_LOCK_SECONDS - t)
-        hud3 = font.render(f"POWERUPS LOCK: {lock:0.0f}s" if lock > 0 else "POWERUPS: ON", True, (160, 160, 190))
-
-        screen.blit(hud1, (24, 18))
-        screen.blit(hud2, (24, 44))
-        screen.blit(hud3, (24, 70))
+        hud_lock.set_text(f"POWERUPS LOCK: {lock:0.0f}s" if lock > 0 else "POWERUPS: ON")
+        top_hud.draw(screen)
 
         yline = 96
         if rage_time > 0:
-            rr = font.render(f"RAGE: {rage_time:0.1f}s  (var {RAGE_EVERY_N_TICKS}:e ruta -> vitt äpple)", True, (255, 230, 140))
-            screen.blit(rr, (24, yline))
+            hud_rage.set_pos((24, yline))
+            hud_rage.set(rage_time)
+            hud_rage.draw(screen)
             yline += 24
         if slowmo_time > 0:
-            sm = font.render(f"SLOWMO: {slowmo_time:0.1f}s", True, (140, 200, 255))
-            screen.blit(sm, (24, yline))
+            hud_slow.set_pos((24, yline))
+            hud_slow.set(slowmo_time)
+            hud_slow.draw(screen)
             yline += 24
 
         if dead:
-            msg = font_big.render("GAME OVER", True, (240, 240, 255))
-            screen.blit(msg, msg.get_rect(center=(w // 2, int(h * 0.42))))
-            msg2 = font.render("Enter/Space = retry   ESC = tillbaka", True, (200, 200, 215))
-            screen.blit(msg2, msg2.get_rect(center=(w // 2, int(h * 0.50))))
+            txt_big.draw_centered(screen, "GAME OVER", (w // 2, int(h * 0.42)))
+            txt_msg.draw_centered(screen, "Enter/Space = retry   ESC = tillbaka", (w // 2, int(h * 0.50)))
 
         pygame.display.flip()
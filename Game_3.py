@@ -3,11 +3,16 @@ import random
 import pygame
 from collections import deque
 import joystick_keys as jk
+import text_render
+import hud
+from sprite_batch import BATCH, STAMPS
+from atlas import ATLASES
+from present import alpha_kind
 
 def run(screen):
     clock = pygame.time.Clock()
-    font_big = pygame.font.SysFont("consolas", 40, bold=True)
-    font = pygame.font.SysFont("consolas", 22)
+    font_big = text_render.FONTS.sys("consolas", 40, bold=True)
+    font = text_render.FONTS.sys("consolas", 22)
 
     # ----------------------------
     # Helpers: asset paths
@@ -92,6 +97,10 @@ def run(screen):
     ADD_GHOST_AT = 40.0
     ADD_GHOST_2_AT = 75.0
 
+    # Pac och spöken ritas interpolerat mellan förra och senaste ticket,
+    # så render-FPS är oberoende av tick-takten.
+    RENDER_FPS = 120
+
     # Chili powerup
     CHILI_COUNT = 2
     CHILI_DURATION = 10.0
@@ -212,7 +221,13 @@ def run(screen):
         return pel
 
     def grid_to_center_px(x, y, cell, ox, oy):
-        return ox + x * cell + cell // 2, oy + y * cell + cell // 2
+        return ox + round(x * cell) + cell // 2, oy + round(y * cell) + cell // 2
+
+    def lerp_pos(a, b, f):
+        # Ritposition f (0..1) av vägen a -> b; hopp (respawn) ritas på b.
+        if abs(a[0] - b[0]) + abs(a[1] - b[1]) != 1:
+            return b
+        return a[0] + (b[0] - a[0]) * f, a[1] + (b[1] - a[1]) * f
 
     def random_open_cell(exclude=set()):
         for _ in range(2000):
@@ -230,34 +245,31 @@ def run(screen):
     # Ghost PNGs: 1.png..4.png
     # Om fler spöken än 4 -> använd 2.png
     # ----------------------------
-    ghost_png_raw = [
-        load_img_safe("1.png"),
-        load_img_safe("2.png"),
-        load_img_safe("3.png"),
-        load_img_safe("4.png"),
-    ]
-
-    def ghost_img_for_index(i, cell):
+    # En atlas per cell-storlek: skalade spöken + nedtonade (frysta)
+    # varianter, så inget skalas eller kopieras per frame.
+    def ghost_builder(cell):
+        def build(atlas):
+            # skala lite snyggt (lite mindre än cell så det blir luft)
+            target = max(8, int(cell * 0.92))
+            for n in range(4):
+                raw = load_img_safe(f"{n + 1}.png")
+                if raw is None:
+                    continue
+                kind = alpha_kind(raw)  # före skalningen, se present.py
+                img = pygame.transform.smoothscale(raw, (target, target))
+                atlas.add(f"ghost_{n}", img, kind)
+                frozen = img.copy()
+                frozen.fill((255, 255, 255, 120), special_flags=pygame.BLEND_RGBA_MULT)
+                atlas.add(f"ghost_{n}_frozen", frozen, kind)
+        return build
+
+    def get_ghost_img(i, cell, frozen=False):
         # index: 0..n-1
         # 0->1.png, 1->2.png, 2->3.png, 3->4.png, >=4 -> 2.png
         idx = i if i < 4 else 1
-        img = ghost_png_raw[idx]
-        if img is None:
-            return None
-
-        # skala lite snyggt (lite mindre än cell så det blir luft)
-        target = max(8, int(cell * 0.92))
-        return pygame.transform.smoothscale(img, (target, target))
-
-    # cache per cell-size så vi inte reskalar varje frame
-    ghost_img_cache = {}  # key: (cell, i) -> Surface/None
-
-    def get_ghost_img(i, cell):
-        key = (cell, i)
-        if key in ghost_img_cache:
-            return ghost_img_cache[key]
-        ghost_img_cache[key] = ghost_img_for_index(i, cell)
-        return ghost_img_cache[key]
+        sprites = ATLASES.get(("pacman", cell), ghost_builder(cell))
+        name = f"ghost_{idx}_frozen" if frozen else f"ghost_{idx}"
+        return sprites.region(name) if name in sprites else None
 
     # -------------------------------------------------
     # Chili placement
@@ -281,16 +293,19 @@ def run(screen):
     # -------------------------------------------------
     def draw_board(cell, ox, oy, pellets):
         screen.fill(C_BG)
+        # Väggar och piller som stamps: ett blits-anrop för hela brädet.
+        wall, _off = STAMPS.rect(cell, cell, C_WALL, radius=max(4, cell // 6))
         for y in range(ROWS):
             for x in range(COLS):
                 if is_wall(x, y):
-                    r = pygame.Rect(ox + x * cell, oy + y * cell, cell, cell)
-                    pygame.draw.rect(screen, C_WALL, r, border_radius=max(4, cell // 6))
+                    BATCH.add(wall, (ox + x * cell, oy + y * cell))
 
         pr = max(2, cell // 9)
+        pellet, (dx, dy) = STAMPS.circle(pr, C_PELLET)
         for (x, y) in pellets:
             cx, cy = grid_to_center_px(x, y, cell, ox, oy)
-            pygame.draw.circle(screen, C_PELLET, (cx, cy), pr)
+            BATCH.add(pellet, (cx + dx, cy + dy))
+        BATCH.flush(screen)
 
     def draw_chili(pos, cell, ox, oy):
         cx, cy = grid_to_center_px(pos[0], pos[1], cell, ox, oy)
@@ -343,10 +358,8 @@ def run(screen):
         rect = img.get_rect(center=(cx, cy))
 
         if frozen:
-            # tona ner + liten “ice-ring”
-            tmp = img.copy()
-            tmp.fill((255, 255, 255, 120), special_flags=pygame.BLEND_RGBA_MULT)
-            screen.blit(tmp, rect.topleft)
+            # nedtonad bild (från atlasen) + liten “ice-ring”
+            screen.blit(img, rect.topleft)
             pygame.draw.circle(screen, (210, 240, 255), (cx, cy - int(cell * 0.35)), max(2, cell // 10), 1)
         else:
             screen.blit(img, rect.topleft)
@@ -371,7 +384,7 @@ def run(screen):
 
     def reset():
         nonlocal pac_pos, pac_dir, pac_next_dir, pellets, ghosts, score, t
-        nonlocal pac_tick, ghost_tick
+        nonlocal pac_tick, ghost_tick, pac_prev
         nonlocal chilis, blink_timer, blink_accum, blink_on
 
         pellets = build_pellets()
@@ -379,6 +392,7 @@ def run(screen):
         t = 0.0
 
         pac_pos = find_spawn_open(1, 1)
+        pac_prev = pac_pos
         pac_dir = (1, 0)
         pac_next_dir = (1, 0)
 
@@ -397,6 +411,7 @@ def run(screen):
         ensure_chilis()
 
     pac_pos = (1, 1)
+    pac_prev = pac_pos  # cellen före senaste pac-ticket
     pac_dir = (1, 0)
     pac_next_dir = (1, 0)
     pellets = set()
@@ -413,11 +428,21 @@ def run(screen):
 
     reset()
 
+    # -------------------------------------------------
+    # Retained HUD: rasteriseras bara om när den visade texten ändras
+    # -------------------------------------------------
+    top_hud = hud.HUD()
+    hud_score = top_hud.add(hud.Field(font, (230, 230, 240), (24, 18), fmt="SCORE: {}"))
+    hud_ghost = top_hud.add(hud.Field(font, (180, 180, 200), (24, 44), fmt="GHOST SPEED: {:0.1f} tps"))
+    hud_chase = top_hud.add(hud.Field(font, (180, 180, 200), (24, 70), fmt="CHASE: {}%"))
+    hud_blink_on = hud.Field(font, (255, 190, 160), (24, 96), fmt="CHILI BLINK: {:0.1f}s")
+    hud_blink_off = hud.Label(font, "CHILI BLINK: -", (180, 180, 200), (24, 96))
+
     # -------------------------------------------------
     # Main loop
     # -------------------------------------------------
     while True:
-        dt = clock.tick(120) / 1000.0
+        dt = clock.tick(RENDER_FPS) / 1000.0
         jk.update()
         if dt > 0.05:
             dt = 0.05
@@ -479,7 +504,7 @@ def run(screen):
         while pac_tick >= pac_interval:
             pac_tick -= pac_interval
 
-            px, py = pac_pos
+            px, py = pac_prev = pac_pos
 
             ndx, ndy = pac_next_dir
             tx, ty = px + ndx, py + ndy
@@ -520,6 +545,7 @@ def run(screen):
             ghost_tick -= ghost_interval
 
             for g in ghosts:
+                g["prev"] = g["pos"]
                 if g["freeze"] > 0.0:
                     continue
 
@@ -569,29 +595,30 @@ def run(screen):
         for c in chilis:
             draw_chili(c, cell, ox, oy)
 
-        # pac
-        draw_pacman(pac_pos, pac_dir, cell, ox, oy, t, blink_on=blink_on, blink_active=blink_active)
+        # pac (interpolerad; logiken och kollisionerna går på hela celler)
+        pac_draw = lerp_pos(pac_prev, pac_pos, pac_tick / pac_interval)
+        draw_pacman(pac_draw, pac_dir, cell, ox, oy, t, blink_on=blink_on, blink_active=blink_active)
 
         # ghosts (PNG)
+        ghost_f = ghost_tick / ghost_interval
         for i, g in enumerate(ghosts):
-            img = get_ghost_img(i, cell)
-            draw_ghost_png(g["pos"], cell, ox, oy, img, frozen=(g["freeze"] > 0.0))
+            frozen = g["freeze"] > 0.0
+            img = get_ghost_img(i, cell, frozen)
+            pos = lerp_pos(g.get("prev", g["pos"]), g["pos"], ghost_f)
+            draw_ghost_png(pos, cell, ox, oy, img, frozen=frozen)
 
         # HUD
         ghost_tps_now = min(MAX_GHOST_TPS, BASE_GHOST_TPS + GHOST_TPS_RAMP * t)
         chase_p_now = min(0.92, 0.18 + CHASE_RAMP * t)
 
-        hud1 = font.render(f"SCORE: {score}", True, (230, 230, 240))
-        hud2 = font.render(f"GHOST SPEED: {ghost_tps_now:0.1f} tps", True, (180, 180, 200))
-        hud3 = font.render(f"CHASE: {int(chase_p_now * 100)}%", True, (180, 180, 200))
+        hud_score.set(score)
+        hud_ghost.set(ghost_tps_now)
+        hud_chase.set(int(chase_p_now * 100))
+        top_hud.draw(screen)
         if blink_active:
-            hud4 = font.render(f"CHILI BLINK: {blink_timer:0.1f}s", True, (255, 190, 160))
+            hud_blink_on.set(blink_timer)
+            hud_blink_on.draw(screen)
         else:
-            hud4 = font.render("CHILI BLINK: -", True, (180, 180, 200))
-
-        screen.blit(hud1, (24, 18))
-        screen.blit(hud2, (24, 44))
-        screen.blit(hud3, (24, 70))
-        screen.blit(hud4, (24, 96))
+            hud_blink_off.draw(screen)
 
         pygame.display.flip()
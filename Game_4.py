@@ -2,11 +2,20 @@ import os
 import random
 import pygame
 import joystick_keys as jk
+import text_render
+import hud
+from gfx_cache import BACKGROUNDS
+from sprite_batch import BATCH, STAMPS
+from quality import GOVERNOR
+from particles import ParticleSystem, rng
 
 def run(screen):
     clock = pygame.time.Clock()
-    font_big = pygame.font.SysFont("consolas", 42, bold=True)
-    font = pygame.font.SysFont("consolas", 22)
+    # Loopen tickar i 120, men kvaliteten ska bara sänkas om vi tappar 60.
+    GOVERNOR.set_fps(60)
+    GOVERNOR.register("tetris_particles_per_cell", (6, 4, 3, 2))
+    font_big = text_render.FONTS.sys("consolas", 42, bold=True)
+    font = text_render.FONTS.sys("consolas", 22)
 
 
 
@@ -93,6 +102,7 @@ def run(screen):
     PANEL_BG = (14, 14, 24)
     TEXT = (235, 235, 245)
 
+
     COLORS = {
         "I": (140, 200, 255),
         "O": (255, 230, 140),
@@ -168,35 +178,8 @@ def run(screen):
     # -----------------------
     # Line clear "explosion" particles
     # -----------------------
-    class Particle:
-        __slots__ = ("x", "y", "vx", "vy", "life", "max_life", "r", "col")
-
-        def __init__(self, x, y, vx, vy, life, r, col):
-            self.x = x
-            self.y = y
-            self.vx = vx
-            self.vy = vy
-            self.life = life
-            self.max_life = life
-            self.r = r
-            self.col = col
-
-        def update(self, dt):
-            self.life -= dt
-            if self.life <= 0:
-                return False
-            # lite "fall"
-            self.vy += 900.0 * dt
-            self.x += self.vx * dt
-            self.y += self.vy * dt
-            return True
-
-        def draw(self, surf):
-            a = max(0, min(255, int(255 * (self.life / self.max_life))))
-            r = max(1, int(self.r * (0.6 + 0.4 * (self.life / self.max_life))))
-            pygame.draw.circle(surf, (*self.col, a), (int(self.x), int(self.y)), r)
-
-    particles = []
+    # lite "fall", och radien krymper till 60 % under livstiden
+    particles = ParticleSystem(gravity=900.0, shrink=0.4)
 
     def spawn_line_explosion(cleared_rows, cell, ox, oy):
         # Burst längs hela raden (cool men billig)
@@ -208,13 +191,11 @@ def run(screen):
                 c = board[row_y][x] if 0 <= row_y < ROWS else None
                 col = c if c is not None else (245, 245, 255)
 
-                # lite fler partiklar per cell
-                for _ in range(6):
-                    vx = random.uniform(-420, 420)
-                    vy = random.uniform(-520, -120)
-                    life = random.uniform(0.25, 0.55)
-                    r = random.uniform(2.0, 4.5)
-                    particles.append(Particle(x0, y0, vx, vy, life, r, col))
+                # lite fler partiklar per cell (färre på lägre kvalitetsnivå)
+                n = GOVERNOR.get("tetris_particles_per_cell", 6)
+                r = rng()
+                particles.emit(x0, y0, r.uniform(-420, 420, n), r.uniform(-520, -120, n),
+                               r.uniform(0.25, 0.55, n), r.uniform(2.0, 4.5, n), col)
 
     # -----------------------
     # Game state
@@ -361,29 +342,48 @@ def run(screen):
     # -----------------------
     # Drawing helpers
     # -----------------------
+    def draw_backdrop(surf):
+        # Allt som bara beror på layouten: bräde, rutnät, paneler.
+        w, h, cell, board_w, board_h, ox, oy = compute_layout()
+        surf.fill(BG)
+
+        board_rect = pygame.Rect(ox - 10, oy - 10, board_w + 20, board_h + 20)
+        pygame.draw.rect(surf, (18, 18, 30), board_rect, border_radius=18)
+        for y in range(ROWS):
+            for x in range(COLS):
+                r = rect_for_cell(x, y, cell, ox, oy)
+                pygame.draw.rect(surf, (255, 255, 255), r, width=1, border_radius=max(3, cell // 7))
+
+        panel_x = ox + board_w + 30
+        pygame.draw.rect(surf, PANEL_BG, panel_rect(ox, oy, board_w, board_h), border_radius=18)
+        preview_box = pygame.Rect(panel_x + 18, oy + 10 + len(panel_rows) * 62 + 32, 120, 120)
+        pygame.draw.rect(surf, (22, 22, 36), preview_box, border_radius=14)
+
+    def panel_rect(ox, oy, board_w, board_h):
+        return pygame.Rect(ox + board_w + 30, oy - 10, PANEL_W, board_h + 20)
+
+    # Block och spökbitar är stamps per (cell, färg) och köas i BATCH;
+    # flush() efter den aktiva biten.
+    def block_stamp(color, cell, alpha=255):
+        def paint(surf):
+            r = surf.get_rect()
+            if alpha != 255:
+                pygame.draw.rect(surf, (*color, alpha), r, border_radius=max(3, cell // 6))
+                return
+            pygame.draw.rect(surf, color, r, border_radius=max(3, cell // 6))
+            hi = pygame.Rect(r.x + 2, r.y + 2, r.w - 4, r.h - 4)
+            pygame.draw.rect(surf, (255, 255, 255), hi, width=1, border_radius=max(3, cell // 6))
+        surf, _off = STAMPS.custom(("tetris_block", cell, color, alpha), (cell, cell), paint, opaque=alpha == 255)
+        return surf
+
     def draw_block(r, color, cell):
-        pygame.draw.rect(screen, color, r, border_radius=max(3, cell // 6))
-        hi = pygame.Rect(r.x + 2, r.y + 2, r.w - 4, r.h - 4)
-        pygame.draw.rect(screen, (255, 255, 255), hi, width=1, border_radius=max(3, cell // 6))
+        BATCH.add(block_stamp(color, cell), r.topleft)
 
     def draw_piece(ptype, rot, x, y, cell, ox, oy, alpha=255):
         blocks = get_blocks(ptype, rot)
-        col = COLORS[ptype]
+        stamp = block_stamp(COLORS[ptype], cell, alpha)
         for bx, by in blocks:
-            gx = x + bx
-            gy = y + by
-            rr = rect_for_cell(gx, gy, cell, ox, oy)
-            if alpha != 255:
-                surf = pygame.Surface((rr.w, rr.h), pygame.SRCALPHA)
-                pygame.draw.rect(
-                    surf,
-                    (*col, alpha),
-                    pygame.Rect(0, 0, rr.w, rr.h),
-                    border_radius=max(3, cell // 6),
-                )
-                screen.blit(surf, (rr.x, rr.y))
-            else:
-                draw_block(rr, col, cell)
+            BATCH.add(stamp, rect_for_cell(x + bx, y + by, cell, ox, oy).topleft)
 
     def draw_ghost_piece(cell, ox, oy):
         gy = cur_y
@@ -391,6 +391,36 @@ def run(screen):
             gy += 1
         draw_piece(cur_type, cur_rot, cur_x, gy, cell, ox, oy, alpha=70)
 
+    # -----------------------
+    # Retained HUD (right panel)
+    # -----------------------
+    # Etiketter/hints renderas en gång; värdena bara när texten ändras.
+    LABEL_COL = (200, 200, 220)
+    panel_hud = hud.HUD()
+    panel_rows = []
+    for name, fmt in (("SCORE", "{}"), ("LINES", "{}"), ("LVL", "{}"), ("TIME", "{:0.0f}s")):
+        panel_rows.append((
+            panel_hud.add(hud.Label(font, name, LABEL_COL)),
+            panel_hud.add(hud.Field(font, TEXT, fmt=fmt)),
+        ))
+    next_label = panel_hud.add(hud.Label(font, "NEXT", LABEL_COL))
+
+    HINT_LINES = [
+        "← → flytta",
+        "↑ rotera",
+        "↓ soft drop",
+        "SPACE hard drop",
+        "ESC tillbaka",
+    ]
+    hint_block = panel_hud.add(hud.HintBlock(font, HINT_LINES, (170, 170, 195), line_h=22))
+
+    # Dirty-rect-ritning: bakgrunden ligger kvar på skärmen mellan frames.
+    # Varje frame återställs och skickas bara brädet (plus raden ovanför,
+    # där nya bitar dyker upp), förra och nya partikelrutan, förhandsrutan
+    # och HUD-widgets som ändrats, med display.update(rects).
+    drawn_on = None  # backdrop som skärmen senast ritades helt från
+    prev_fx = None
+
     # -----------------------
     # Main loop
     # -----------------------
@@ -458,8 +488,7 @@ def run(screen):
         t += dt
 
         # update particles
-        if particles:
-            particles[:] = [p for p in particles if p.update(dt)]
+        particles.update(dt)
 
         # horizontal auto-repeat
         held_dir = 0
@@ -509,82 +538,70 @@ def run(screen):
         # -----------------------
         # Draw
         # -----------------------
-        screen.fill(BG)
-
-        # board background panel
-        board_rect = pygame.Rect(ox - 10, oy - 10, board_w + 20, board_h + 20)
-        pygame.draw.rect(screen, (18, 18, 30), board_rect, border_radius=18)
-
-        # grid / cells
+        # board panel, rutnät och högerpanel: en blit (helt bara första gången)
+        backdrop = BACKGROUNDS.get("tetris", screen, draw_backdrop, (cell, ox, oy))
+        panel = panel_rect(ox, oy, board_w, board_h)
+        if backdrop is not drawn_on:
+            drawn_on = backdrop
+            screen.blit(backdrop, (0, 0))
+            panel_hud.invalidate()
+            dirty = [screen.get_rect()]
+        else:
+            board_area = pygame.Rect(ox - 10, 0, board_w + 20, oy + board_h + 10)
+            dirty = [screen.blit(backdrop, board_area, board_area)]
+            if prev_fx:
+                dirty.append(screen.blit(backdrop, prev_fx, prev_fx))
+                if prev_fx.colliderect(panel):
+                    panel_hud.invalidate()
+
+        # cells
         for y in range(ROWS):
+            row = board[y]
             for x in range(COLS):
-                r = rect_for_cell(x, y, cell, ox, oy)
-                pygame.draw.rect(screen, (255, 255, 255), r, width=1, border_radius=max(3, cell // 7))
-                c = board[y][x]
+                c = row[x]
                 if c is not None:
-                    draw_block(r, c, cell)
+                    draw_block(rect_for_cell(x, y, cell, ox, oy), c, cell)
 
         # pieces
         draw_ghost_piece(cell, ox, oy)
         draw_piece(cur_type, cur_rot, cur_x, cur_y, cell, ox, oy)
+        BATCH.flush(screen)
 
         # particles overlay (explosions)
-        if particles:
-            fx = pygame.Surface((w, h), pygame.SRCALPHA)
-            for p in particles:
-                p.draw(fx)
-            screen.blit(fx, (0, 0))
+        fx_box = prev_fx = particles.draw(screen)
 
-        # right panel
+        # right panel (ligger i bakgrunden; täck partiklar som nått dit)
         panel_x = ox + board_w + 30
-        panel = pygame.Rect(panel_x, oy - 10, PANEL_W, board_h + 20)
-        pygame.draw.rect(screen, PANEL_BG, panel, border_radius=18)
+        if fx_box:
+            dirty.append(fx_box)
+            if fx_box.colliderect(panel):
+                screen.blit(backdrop, panel, panel)
+                panel_hud.invalidate()
 
         # HUD text
         drop_sec_now = max(MIN_DROP_SEC, START_DROP_SEC - RAMP_PER_SEC * t)
         level_like = 1 + int((START_DROP_SEC - drop_sec_now) / 0.08)
 
         text_y = oy + 10
-
-        def blit_label(label, value):
-            nonlocal text_y
-            a = font.render(label, True, (200, 200, 220))
-            b = font.render(str(value), True, TEXT)
-            screen.blit(a, (panel_x + 18, text_y))
-            screen.blit(b, (panel_x + 18, text_y + 24))
+        for (lab, val), value in zip(panel_rows, (score, lines, level_like, t)):
+            lab.set_pos((panel_x + 18, text_y))
+            val.set_pos((panel_x + 18, text_y + 24))
+            val.set(value)
             text_y += 62
+        next_label.set_pos((panel_x + 18, text_y))
+        hint_block.set_pos((panel_x + 18, oy + board_h - 10 - len(HINT_LINES) * 22))
+        dirty.extend(panel_hud.draw(screen, backdrop))
 
-        blit_label("SCORE", score)
-        blit_label("LINES", lines)
-        blit_label("LVL", level_like)
-        blit_label("TIME", f"{t:0.0f}s")
-
-        # next piece preview
-        label = font.render("NEXT", True, (200, 200, 220))
-        screen.blit(label, (panel_x + 18, text_y))
+        # next piece preview (rutan ligger i bakgrunden)
         preview_box = pygame.Rect(panel_x + 18, text_y + 32, 120, 120)
-        pygame.draw.rect(screen, (22, 22, 36), preview_box, border_radius=14)
 
         px0, py0 = preview_box.x + 20, preview_box.y + 20
         mini = max(12, cell // 2)
+        preview_area = preview_box.union((px0, py0, 4 * mini, 4 * mini))
+        dirty.append(screen.blit(backdrop, preview_area, preview_area))
         for bx, by in get_blocks(next_piece, 0):
             rr = pygame.Rect(px0 + bx * mini, py0 + by * mini, mini, mini)
             pygame.draw.rect(screen, COLORS[next_piece], rr, border_radius=max(3, mini // 6))
             pygame.draw.rect(screen, (255, 255, 255), rr, width=1, border_radius=max(3, mini // 6))
 
-        # Controls hint
-        hint = [
-            "← → flytta",
-            "↑ rotera",
-            "↓ soft drop",
-            "SPACE hard drop",
-            "ESC tillbaka",
-        ]
-        hy = oy + board_h - 10 - len(hint) * 22
-        for s in hint:
-            tx = font.render(s, True, (170, 170, 195))
-            screen.blit(tx, (panel_x + 18, hy))
-            hy += 22
-
-
-        pygame.display.flip()
+        pygame.display.update(dirty)
@@ -4,19 +4,28 @@
 #   Assets/Space/kula.png     (player bullet)
 #   Assets/Space/Fielnde.png  (enemy base sprite)
 #
-# Saves highscores to: game_5.txt (same folder as this file)
+# Saves highscores to: Game_5.txt via score_store (same board format as the launcher)
 
 import os
 import math
 import random
 import pygame
 import joystick_keys as jk
+import score_store
+import text_render
+from starfield import Starfield
+from sprite_batch import BATCH
+from atlas import ATLASES
+from present import alpha_kind
+from quality import GOVERNOR
 
 
-def run(screen):
+def run(screen, initials=None):
     clock = pygame.time.Clock()
-    font_big = pygame.font.SysFont("consolas", 46, bold=True)
-    font = pygame.font.SysFont("consolas", 22)
+    # Loopen tickar i 120, men stjärnfältet ska bara glesas ut om vi tappar 60.
+    GOVERNOR.set_fps(60)
+    font_big = text_render.FONTS.sys("consolas", 46, bold=True)
+    font = text_render.FONTS.sys("consolas", 22)
 
     # ----------------------------
     # Helpers: asset paths
@@ -58,45 +67,17 @@ def run(screen):
         return s
 
     # ----------------------------
-    # Highscore file
+    # Highscore (shared score store)
     # ----------------------------
-    SCORE_FILE = os.path.join(base_dir(), "game_5.txt")
+    SCORE_BOARD = "Game_5.txt"
+    SCORES = score_store.STORE
 
-    def read_scores():
-        if not os.path.exists(SCORE_FILE):
-            return []
-        out = []
-        try:
-            with open(SCORE_FILE, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        out.append(int(line))
-                    except Exception:
-                        pass
-        except Exception:
-            return []
-        out = [s for s in out if isinstance(s, int)]
-        out.sort(reverse=True)
-        return out[:10]
-
-    def write_scores(scores):
-        try:
-            with open(SCORE_FILE, "w", encoding="utf-8") as f:
-                for s in scores[:10]:
-                    f.write(str(int(s)) + "\n")
-        except Exception:
-            pass
+    # Engångsflytt av den gamla game_5.txt (bara heltal) in i den delade listan.
+    SCORES.import_legacy(SCORE_BOARD, "game_5.txt")
 
     def submit_score(score):
-        scores = read_scores()
-        scores.append(int(score))
-        scores.sort(reverse=True)
-        scores = scores[:10]
-        write_scores(scores)
-        return scores
+        # Icke-blockerande: minnet uppdateras direkt, disken sköts av writer-tråden.
+        return SCORES.add(SCORE_BOARD, initials, score)
 
     # ----------------------------
     # Config
@@ -151,10 +132,6 @@ def run(screen):
     # ----------------------------
     # Load & prep sprites
     # ----------------------------
-    img_ship = load_img("Skett.png", alpha=True)
-    img_bullet = load_img("kula.png", alpha=True)
-    img_enemy_base = load_img("Fielnde.png", alpha=True)
-
     # Scale a bit for consistent look
     def fit_width(img, target_w):
         w, h = img.get_size()
@@ -163,10 +140,6 @@ def run(screen):
         s = target_w / float(w)
         return pygame.transform.smoothscale(img, (int(w * s), int(h * s)))
 
-    img_ship = fit_width(img_ship, 72)
-    img_bullet = fit_width(img_bullet, 14)
-    img_enemy_base = fit_width(img_enemy_base, 52)
-
     # Enemy variants by color+hp
     ENEMY_TYPES = [
         {"name": "green", "hp": 5, "tint": (110, 255, 140), "score": 10},
@@ -174,29 +147,89 @@ def run(screen):
         {"name": "red",   "hp": 50, "tint": (255, 90, 110), "score": 70},
     ]
 
-    enemy_imgs = {
-        t["name"]: tint_surface(img_enemy_base, t["tint"])
-        for t in ENEMY_TYPES
-    }
-
-    bullet_player_img = tint_surface(img_bullet, (140, 240, 255))  # cyan-ish
-    bullet_homing_img = tint_surface(img_bullet, (255, 90, 90))    # red-ish (homing)
-    bullet_enemy_img = tint_surface(img_bullet, (255, 80, 80))     # red always
+    # Skepp, fiender och kulor (med tintade varianter) i en atlas; byggs
+    # bara första gången spelet startas.
+    def build_sprites(atlas):
+        # Alpha-sorten klassas före skalningen och följer med tintningarna.
+        raw_bullet = load_img("kula.png", alpha=True)
+        raw_enemy = load_img("Fielnde.png", alpha=True)
+        raw_ship = load_img("Skett.png", alpha=True)
+        bullet_kind, enemy_kind = alpha_kind(raw_bullet), alpha_kind(raw_enemy)
+        img_bullet = fit_width(raw_bullet, 14)
+        img_enemy_base = fit_width(raw_enemy, 52)
+        atlas.add("ship", fit_width(raw_ship, 72), alpha_kind(raw_ship))
+        for t in ENEMY_TYPES:
+            atlas.add("enemy_" + t["name"], tint_surface(img_enemy_base, t["tint"]), enemy_kind)
+        atlas.add("bullet_player", tint_surface(img_bullet, (140, 240, 255)), bullet_kind)  # cyan-ish
+        atlas.add("bullet_homing", tint_surface(img_bullet, (255, 90, 90)), bullet_kind)    # red-ish (homing)
+        atlas.add("bullet_enemy", tint_surface(img_bullet, (255, 80, 80)), bullet_kind)     # red always
+
+    sprites = ATLASES.get(("space",), build_sprites)
+
+    img_ship = sprites.region("ship")
+    enemy_imgs = {t["name"]: sprites.region("enemy_" + t["name"]) for t in ENEMY_TYPES}
+    img_enemy_base = enemy_imgs["green"]  # tintningen ändrar inte storleken; används för layout
+
+    bullet_player_img = sprites.region("bullet_player")
+    bullet_homing_img = sprites.region("bullet_homing")
+    bullet_enemy_img = sprites.region("bullet_enemy")
 
     # ----------------------------
     # Small UI helpers
     # ----------------------------
+    # Text via glyph-atlas: varje tecken rasteriseras en gång per (font, färg).
     def draw_center(text, y, col=HUD, fnt=None):
         f = fnt or font_big
-        s = f.render(text, True, col)
-        screen.blit(s, s.get_rect(center=(W // 2, y)))
+        text_render.glyphs(f, col).draw_centered(screen, text, (W // 2, y))
 
     def draw_shadow_text(text, pos, col=HUD, fnt=None):
         f = fnt or font
-        s = f.render(text, True, col)
-        sh = f.render(text, True, (20, 20, 28))
-        screen.blit(sh, (pos[0] + 2, pos[1] + 2))
-        screen.blit(s, pos)
+        text_render.glyphs(f, (20, 20, 28)).draw(screen, text, (pos[0] + 2, pos[1] + 2))
+        text_render.glyphs(f, col).draw(screen, text, pos)
+
+    def ask_initials(final_score):
+        """
+        In-game initials prompt for when no launcher passed any.
+        ↑↓ letter, ← → position, ENTER save. Returns "" on ESC (skip),
+        None on QUIT.
+        """
+        letters = ["A", "A", "A"]
+        pos = 0
+        while True:
+            clock.tick(60)
+            jk.update()
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return None
+                if event.type != pygame.KEYDOWN:
+                    continue
+                if event.key == pygame.K_ESCAPE:
+                    return ""
+                if event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    return "".join(letters)
+                if event.key == pygame.K_LEFT:
+                    pos = (pos - 1) % 3
+                elif event.key == pygame.K_RIGHT:
+                    pos = (pos + 1) % 3
+                elif event.key in (pygame.K_UP, pygame.K_DOWN):
+                    step = 1 if event.key == pygame.K_UP else -1
+                    letters[pos] = chr((ord(letters[pos]) - 65 + step) % 26 + 65)
+                elif pygame.K_a <= event.key <= pygame.K_z:
+                    letters[pos] = chr(event.key - pygame.K_a + 65)
+                    pos = min(2, pos + 1)
+
+            screen.fill(BG)
+            draw_center("ENTER INITIALS", H // 2 - 90, col=HUD, fnt=font_big)
+            draw_center(f"SCORE: {int(final_score)}", H // 2 - 36, col=SUB, fnt=font)
+            cell = font_big.get_height() + 12
+            x0 = W // 2 - cell * 3 // 2
+            for i, ch in enumerate(letters):
+                col = (255, 220, 120) if i == pos else HUD
+                text_render.glyphs(font_big, col).draw_centered(screen, ch, (x0 + i * cell + cell // 2, H // 2 + 20))
+                if i == pos:
+                    pygame.draw.rect(screen, col, (x0 + i * cell + 6, H // 2 + 20 + cell // 2, cell - 12, 4))
+            draw_center("↑↓ letter   ← → move   ENTER save   ESC skip", H // 2 + 90, col=SUB, fnt=font)
+            pygame.display.flip()
 
     # ----------------------------
     # Entities
@@ -254,9 +287,9 @@ def run(screen):
                 return False
             return True
 
-        def draw(self, surf):
+        def draw(self, batch):
             r = self.rect()
-            surf.blit(self.img, (r.x, r.y))
+            batch.add(self.img, (r.x, r.y))
 
     class Enemy:
         __slots__ = ("x", "y", "hp", "max_hp", "kind", "img", "alive", "w", "h")
@@ -283,11 +316,11 @@ def run(screen):
                 return True
             return False
 
-        def draw(self, surf):
+        def draw(self, batch):
             if not self.alive:
                 return
             r = self.rect()
-            surf.blit(self.img, (r.x, r.y))
+            batch.add(self.img, (r.x, r.y))
 
             # HP bar for red (bossy) or if damaged
             if self.max_hp >= 50 or self.hp < self.max_hp:
@@ -295,9 +328,9 @@ def run(screen):
                 bar_h = 6
                 x0 = r.x
                 y0 = r.y - 10
-                pygame.draw.rect(surf, (30, 30, 45), (x0, y0, bar_w, bar_h), border_radius=3)
+                batch.rect((x0, y0, bar_w, bar_h), (30, 30, 45), radius=3)
                 frac = max(0.0, min(1.0, self.hp / float(self.max_hp)))
-                pygame.draw.rect(surf, (255, 120, 120), (x0, y0, int(bar_w * frac), bar_h), border_radius=3)
+                batch.rect((x0, y0, int(bar_w * frac), bar_h), (255, 120, 120), radius=3)
 
     class Powerup:
         # type: "shots" | "damage" | "rate" | "homing"
@@ -336,8 +369,7 @@ def run(screen):
 
             pygame.draw.rect(surf, (18, 18, 30), r, border_radius=10)
             pygame.draw.rect(surf, col, r.inflate(-6, -6), border_radius=9)
-            txt = font.render(ch, True, (10, 10, 18))
-            surf.blit(txt, txt.get_rect(center=r.center))
+            text_render.glyphs(font, (10, 10, 18)).draw_centered(surf, ch, r.center)
 
     # ----------------------------
     # Game setup
@@ -379,9 +411,8 @@ def run(screen):
     fire_timer = 0.0
 
     # stars
-    stars = []
-    for _ in range(90):
-        stars.append([random.uniform(0, W), random.uniform(0, H), random.uniform(60, 160)])
+    stars = Starfield(W, H, 90, speed=(60, 160), levels=((0.5, 1), (2.0, 2)),
+                      shape="circle", color=(120, 120, 155), margin=5)
 
     def alive_enemies():
         return [e for e in enemies if e.alive]
@@ -546,7 +577,13 @@ def run(screen):
         if game_over:
             over_timer += dt
             if over_timer >= 2.2:
-                submit_score(score)
+                if initials is None and score > 0:
+                    # Startat utan initialer (fristående): fråga i spelet.
+                    initials = ask_initials(score)
+                    if initials is None:
+                        return {"result": "quit", "score": int(score)}
+                if initials:
+                    submit_score(score)
                 return {"result": "game_over", "score": int(score)}
 
             # draw game over
@@ -562,12 +599,7 @@ def run(screen):
         # ----------------------------
 
         # background stars
-        for s in stars:
-            s[1] += s[2] * dt
-            if s[1] > H + 5:
-                s[0] = random.uniform(0, W)
-                s[1] = -5
-                s[2] = random.uniform(60, 160)
+        stars.update(dt)
 
         # player move
         dx = 0.0
@@ -697,9 +729,7 @@ def run(screen):
         screen.fill(BG)
 
         # stars
-        for sx, sy, spd in stars:
-            r = 1 if spd < 110 else 2
-            pygame.draw.circle(screen, (120, 120, 155), (int(sx), int(sy)), r)
+        stars.draw(screen)
 
         # HUD panel top
         pygame.draw.rect(screen, (14, 14, 24), (18, 14, W - 36, 44), border_radius=14)
@@ -716,15 +746,14 @@ def run(screen):
         if homing_bonus >= 2:
             draw_shadow_text("+HOMING", (980, 26), col=(255, 120, 120), fnt=font)
 
-        # enemies
+        # enemies + bullets: ett blits-anrop
         for e in enemies:
-            e.draw(screen)
-
-        # bullets
+            e.draw(BATCH)
         for b in bullets:
-            b.draw(screen)
+            b.draw(BATCH)
         for b in enemy_bullets:
-            b.draw(screen)
+            b.draw(BATCH)
+        BATCH.flush(screen)
 
         # powerups
         for p in powerups:
@@ -736,7 +765,7 @@ def run(screen):
 
         # bottom hint
         hint = "← → move   SPACE shoot   ESC back"
-        ht = font.render(hint, True, SUB)
-        screen.blit(ht, (W // 2 - ht.get_width() // 2, H - 32))
+        ht = text_render.glyphs(font, SUB)
+        ht.draw(screen, hint, (W // 2 - ht.size(hint)[0] // 2, H - 32))
 
         pygame.display.flip()
@@ -2,6 +2,8 @@ import math
 import random
 import pygame
 import joystick_keys as jk
+import text_render
+from gfx_cache import BACKGROUNDS
 
 
 def clamp(x, a, b):
@@ -9,11 +11,9 @@ def clamp(x, a, b):
 
 
 def _get_font(size=24):
-    # Använd systemfont här inne för att spelet ska vara fristående.
-    # (Din launcher har egen font-cache i menyn.)
-    f = pygame.font.SysFont("consolas", size)
-    f.set_bold(True)
-    return f
+    # Delad font-cache (text_render.FONTS): launchern förvärmer den vid boot,
+    # och fristående körning skapar fonten första gången.
+    return text_render.FONTS.sys("consolas", size, bold=True)
 
 
 def run(screen):
@@ -105,15 +105,17 @@ def run(screen):
 
     def draw_center_text(txt, y, col=FG, big=False):
         f = font_big if big else font
-        s = f.render(txt, True, col)
-        screen.blit(s, s.get_rect(center=(W // 2, y)))
+        text_render.glyphs(f, col).draw_centered(screen, txt, (W // 2, y))
 
-    def draw():
-        screen.fill(BG)
+    def draw_backdrop(surf):
+        surf.fill(BG)
 
         # mid line
         for y in range(0, H, 22):
-            pygame.draw.rect(screen, MID, (W // 2 - 2, y, 4, 12))
+            pygame.draw.rect(surf, MID, (W // 2 - 2, y, 4, 12))
+
+    def draw():
+        BACKGROUNDS.blit(screen, "pong", draw_backdrop)
 
         # paddles + ball
         pygame.draw.rect(screen, FG, left, border_radius=6)
@@ -121,15 +123,15 @@ def run(screen):
         pygame.draw.rect(screen, FG, ball, border_radius=6)
 
         # score
-        sc = font_big.render(f"{left_score}  {right_score}", True, FG)
-        screen.blit(sc, sc.get_rect(center=(W // 2, 56)))
+        text_render.glyphs(font_big, FG).draw_centered(screen, f"{left_score}  {right_score}", (W // 2, 56))
 
         # hint
-        hint = font_small.render("Vänster: W/S  •  Höger: ↑/↓  •  P=paus  •  ESC=till menyn", True, (170, 170, 190))
-        screen.blit(hint, (18, H - 30))
+        text_render.glyphs(font_small, (170, 170, 190)).draw(
+            screen, "Vänster: W/S  •  Höger: ↑/↓  •  P=paus  •  ESC=till menyn", (18, H - 30))
 
-        spd = font_small.render(f"Hastighet: {int(current_speed)}", True, (140, 140, 160))
-        screen.blit(spd, (W - spd.get_width() - 18, H - 30))
+        spd = text_render.glyphs(font_small, (140, 140, 160))
+        spd_txt = f"Hastighet: {int(current_speed)}"
+        spd.draw(screen, spd_txt, (W - spd.size(spd_txt)[0] - 18, H - 30))
 
         if paused and not game_over:
             draw_center_text("PAUS", H // 2 - 30, ACCENT, big=True)
@@ -1,14 +1,22 @@
 import os
 import sys
 import math
-import random
+import time
 import pygame
+import inspect
 import importlib
-from datetime import date
+from collections import OrderedDict
 import joystick_keys as jk
+import score_store
+import text_render
+from gfx_cache import TRANSFORMS
+import present
+from present import open_display, low_depth, ASSETS
+from quality import GOVERNOR
+from volume import VOLUME
+from sprite_batch import BATCH
+import starfield
 
-import subprocess
-import re
 
 # ----------------------------
 # Config (Pi-friendly)
@@ -28,6 +36,53 @@ MAX_SCORES = 10
 
 ARCADE_FONT_PATH = os.path.join("assets", "fonts", "PressStart2P-Regular.ttf")
 
+# Fonter som spelen (Game_1..6) använder. Förvärms i main() via den delade
+# text_render.FONTS så att ett spel aldrig gör font-sökning när det startar.
+GAME_FONTS = [
+    ("consolas", 16, True),
+    ("consolas", 22, False),
+    ("consolas", 22, True),
+    ("consolas", 26, True),
+    ("consolas", 40, True),
+    ("consolas", 42, True),
+    ("consolas", 44, True),
+    ("consolas", 46, True),
+]
+LAUNCHER_FONT_SIZES = [14, 16, 20, 22, 24, 26, 34, 44, 136]
+
+# Dirty-rect-läge för launcherns scener: statiska delar komponeras en gång
+# till ett cachat lager och bara ändrade områden (stjärnor, ribbon, volym-HUD)
+# skickas med display.update(rects). Av = hela skärmen ritas och flippas.
+DIRTY_RECTS = False
+
+# Intern renderupplösning för launcher + spel, t.ex. (640, 360) eller
+# (960, 540). Allt ritas där och skalas till skärmen en gång per frame.
+# None = rita direkt i skärmens upplösning (som förut).
+RENDER_SIZE = None
+RENDER_SCALE = "nearest"  # "nearest" (heltalsskala, svarta kanter) | "smooth"
+# "software" = vanliga Surface-blits till fönstret. "gpu" = pygame._sdl2
+# Renderer/Texture skalar och presenterar (faller tillbaka till software).
+RENDER_BACKEND = "software"
+
+# Färgdjup: 32, eller 16 för maskiner där minnesbandbredden tar slut först
+# (Pi 3). I 16 bpp blir per-pixel alpha colorkey/ytalpha, se present.py.
+COLOR_DEPTH = int(os.environ.get("ARCADE_DEPTH", "32"))
+
+# Scanline-nivå (se ScanlineFX): "off" | "mult" | "dirty" | "alpha".
+# Sätts per maskin med ARCADE_SCANLINES, byts i drift med F2.
+SCANLINE_TIER = os.environ.get("ARCADE_SCANLINES", "alpha")
+
+# Adaptiv kvalitet (quality.GOVERNOR): sänker effekterna nivå för nivå när
+# frametiden inte räcker, och höjer dem igen när det finns marginal.
+# Ett värde per nivå, nivå 0 = full kvalitet. Spelen kan lägga till egna.
+QUALITY_GOVERNOR = True
+QUALITY_KNOBS = {
+    "stars": (1.0, 0.75, 0.5, 0.3),            # andel av stjärnfältens antal
+    "scanlines": (True, True, False, False),
+    "glow": (True, True, True, False),
+    "particles": (1.0, 0.6, 0.35, 0.15),       # andel av spelens partikeltak
+}
+
 
 # ----------------------------
 # Small utils / caching
@@ -52,7 +107,7 @@ def file_path(fname: str) -> str:
 
 
 def load_font(size: int) -> pygame.font.Font:
-    # Font creation is expensive; cache is handled externally in FontCache.
+    # Font creation is expensive; cache is handled externally in text_render.FONTS.
     try:
         if os.path.exists(ARCADE_FONT_PATH):
             return pygame.font.Font(ARCADE_FONT_PATH, size)
@@ -63,58 +118,26 @@ def load_font(size: int) -> pygame.font.Font:
     return f
 
 # ----------------------------
-# System Volume (pactl) + HUD
+# Volume HUD (pactl körs i volume.VOLUME)
 # ----------------------------
-_VOL_RE = re.compile(r"(\d+)%")
-
-def _pactl(cmd_list):
-    # cmd_list = ["set-sink-volume", "@DEFAULT_SINK@", "50%"] etc
-    try:
-        subprocess.run(
-            ["pactl"] + cmd_list,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
-        return True
-    except Exception:
-        return False
-
-
-def get_system_volume_percent(default=50) -> int:
-    try:
-        out = subprocess.check_output(
-            ["pactl", "get-sink-volume", "@DEFAULT_SINK@"],
-            stderr=subprocess.DEVNULL,
-            text=True,
-        )
-        m = _VOL_RE.search(out)
-        if m:
-            return clamp(int(m.group(1)), 0, 150)  # pactl kan visa >100%
-    except Exception:
-        pass
-    return int(default)
-
-
-def set_system_volume_percent(p: int):
-    p = int(clamp(p, 0, 100))
-    _pactl(["set-sink-volume", "@DEFAULT_SINK@", f"{p}%"])
-    _pactl(["set-sink-mute", "@DEFAULT_SINK@", "0"])
-    return p
-
-
-def change_system_volume(delta: int, cached: int) -> int:
-    # För att slippa läsa varje gång: utgå från cached och sätt direkt.
-    newp = int(clamp(cached + int(delta), 0, 100))
-    return set_system_volume_percent(newp)
-
-
 class VolumeHUD:
+    """
+    Top-right volume box. The frame (background, border, bar track) is
+    drawn once; the box is recomposed only when the value changes, so a
+    visible frame is one blit.
+    """
+    BOX_W, BOX_H = 220, 46
+    PAD = 16
+    BAR = pygame.Rect(12, 24, BOX_W - 24, 12)
+
     def __init__(self, screen):
         self.screen = screen
-        self.value = get_system_volume_percent(50)
+        self.value = VOLUME.value
         self.show_t = 0.0
         self.font = None
+        self._frame = None
+        self._box = None
+        self._box_value = None
 
     def set_value(self, v: int, show_seconds: float = 1.2):
         self.value = int(clamp(v, 0, 100))
@@ -124,74 +147,114 @@ class VolumeHUD:
         if self.show_t > 0:
             self.show_t = max(0.0, self.show_t - dt)
 
-    def draw(self):
-        if self.show_t <= 0:
-            return
+    def _make_frame(self) -> pygame.Surface:
+        box = pygame.Surface((self.BOX_W, self.BOX_H), pygame.SRCALPHA)
+        pygame.draw.rect(box, (0, 0, 0, 140), (0, 0, self.BOX_W, self.BOX_H), border_radius=12)
+        pygame.draw.rect(box, (255, 255, 255, 60), (0, 0, self.BOX_W, self.BOX_H), 2, border_radius=12)
+        pygame.draw.rect(box, (255, 255, 255, 30), self.BAR, border_radius=8)
+        return box
 
+    def _compose(self) -> pygame.Surface:
+        if self._box is not None and self._box_value == self.value:
+            return self._box
         if self.font is None:
             self.font = FONTS.get(14)
+        if self._frame is None:
+            self._frame = self._make_frame()
 
-        w, h = self.screen.get_size()
-
-        # HUD-box uppe till höger
-        box_w, box_h = 220, 46
-        pad = 16
-        x = w - box_w - pad
-        y = pad
-
-        # Bakgrund med alpha
-        box = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
-        pygame.draw.rect(box, (0, 0, 0, 140), (0, 0, box_w, box_h), border_radius=12)
-        pygame.draw.rect(box, (255, 255, 255, 60), (0, 0, box_w, box_h), 2, border_radius=12)
-
-        # Bar
-        bar_x, bar_y = 12, 24
-        bar_w, bar_h = box_w - 24, 12
-        pygame.draw.rect(box, (255, 255, 255, 30), (bar_x, bar_y, bar_w, bar_h), border_radius=8)
-
-        fill_w = int(bar_w * (self.value / 100.0))
-        pygame.draw.rect(box, (140, 200, 255, 180), (bar_x, bar_y, fill_w, bar_h), border_radius=8)
-
+        box = self._frame.copy()
+        bar = self.BAR
+        fill_w = int(bar.w * (self.value / 100.0))
+        pygame.draw.rect(box, (140, 200, 255, 180), (bar.x, bar.y, fill_w, bar.h), border_radius=8)
         label = TEXT.render(self.font, f"VOL {self.value}%", (230, 230, 245))
         box.blit(label, (12, 8))
+        self._box, self._box_value = box, self.value
+        return box
 
-        self.screen.blit(box, (x, y))
-
-class FontCache:
-    def __init__(self):
-        self._fonts = {}
-
-    def get(self, size: int) -> pygame.font.Font:
-        key = size
-        f = self._fonts.get(key)
-        if f is None:
-            f = load_font(size)
-            self._fonts[key] = f
-        return f
-
+    def draw(self):
+        if self.show_t <= 0:
+            return None
+        w, _h = self.screen.get_size()
+        return self.screen.blit(self._compose(), (w - self.BOX_W - self.PAD, self.PAD))
 
 class TextCache:
     """
-    Cache for rendered text surfaces: (font_id, text, color) -> Surface.
-    Use for static labels to avoid render cost each frame.
+    Bounded LRU cache for rendered text surfaces: (font_key, text, color) -> Surface.
+    Use for labels to avoid render cost each frame.
+
+    - font_key is a serial handed out per font object; the cache keeps the
+      font alive, so the key can never be reused the way id(font) can.
+    - Evicts least recently used entries when either max_items or
+      max_bytes (pixel memory of cached surfaces) is exceeded.
     """
-    def __init__(self):
-        self._cache = {}
+    def __init__(self, max_items: int = 512, max_bytes: int = 8 * 1024 * 1024):
+        self.max_items = int(max_items)
+        self.max_bytes = int(max_bytes)
+        self._cache = OrderedDict()  # key -> (Surface, nbytes)
+        self._fonts = {}  # id(font) -> (font, serial)
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _font_key(self, font) -> int:
+        ent = self._fonts.get(id(font))
+        if ent is None:
+            ent = (font, len(self._fonts))
+            self._fonts[id(font)] = ent
+        return ent[1]
+
+    @staticmethod
+    def _nbytes(s: pygame.Surface) -> int:
+        return s.get_width() * s.get_height() * s.get_bytesize()
 
     def render(self, font: pygame.font.Font, text: str, color):
-        key = (id(font), text, color)
-        s = self._cache.get(key)
-        if s is None:
-            s = font.render(text, True, color)
-            self._cache[key] = s
+        key = (self._font_key(font), text, tuple(color))
+        ent = self._cache.get(key)
+        if ent is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return ent[0]
+
+        self.misses += 1
+        s = font.render(text, True, color)
+        n = self._nbytes(s)
+        self._cache[key] = (s, n)
+        self._bytes += n
+        self._evict()
         return s
 
+    def _evict(self):
+        # Behåll alltid minst den nyss renderade ytan.
+        while len(self._cache) > 1 and (len(self._cache) > self.max_items or self._bytes > self.max_bytes):
+            _key, (_s, n) = self._cache.popitem(last=False)
+            self._bytes -= n
+            self.evictions += 1
+
+    def memory_bytes(self) -> int:
+        """Pixel memory currently held by cached surfaces."""
+        return self._bytes
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "items": len(self._cache),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
+
     def clear(self):
         self._cache.clear()
+        self._bytes = 0
 
 
-FONTS = FontCache()
+FONTS = text_render.FONTS
+FONTS.loader = load_font
 TEXT = TextCache()
+SCORES = score_store.STORE
 
 
 # ----------------------------
@@ -226,64 +289,19 @@ def resume_menu_music():
 # ----------------------------
 # Helpers: scores
 # ----------------------------
-def _parse_scores(text: str):
-    text = (text or "").strip()
-    if not text:
-        return []
-    if text.isdigit():
-        return [("AAA", int(text), "")]
-
-    out = []
-    for line in text.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        parts = [p.strip() for p in line.split(",")]
-        if len(parts) >= 2:
-            ini = (parts[0].upper() + "AAA")[:3]
-            try:
-                sc = int(parts[1])
-            except Exception:
-                continue
-            dd = parts[2] if len(parts) >= 3 else ""
-            out.append((ini, sc, dd))
-        else:
-            sp = line.split()
-            if len(sp) >= 2:
-                ini = (sp[0].upper() + "AAA")[:3]
-                try:
-                    sc = int(sp[1])
-                except Exception:
-                    continue
-                out.append((ini, sc, ""))
-    return out
-
-
+# Alla listor går via SCORES (score_store.STORE): filen läses en gång och
+# hålls i minnet tills vi själva skriver eller filen ändras på disk.
 def read_scores_file(fname: str):
     try:
-        with open(file_path(fname), "r", encoding="utf-8") as f:
-            scores = _parse_scores(f.read())
-            scores.sort(key=lambda t: t[1], reverse=True)
-            return scores[:MAX_SCORES]
-    except FileNotFoundError:
-        return []
+        return SCORES.top(fname, MAX_SCORES)
     except Exception:
         return []
 
 
 def add_score_to_file(fname: str, initials: str, score: int):
-    initials = (initials.upper() + "AAA")[:3]
-    score = int(score)
-    d = date.today().isoformat()
-
-    scores = read_scores_file(fname)
-    scores.append((initials, score, d))
-    scores.sort(key=lambda t: t[1], reverse=True)
-    scores = scores[:MAX_SCORES]
-
-    with open(file_path(fname), "w", encoding="utf-8") as f:
-        for ini, sc, dd in scores:
-            f.write(f"{ini},{int(sc)},{dd}\n")
+    # Uppdaterar minnet direkt; själva filen skrivs av score-writer-tråden
+    # (temp-fil + rename, flushas vid exit).
+    SCORES.add(fname, initials, score)
 
 
 # ----------------------------
@@ -306,7 +324,7 @@ def import_game(module_name: str):
     raise ImportError(f"Could not import {module_name}. Last error: {last_err}")
 
 
-def run_game_by_index(screen, index: int):
+def run_game_by_index(screen, index: int, initials: str = None):
     only_game4 = (index == 3)  # game_4
 
     if only_game4:
@@ -317,11 +335,28 @@ def run_game_by_index(screen, index: int):
             pass
 
     mod = import_game(GAME_MODULES[index])
-    result = mod.run(screen)
+    # Spel som sparar sina egna resultat (Game_5) tar initialerna från menyn.
+    if "initials" in inspect.signature(mod.run).parameters:
+        result = mod.run(screen, initials=initials)
+    else:
+        result = mod.run(screen)
 
     if only_game4:
         resume_menu_music()
 
+    # Spelen sätter egen frame-budget; tillbaka till launcherns.
+    GOVERNOR.set_fps(FPS)
+
+    BATCH.clear()
+    if BATCH.flushes:
+        print("Sprite batch:", BATCH.stats())
+        BATCH.reset_stats()
+    new_assets = ASSETS.lines(new_only=True)
+    if new_assets:
+        print("Assets:", ASSETS.stats())
+        for line in new_assets:
+            print("  " + line)
+
     if isinstance(result, dict):
         return {
             "result": result.get("result", "quit"),
@@ -335,10 +370,10 @@ def run_game_by_index(screen, index: int):
 # ----------------------------
 class ScanlinesCache:
     def __init__(self):
-        self._cache = {}  # (w,h,strength,gap)->Surface
+        self._cache = {}  # (kind,w,h,strength,gap)->Surface
 
     def get(self, w, h, strength=32, gap=3):
-        key = (w, h, strength, gap)
+        key = ("alpha", w, h, strength, gap)
         s = self._cache.get(key)
         if s is None:
             s = pygame.Surface((w, h), pygame.SRCALPHA)
@@ -349,6 +384,30 @@ class ScanlinesCache:
             self._cache[key] = s
         return s
 
+    def get_row(self, w, strength=32):
+        """One opaque black scanline in display format with surface alpha."""
+        key = ("row", w, strength)
+        s = self._cache.get(key)
+        if s is None:
+            s = pygame.Surface((w, 1), 0, pygame.display.get_surface())
+            s.fill((0, 0, 0))
+            s.set_alpha(clamp(strength, 0, 255))
+            self._cache[key] = s
+        return s
+
+    def get_mult(self, w, h, strength=32, gap=3):
+        """Opaque overlay for BLEND_RGB_MULT: white, scanlines pre-multiplied."""
+        key = ("mult", w, h, strength, gap)
+        s = self._cache.get(key)
+        if s is None:
+            s = pygame.Surface((w, h))
+            s.fill((255, 255, 255))
+            c = 255 - clamp(strength, 0, 255)
+            for y in range(0, h, gap):
+                s.fill((c, c, c), (0, y, w, 1))
+            self._cache[key] = s
+        return s
+
     def clear(self):
         self._cache.clear()
 
@@ -356,6 +415,81 @@ class ScanlinesCache:
 SCANLINES = ScanlinesCache()
 
 
+class ScanlineFX:
+    """
+    Scanline post-process with selectable tiers:
+      "off"   - no scanlines
+      "mult"  - opaque pre-multiplied overlay blitted with BLEND_RGB_MULT
+                (same look as "alpha", no per-pixel alpha)
+      "dirty" - "mult", and the launcher scenes recompose only the dirty
+                regions from a cached layer even without DIRTY_RECTS
+      "alpha" - full per-pixel alpha overlay
+    In 16-bit mode every tier but "off" blits a surface-alpha row per line.
+    With the GPU presenter every tier but "off" queues the "alpha" overlay
+    as a texture instead (rects are ignored, the whole frame is redrawn).
+    cost[tier] is a running average of ms per frame spent in apply().
+    """
+    TIERS = ("off", "mult", "dirty", "alpha")
+
+    def __init__(self, tier: str = "alpha"):
+        self.tier = None
+        self.set_tier(tier)
+        self.cost = {}
+        self.samples = {}
+
+    def set_tier(self, tier: str):
+        if tier not in self.TIERS:
+            raise ValueError(f"unknown scanline tier: {tier!r}")
+        self.tier = tier
+
+    def cycle(self) -> str:
+        i = self.TIERS.index(self.tier)
+        self.tier = self.TIERS[(i + 1) % len(self.TIERS)]
+        return self.tier
+
+    def apply(self, surf, strength=32, gap=3, rects=None):
+        """Apply to the whole surface, or only to rects."""
+        tier = self.tier
+        if not GOVERNOR.get("scanlines", True):
+            return
+        t0 = time.perf_counter()
+        p = present.active()
+        if tier != "off" and p is not None and p.gpu:
+            p.overlay(SCANLINES.get(*surf.get_size(), strength, gap), (0, 0))
+        elif tier != "off" and low_depth():
+            # 16 bpp: både SRCALPHA-overlay och BLEND_RGB_MULT är
+            # långsamma, en rad med ytalpha per scanline är snabbast.
+            row = SCANLINES.get_row(surf.get_width(), strength)
+            seq = []
+            for r in (surf.get_rect(),) if rects is None else rects:
+                for y in range(r.top + (-r.top) % gap, r.bottom, gap):
+                    seq.append((row, (r.x, y), (0, 0, r.w, 1)))
+            surf.blits(seq, doreturn=False)
+        elif tier != "off":
+            w, h = surf.get_size()
+            if tier == "alpha":
+                overlay, flags = SCANLINES.get(w, h, strength, gap), 0
+            else:
+                overlay, flags = SCANLINES.get_mult(w, h, strength, gap), pygame.BLEND_RGB_MULT
+            if rects is None:
+                surf.blit(overlay, (0, 0), special_flags=flags)
+            else:
+                surf.blits([(overlay, r, r, flags) for r in rects], doreturn=False)
+        self._record(tier, (time.perf_counter() - t0) * 1000.0)
+
+    def _record(self, tier, ms):
+        n = self.samples.get(tier, 0)
+        avg = self.cost.get(tier, ms)
+        self.cost[tier] = ms if n == 0 else avg + (ms - avg) * 0.05
+        self.samples[tier] = n + 1
+
+    def stats(self) -> dict:
+        return {t: round(ms, 3) for t, ms in self.cost.items()}
+
+
+POSTFX = ScanlineFX(SCANLINE_TIER)
+
+
 class GlowCache:
     """
     Cache a glow overlay surface for common rect sizes (icons/keys/boxes).
@@ -380,6 +514,16 @@ class GlowCache:
             self._cache[key] = s
         return s
 
+    def get_ring(self, w, h, base_color, glow=12, corner=18):
+        """get() with the rect itself cleared, for drawing over the box."""
+        key = ("ring", w, h, base_color, glow, corner)
+        s = self._cache.get(key)
+        if s is None:
+            s = self.get(w, h, base_color, glow, corner).copy()
+            pygame.draw.rect(s, (0, 0, 0, 0), (glow, glow, w, h), border_radius=corner)
+            self._cache[key] = s
+        return s
+
     def clear(self):
         self._cache.clear()
 
@@ -387,80 +531,224 @@ class GlowCache:
 GLOW = GlowCache()
 
 
-def draw_scanlines(surf, strength=32, gap=3):
-    w, h = surf.get_size()
-    overlay = SCANLINES.get(w, h, strength, gap)
-    surf.blit(overlay, (0, 0))
+def draw_scanlines(surf, strength=32, gap=3, rects=None):
+    POSTFX.apply(surf, strength, gap, rects)
 
 
 def glow_rect_cached(surf, rect, base_color, glow=12, corner=18):
+    if not GOVERNOR.get("glow", True):
+        return
+    pad = glow
+    p = present.active()
+    if p is not None and p.gpu:
+        # Texturen ritas efter rutan, så bara ringen utanför den. Rutorna
+        # är ogenomskinliga, så det ser ut som glöd under.
+        p.overlay(GLOW.get_ring(rect.w, rect.h, base_color, glow, corner), (rect.x - pad, rect.y - pad))
+        return
     # Blit cached glow overlay centered on rect
     overlay = GLOW.get(rect.w, rect.h, base_color, glow=glow, corner=corner)
-    pad = glow
     surf.blit(overlay, (rect.x - pad, rect.y - pad))
 
 
-class Starfield:
+def blit_rotated_text(surf, font, text, color, center, angle_deg, shadow=True):
+    # Leader ribbon ritas varje frame men texten byts sällan: text via TEXT och
+    # rotation via TRANSFORMS, så en oförändrad etikett blir två blits.
+    if shadow:
+        sh = TEXT.render(font, text, (20, 20, 30))
+        TRANSFORMS.blit(surf, sh, (center[0] + 2, center[1] + 2), angle_deg)
+    base = TEXT.render(font, text, color)
+    TRANSFORMS.blit(surf, base, center, angle_deg)
+
+
+def rotated_text_rect(font, text, color, center, angle_deg, shadow=True) -> pygame.Rect:
+    # Samma cachade ytor som blit_rotated_text, så rect:en är känd före ritning.
+    base = TRANSFORMS.get(TEXT.render(font, text, color), angle_deg)
+    r = base.get_rect(center=(int(center[0]), int(center[1])))
+    return r.union(r.move(2, 2)) if shadow else r
+
+
+# ----------------------------
+# Dirty-rect rendering (DIRTY_RECTS)
+# ----------------------------
+class DirtyRenderer:
     """
-    Optimized starfield:
-    - draw small filled rects instead of circle()
-    - stars count tuned a bit lower by default
+    Collects the rects drawn each frame and presents them with
+    display.update(rects): last frame's rects (to erase) + this frame's.
+    invalidate() makes the next present() a full flip (scene switch,
+    returning from a game). Disabled = always flip.
     """
-    def __init__(self, w, h, count=180):
-        self.w = w
-        self.h = h
-        self.stars = []
-        self.set_count(count)
-
-    def set_count(self, count: int):
-        self.stars.clear()
-        for _ in range(count):
-            x = random.randint(0, self.w)
-            y = random.randint(0, self.h)
-            z = random.random()
-            speed = 50 + 180 * z
-            self.stars.append([x, y, z, speed])
-
-    def resize(self, w, h):
-        self.w = w
-        self.h = h
-        for s in self.stars:
-            s[0] = clamp(s[0], 0, w)
-            s[1] = clamp(s[1], 0, h)
+    def __init__(self, enabled: bool = False):
+        self.enabled = bool(enabled)
+        self.full = True
+        self.prev = []
+        self.cur = []
+        self.frames = 0
+        self.full_frames = 0
+        self.rects_sent = 0
+
+    def invalidate(self):
+        self.full = True
+
+    def mark(self, rect):
+        if rect:
+            self.cur.append(pygame.Rect(rect))
+
+    def mark_many(self, rects):
+        self.cur.extend(rects)
+
+    def present(self):
+        self.frames += 1
+        if not self.enabled or self.full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            rects = self.prev + self.cur
+            pygame.display.update(rects)
+            self.rects_sent += len(rects)
+        self.prev, self.cur = self.cur, []
+        self.full = False
 
-    def update(self, dt):
-        for s in self.stars:
-            s[1] += s[3] * dt
-            if s[1] > self.h + 10:
-                s[0] = random.randint(0, self.w)
-                s[1] = -10
-                s[2] = random.random()
-                s[3] = 50 + 180 * s[2]
-
-    def draw(self, surf):
-        # Using fill with tiny rects is often faster on Pi than draw.circle.
-        for x, y, z, _spd in self.stars:
-            if z < 0.35:
-                r = 1
-            elif z < 0.75:
-                r = 2
-            else:
-                r = 3
-            c = 120 + int(120 * z)
-            surf.fill((c, c, c), (int(x), int(y), r, r))
+    def stats(self) -> dict:
+        return {"frames": self.frames, "full_frames": self.full_frames, "rects": self.rects_sent}
 
 
-def blit_rotated_text(surf, font, text, color, center, angle_deg, shadow=True):
-    # This is not used every frame except leader ribbon; keep as-is but avoid extra work.
-    base = font.render(text, True, color)
-    if shadow:
-        sh = font.render(text, True, (20, 20, 30))
-        sh_r = pygame.transform.rotate(sh, angle_deg)
-        sh_rect = sh_r.get_rect(center=(center[0] + 2, center[1] + 2))
-        surf.blit(sh_r, sh_rect)
-    rot = pygame.transform.rotate(base, angle_deg)
-    rect = rot.get_rect(center=center)
-    surf.blit(rot, rect)
+def merge_rects(rects):
+    """Union overlapping rects, so nothing is blended twice in one frame."""
+    out = []
+    for r in rects:
+        r = pygame.Rect(r)
+        i = r.collidelist(out)
+        while i != -1:
+            r.union_ip(out.pop(i))
+            i = r.collidelist(out)
+        out.append(r)
+    return out
+
+
+def premultiplied_layer(size, fmt: pygame.Surface, draw) -> pygame.Surface:
+    """Run draw(surf) into a premultiplied-alpha layer (blit with BLEND_PREMULTIPLIED)."""
+    # Rita en gång på svart och en gång på vitt: på svart blir färgen
+    # förmultiplicerad med alpha, och skillnaden vitt - svart = (1 - alpha)
+    # * 255. Då blandas halvgenomskinliga kort, glöd och textkanter mot det
+    # som ligger under exakt som när allt ritas direkt.
+    black = pygame.Surface(size, 0, fmt)
+    black.fill((0, 0, 0))
+    draw(black)
+    white = pygame.Surface(size, 0, fmt)
+    white.fill((255, 255, 255))
+    draw(white)
+    white.blit(black, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+
+    layer = black.convert_alpha()
+    if white.get_bytesize() >= 3:
+        red = pygame.surfarray.pixels_red(white)
+    else:
+        red = pygame.surfarray.array3d(white)[:, :, 0]  # 16 bpp
+    pygame.surfarray.pixels_alpha(layer)[:] = 255 - red
+    return layer
+
+
+class LayeredScene:
+    """
+    Base for the launcher scenes. Each frame is:
+      fill -> starfield -> draw_static() -> scanlines -> draw_top()
+    draw_static() may only depend on static_key(); draw_top() is the small
+    per-frame part drawn over the scanlines, and top_rects() says where it
+    lands before it is drawn.
+
+    With an enabled DirtyRenderer (or the "dirty" scanline tier) the static
+    part is kept in a cached, premultiplied-alpha layer (rebuilt when
+    static_key() changes), and only the star/top rects from this frame and
+    the last one are recomposed. Overlays that draw_static() queues on the
+    GPU presenter are kept with the layer and re-queued every frame.
+    """
+    BG = (10, 10, 18)
+    SCANLINE_STRENGTH = 32
+
+    _layer = None
+    _layer_key = None
+    _layer_overlays = ()
+    _prev_stars = ()
+    _marked = 0
+
+    def static_key(self):
+        return ()
+
+    def draw_static(self, surf):
+        pass
+
+    def top_rects(self):
+        return []
+
+    def draw_top(self, surf):
+        pass
+
+    def _static_layer(self):
+        # Kvalitetsnivån ingår: glöd m.m. i lagret följer den.
+        key = (self.w, self.h, GOVERNOR.tier, self.static_key())
+        p = present.active()
+        queue = p.overlays if p is not None and p.gpu else None
+        if self._layer is not None and key == self._layer_key:
+            if queue is not None:
+                queue.extend(self._layer_overlays)
+            return self._layer, False
+        n = len(queue) if queue is not None else 0
+        layer = premultiplied_layer((self.w, self.h), self.screen, self.draw_static)
+        self._layer, self._layer_key = layer, key
+        if queue is not None:
+            # draw_static körs två gånger (svart och vitt), behåll en omgång.
+            self._layer_overlays = queue[n:n + (len(queue) - n) // 2]
+            del queue[n + len(self._layer_overlays):]
+        return layer, True
+
+    def draw(self, renderer=None):
+        screen = self.screen
+        if renderer is None or not (renderer.enabled or POSTFX.tier == "dirty"):
+            screen.fill(self.BG)
+            self.starfield.draw(screen)
+            self.draw_static(screen)
+            draw_scanlines(screen, strength=self.SCANLINE_STRENGTH, gap=3)
+            self.draw_top(screen)
+            return
+
+        layer, rebuilt = self._static_layer()
+        stars = self.starfield.rects()
+        top = self.top_rects()
+        bounds = screen.get_rect()
+
+        # En rect per stjärna som täcker både förra och nya positionen
+        # (inte vid wrap, då hoppar den över hela skärmen).
+        prev_stars, self._prev_stars = self._prev_stars, stars
+        if len(prev_stars) == len(stars):
+            moved = []
+            for p, c in zip(prev_stars, stars):
+                if p.inflate(8, 8).colliderect(c):
+                    moved.append(p.union(c))
+                else:
+                    moved += (p, c)
+        else:
+            moved = list(prev_stars) + stars
+
+        if rebuilt or renderer.full:
+            renderer.invalidate()
+            dirty = [bounds]
+        else:
+            # renderer.prev börjar med förra framens stjärnor (markeras först,
+            # och täcks av moved); resten är ribbon, volym-HUD osv.
+            others = renderer.prev[self._marked:]
+            dirty = [r.clip(bounds) for r in moved + top + others]
+            dirty = merge_rects([r for r in dirty if r.w and r.h])
+
+        for r in dirty:
+            screen.fill(self.BG, r)
+        self.starfield.draw(screen)
+        screen.blits([(layer, r, r, pygame.BLEND_PREMULTIPLIED) for r in dirty], doreturn=False)
+        draw_scanlines(screen, self.SCANLINE_STRENGTH, 3, None if renderer.full else dirty)
+        self.draw_top(screen)
+
+        renderer.mark_many(moved)
+        renderer.mark_many(top)
+        self._marked = len(moved)
 
 
 # ----------------------------
@@ -550,11 +838,23 @@ def make_icon(kind: str, size: int) -> pygame.Surface:
 # ----------------------------
 # Initials keyboard
 # ----------------------------
-class InitialsKeyboard:
+class InitialsKeyboard(LayeredScene):
+    SCANLINE_STRENGTH = 30
+
+    KEY_W = 90
+    KEY_H = 56
+    GAP_X = 14
+    GAP_Y = 12
+
+    # Tangentbordet utan markering, bakat en gång per upplösning och delat
+    # mellan instanserna (en ny skapas för varje highscore).
+    _key_layers = {}
+
     def __init__(self, screen, title: str):
         self.screen = screen
         self.w, self.h = screen.get_size()
-        self.starfield = Starfield(self.w, self.h, count=140)
+        self.starfield = starfield.shared(self.w, self.h)
+        self.star_count = 140
 
         self.title_font = FONTS.get(26)
         self.big_font = FONTS.get(34)
@@ -586,10 +886,49 @@ class InitialsKeyboard:
         self.BOX_BG = (255, 255, 255, 10)
         self.BOX_BG_SEL = (120, 180, 255, 90)
 
+        self._layout()
+
     def resize(self):
         self.w, self.h = self.screen.get_size()
         self.starfield.resize(self.w, self.h)
-        # Clear scanline cache if you like; not necessary.
+        self._layout()
+
+    def _layout(self):
+        """Precompute box and key rects for the current size."""
+        base_y = int(self.h * 0.30)
+        gap = 70
+        start_x = self.w // 2 - gap
+        self.box_rects = [pygame.Rect(start_x + i * gap - 28, base_y - 40, 56, 80) for i in range(3)]
+
+        start_ky = int(self.h * 0.44)
+        self.key_rects = []
+        for row_i, row in enumerate(self.keys):
+            widths = [self.KEY_W * 2 + self.GAP_X if key == "OK" else self.KEY_W for key in row]
+            x = (self.w - (sum(widths) + self.GAP_X * (len(widths) - 1))) // 2
+            y = start_ky + row_i * (self.KEY_H + self.GAP_Y)
+            rects = []
+            for w in widths:
+                rects.append(pygame.Rect(x, y, w, self.KEY_H))
+                x += w + self.GAP_X
+            self.key_rects.append(rects)
+        self.keys_area = self.key_rects[0][0].unionall([r for row in self.key_rects for r in row])
+
+    def _keys_layer(self) -> pygame.Surface:
+        key = (self.w, self.h)
+        layer = self._key_layers.get(key)
+        if layer is None:
+            layer = premultiplied_layer(self.keys_area.size, self.screen, self._draw_keys)
+            self._key_layers[key] = layer
+        return layer
+
+    def _draw_keys(self, surf):
+        ox, oy = self.keys_area.topleft
+        for row, rects in zip(self.keys, self.key_rects):
+            for key, rect in zip(row, rects):
+                rect = rect.move(-ox, -oy)
+                pygame.draw.rect(surf, self.KEY_BG, rect, border_radius=14)
+                label = TEXT.render(self.title_font, key, self.TEXT_NORMAL)
+                surf.blit(label, label.get_rect(center=rect.center))
 
     def _row_len(self, row_i: int) -> int:
         return len(self.keys[row_i])
@@ -638,83 +977,49 @@ class InitialsKeyboard:
         return (None, None)
 
     def update(self, dt):
-        self.starfield.update(dt)
+        self.starfield.update(dt, self.star_count)
 
-    def draw(self):
-        self.screen.fill((10, 10, 18))
-        self.starfield.draw(self.screen)
+    def static_key(self):
+        return (tuple(self.initials), self.pos, self.kx, self.ky)
 
+    def draw_static(self, surf):
         t = TEXT.render(self.title_font, self.title, self.TEXT_TITLE)
-        self.screen.blit(t, t.get_rect(center=(self.w // 2, int(self.h * 0.16))))
-
-        base_y = int(self.h * 0.30)
-        gap = 70
-        start_x = self.w // 2 - gap
-
-        for i in range(3):
-            x = start_x + i * gap
-            rect = pygame.Rect(x - 28, base_y - 40, 56, 80)
+        surf.blit(t, t.get_rect(center=(self.w // 2, int(self.h * 0.16))))
 
+        for i, rect in enumerate(self.box_rects):
             if i == self.pos:
-                glow_rect_cached(self.screen, rect, (120, 180, 255), glow=10, corner=14)
-                pygame.draw.rect(self.screen, self.BOX_BG_SEL, rect, border_radius=14)
+                glow_rect_cached(surf, rect, (120, 180, 255), glow=10, corner=14)
+                pygame.draw.rect(surf, self.BOX_BG_SEL, rect, border_radius=14)
                 col = self.TEXT_SELECTED
             else:
-                pygame.draw.rect(self.screen, self.BOX_BG, rect, border_radius=14)
+                pygame.draw.rect(surf, self.BOX_BG, rect, border_radius=14)
                 col = self.TEXT_NORMAL
 
             ch = TEXT.render(self.big_font, self.initials[i], col)
-            self.screen.blit(ch, ch.get_rect(center=rect.center))
+            surf.blit(ch, ch.get_rect(center=rect.center))
 
-        key_w = 90
-        key_h = 56
-        gap_x = 14
-        gap_y = 12
-        start_ky = int(self.h * 0.44)
-
-        def row_total_width(row):
-            widths = []
-            for key in row:
-                widths.append(key_w * 2 + gap_x if key == "OK" else key_w)
-            return sum(widths) + gap_x * (len(widths) - 1)
-
-        for row_i, row in enumerate(self.keys):
-            row_w = row_total_width(row)
-            start_kx = (self.w - row_w) // 2
-            y = start_ky + row_i * (key_h + gap_y)
-
-            x = start_kx
-            for col_i, key in enumerate(row):
-                w = key_w * 2 + gap_x if key == "OK" else key_w
-                rect = pygame.Rect(x, y, w, key_h)
-                selected = (row_i == self.ky and col_i == self.kx)
-
-                if selected:
-                    glow_rect_cached(self.screen, rect, (120, 180, 255), glow=10, corner=14)
-                    pygame.draw.rect(self.screen, self.KEY_BG_SEL, rect, border_radius=14)
-                    col = self.TEXT_SELECTED
-                else:
-                    pygame.draw.rect(self.screen, self.KEY_BG, rect, border_radius=14)
-                    col = self.TEXT_NORMAL
-
-                label = TEXT.render(self.title_font, key, col)
-                self.screen.blit(label, label.get_rect(center=rect.center))
-
-                x += w + gap_x
+        # Bakade tangenter, sedan bara den markerade ovanpå (glöden når
+        # inte grannarna: glow 10 < mellanrummen 14/12).
+        surf.blit(self._keys_layer(), self.keys_area, special_flags=pygame.BLEND_PREMULTIPLIED)
+        rect = self.key_rects[self.ky][self.kx]
+        glow_rect_cached(surf, rect, (120, 180, 255), glow=10, corner=14)
+        pygame.draw.rect(surf, self.KEY_BG_SEL, rect, border_radius=14)
+        label = TEXT.render(self.title_font, self.keys[self.ky][self.kx], self.TEXT_SELECTED)
+        surf.blit(label, label.get_rect(center=rect.center))
 
         hint = TEXT.render(self.small_font, "Pilar = flytta • Space = välj • ESC = avbryt", (150, 150, 170))
-        self.screen.blit(hint, hint.get_rect(center=(self.w // 2, int(self.h * 0.92))))
-        draw_scanlines(self.screen, strength=30, gap=3)
+        surf.blit(hint, hint.get_rect(center=(self.w // 2, int(self.h * 0.92))))
 
 
 # ----------------------------
 # Score Screen
 # ----------------------------
-class ScoreScreen:
+class ScoreScreen(LayeredScene):
     def __init__(self, screen, title: str, initials: str, score: int):
         self.screen = screen
         self.w, self.h = screen.get_size()
-        self.starfield = Starfield(self.w, self.h, count=160)
+        self.starfield = starfield.shared(self.w, self.h)
+        self.star_count = 160
 
         self.arc_big = FONTS.get(44)
         self.arc_mid = FONTS.get(24)
@@ -738,40 +1043,36 @@ class ScoreScreen:
         return (None, None)
 
     def update(self, dt):
-        self.starfield.update(dt)
-
-    def draw(self):
-        self.screen.fill((10, 10, 18))
-        self.starfield.draw(self.screen)
+        self.starfield.update(dt, self.star_count)
 
+    def draw_static(self, surf):
         t = TEXT.render(self.arc_mid, self.title, (230, 230, 245))
-        self.screen.blit(t, t.get_rect(center=(self.w // 2, int(self.h * 0.18))))
+        surf.blit(t, t.get_rect(center=(self.w // 2, int(self.h * 0.18))))
 
         s = TEXT.render(self.arc_big, "SCORE", (255, 230, 140))
-        self.screen.blit(s, s.get_rect(center=(self.w // 2, int(self.h * 0.34))))
+        surf.blit(s, s.get_rect(center=(self.w // 2, int(self.h * 0.34))))
 
         sc = TEXT.render(self.arc_big, fmt_score(self.score), (235, 235, 255))
-        self.screen.blit(sc, sc.get_rect(center=(self.w // 2, int(self.h * 0.46))))
+        surf.blit(sc, sc.get_rect(center=(self.w // 2, int(self.h * 0.46))))
 
         ini = TEXT.render(self.arc_mid, self.initials, (140, 200, 255))
-        self.screen.blit(ini, ini.get_rect(center=(self.w // 2, int(self.h * 0.60))))
+        surf.blit(ini, ini.get_rect(center=(self.w // 2, int(self.h * 0.60))))
 
         hint = TEXT.render(self.arc_small, "Enter/Space = tillbaka   ESC = tillbaka", (160, 160, 190))
-        self.screen.blit(hint, hint.get_rect(center=(self.w // 2, int(self.h * 0.90))))
-
-        draw_scanlines(self.screen, strength=32, gap=3)
+        surf.blit(hint, hint.get_rect(center=(self.w // 2, int(self.h * 0.90))))
 
 
 # ----------------------------
 # Main Menu + Highscore
 # ----------------------------
-class MainMenu:
+class MainMenu(LayeredScene):
     def __init__(self, screen):
         self.screen = screen
         self.w, self.h = screen.get_size()
 
         # Star count tuned down a bit for Pi
-        self.starfield = Starfield(self.w, self.h, count=180)
+        self.starfield = starfield.shared(self.w, self.h)
+        self.star_count = 180
 
         self.ribbon_font = FONTS.get(20)
         self.title_font = FONTS.get(136)
@@ -838,14 +1139,14 @@ class MainMenu:
 
     def update(self, dt):
         self.pulse_t += dt
-        self.starfield.update(dt)
+        self.starfield.update(dt, self.star_count)
 
-    def draw(self):
-        self.screen.fill((10, 10, 18))
-        self.starfield.draw(self.screen)
+    def static_key(self):
+        return (self.selected,)
 
-        self.screen.blit(self._cached_title, self._cached_title.get_rect(center=(self.w // 2, int(self.h * 0.16))))
-        self.screen.blit(self._cached_subtitle, self._cached_subtitle.get_rect(center=(self.w // 2, int(self.h * 0.24))))
+    def draw_static(self, surf):
+        surf.blit(self._cached_title, self._cached_title.get_rect(center=(self.w // 2, int(self.h * 0.16))))
+        surf.blit(self._cached_subtitle, self._cached_subtitle.get_rect(center=(self.w // 2, int(self.h * 0.24))))
 
         icon = 96
         gap_x = 28
@@ -868,7 +1169,7 @@ class MainMenu:
                 # Ytterram – extremt tydlig
                 outer = r.inflate(10, 10)
                 pygame.draw.rect(
-                    self.screen,
+                    surf,
                     (255, 255, 255),   # helt vit, ingen alpha
                     outer,
                     5,
@@ -879,50 +1180,120 @@ class MainMenu:
 
             else:
                 self.card_bg.set_alpha(255)
-                self.screen.blit(self.card_bg, r.topleft)
+                surf.blit(self.card_bg, r.topleft)
 
             kind, idx, label, icon_surf = item
-            self.screen.blit(icon_surf, icon_surf.get_rect(center=r.center))
+            surf.blit(icon_surf, icon_surf.get_rect(center=r.center))
 
             lab_col = (230, 230, 240) if is_sel else (170, 170, 190)
             lab = TEXT.render(self.item_font, label, lab_col)
-            self.screen.blit(lab, lab.get_rect(center=(r.centerx, r.bottom + 20)))
-
-        draw_scanlines(self.screen, strength=32, gap=3)
-
-        # Leader ribbon (reads file each frame in original; keep functionality but make it cheaper)
-        # We'll read once per second (still "same feature", but not wasting IO).
-        leader = getattr(self, "_leader_cache", None)
-        leader_t = getattr(self, "_leader_cache_t", 999.0)
-        if leader is None or leader_t > 1.0:
-            leader_scores = read_scores_file(COMP_FILE)
-            if leader_scores:
-                ini, sc, _dd = leader_scores[0]
-            else:
-                ini, sc = "---", 0
-            self._leader_cache = (ini, sc)
-            self._leader_cache_t = 0.0
-        else:
-            self._leader_cache_t = leader_t + (1.0 / FPS)
+            surf.blit(lab, lab.get_rect(center=(r.centerx, r.bottom + 20)))
 
-        ini, sc = self._leader_cache
+    def _ribbon(self):
+        # Leader ribbon: SCORES håller listan i minnet, ingen fil-IO per frame.
+        leader = SCORES.leader(COMP_FILE)
+        ini, sc = (leader[0], leader[1]) if leader else ("---", 0)
         label = f"LEADER  {ini}  SCORE  {fmt_score(sc)}"
+        return label, (int(self.w * 0.58), int(self.h * 0.40))
+
+    def top_rects(self):
+        label, center = self._ribbon()
+        return [rotated_text_rect(self.ribbon_font, label, (255, 230, 140), center, -28)]
+
+    def draw_top(self, surf):
+        label, center = self._ribbon()
         blit_rotated_text(
-            self.screen,
+            surf,
             self.ribbon_font,
             label,
             (255, 230, 140),
-            center=(int(self.w * 0.58), int(self.h * 0.40)),
+            center=center,
             angle_deg=-28,
             shadow=True
         )
 
 
-class HighscoreScene:
+class ScoreListView:
+    """
+    Virtualized, scrollable view over one board's full history.
+
+    Only the visible rows plus MARGIN rows on each side are rendered, and
+    they are kept as surfaces until the board's version changes. Scrolling
+    renders just the rows that came into the window.
+    """
+    ROW_H = 34
+    MARGIN = 6
+    COLOR = (220, 220, 240)
+
+    def __init__(self, fname: str, font):
+        self.fname = fname
+        self.font = font
+        self.first = 0          # rank of top visible row
+        self.version = None
+        self.count = 0
+        self._rows = {}         # rank -> Surface
+        self._empty = None
+
+    def _sync(self):
+        v = SCORES.version(self.fname)
+        if v != self.version:
+            self.version = v
+            self.count = SCORES.count(self.fname)
+            self._rows.clear()
+
+    def scroll(self, delta: int, visible: int):
+        self._sync()
+        top = max(0, self.count - visible)
+        self.first = int(clamp(self.first + delta, 0, top))
+
+    def _render_row(self, rank: int, entry, width: int):
+        ini, sc, dd = entry
+        date_txt = dd if dd else "---- -- --"
+        return self.font.render(f"{rank:>{width}}.  {ini}   {fmt_score(sc)}   {date_txt}", True, self.COLOR)
+
+    def _ensure_window(self, visible: int):
+        lo = max(0, self.first - self.MARGIN)
+        hi = min(self.count, self.first + visible + self.MARGIN)
+
+        # släpp rader som scrollat ur fönstret
+        for r in [r for r in self._rows if r < lo or r >= hi]:
+            del self._rows[r]
+
+        missing = [r for r in range(lo, hi) if r not in self._rows]
+        if not missing:
+            return
+        width = max(2, len(str(self.count)))
+        a, b = missing[0], missing[-1] + 1
+        for r, entry in enumerate(SCORES.rows(self.fname, a, b), start=a):
+            if r not in self._rows:
+                self._rows[r] = self._render_row(r + 1, entry, width)
+
+    def draw(self, surf, cx: int, y0: int, visible: int):
+        self._sync()
+        if self.count == 0:
+            if self._empty is None:
+                self._empty = self._render_row(1, ("---", 0, ""), 2)
+            surf.blit(self._empty, self._empty.get_rect(center=(cx, y0)))
+            return
+
+        self.first = int(clamp(self.first, 0, max(0, self.count - visible)))
+        self._ensure_window(visible)
+
+        y = y0
+        for r in range(self.first, min(self.count, self.first + visible)):
+            line = self._rows[r]
+            surf.blit(line, line.get_rect(center=(cx, y)))
+            y += self.ROW_H
+
+
+class HighscoreScene(LayeredScene):
+    SCANLINE_STRENGTH = 30
+
     def __init__(self, screen):
         self.screen = screen
         self.w, self.h = screen.get_size()
-        self.starfield = Starfield(self.w, self.h, count=160)
+        self.starfield = starfield.shared(self.w, self.h)
+        self.star_count = 160
         self.title_font = FONTS.get(26)
         self.item_font = FONTS.get(16)
 
@@ -935,14 +1306,29 @@ class HighscoreScene:
         ]
         self.idx = 0
 
+        # En vy per lista: byte med ←/→ behåller renderade rader och scroll.
+        self.views = [ScoreListView(fname, self.item_font) for fname, _label in self.boards]
+        self.scroll_dir = 0
+        self.scroll_t = 0.0
+
         # Cached hint
-        self._hint = TEXT.render(self.item_font, "←/→ byt lista • ESC tillbaka", (150, 150, 170))
+        self._hint = TEXT.render(self.item_font, "←/→ byt lista • ↑/↓ scrolla • ESC tillbaka", (150, 150, 170))
+        self._pos_key = None
+        self._pos = None
 
     def resize(self):
         self.w, self.h = self.screen.get_size()
         self.starfield.resize(self.w, self.h)
 
+    def visible_rows(self) -> int:
+        return max(1, int((self.h * 0.86 - self.h * 0.30) // ScoreListView.ROW_H) + 1)
+
     def handle_event(self, event):
+        if event.type == pygame.KEYUP:
+            if event.key in (pygame.K_UP, pygame.K_DOWN, pygame.K_w, pygame.K_s):
+                self.scroll_dir = 0
+            return (None, None)
+
         if event.type != pygame.KEYDOWN:
             return (None, None)
 
@@ -953,45 +1339,65 @@ class HighscoreScene:
             self.idx = (self.idx - 1) % len(self.boards)
         elif event.key == pygame.K_RIGHT:
             self.idx = (self.idx + 1) % len(self.boards)
+        elif event.key in (pygame.K_UP, pygame.K_DOWN):
+            self.scroll_dir = -1 if event.key == pygame.K_UP else 1
+            self.scroll_t = 0.0
+            self.views[self.idx].scroll(self.scroll_dir, self.visible_rows())
+        elif event.key in (pygame.K_w, pygame.K_s):
+            # W/S (K3/K5 på joysticken) = en sida i taget
+            page = self.visible_rows()
+            self.views[self.idx].scroll(-page if event.key == pygame.K_w else page, page)
 
         return (None, None)
 
     def update(self, dt):
-        self.starfield.update(dt)
-
-    def draw(self):
-        self.screen.fill((10, 10, 18))
-        self.starfield.draw(self.screen)
-
+        self.starfield.update(dt, self.star_count)
+
+        # Håll inne ↑/↓: auto-repeat som accelererar, så tusentals rader går fort.
+        if self.scroll_dir:
+            self.scroll_t += dt
+            if self.scroll_t > 0.35:
+                rate = 12 + 60 * min(3.0, self.scroll_t - 0.35)
+                step = max(1, int(rate * dt))
+                self.views[self.idx].scroll(self.scroll_dir * step, self.visible_rows())
+
+    def _position_label(self, view, visible):
+        key = (view.fname, view.first, view.count)
+        if key != self._pos_key:
+            self._pos_key = key
+            last = min(view.count, view.first + visible)
+            txt = f"{view.first + 1}-{last} / {view.count}" if view.count else ""
+            self._pos = self.item_font.render(txt, True, (150, 150, 170))
+        return self._pos
+
+    def static_key(self):
+        view = self.views[self.idx]
+        visible = self.visible_rows()
+        view.scroll(0, visible)  # synka version + klampa innan nyckeln tas
+        return (self.idx, view.first, view.version, visible)
+
+    def draw_static(self, surf):
         fname, label = self.boards[self.idx]
         title = TEXT.render(self.title_font, f"HIGHSCORE — {label}", (235, 235, 255))
-        self.screen.blit(title, title.get_rect(center=(self.w // 2, int(self.h * 0.18))))
+        surf.blit(title, title.get_rect(center=(self.w // 2, int(self.h * 0.18))))
 
-        scores = read_scores_file(fname)
-        if not scores:
-            scores = [("---", 0, "")]
+        view = self.views[self.idx]
+        visible = self.visible_rows()
+        view.draw(surf, self.w // 2, int(self.h * 0.30), visible)
 
-        y = int(self.h * 0.30)
-        for i, entry in enumerate(scores, start=1):
-            ini = entry[0]
-            sc = entry[1]
-            dd = entry[2] if len(entry) >= 3 else ""
-            date_txt = dd if dd else "---- -- --"
-            line = TEXT.render(self.item_font, f"{i:>2}.  {ini}   {fmt_score(sc)}   {date_txt}", (220, 220, 240))
-            self.screen.blit(line, line.get_rect(center=(self.w // 2, y)))
-            y += 34
+        pos = self._position_label(view, visible)
+        surf.blit(pos, pos.get_rect(center=(self.w // 2, int(self.h * 0.245))))
 
-        self.screen.blit(self._hint, self._hint.get_rect(center=(self.w // 2, int(self.h * 0.92))))
-        draw_scanlines(self.screen, strength=30, gap=3)
+        surf.blit(self._hint, self._hint.get_rect(center=(self.w // 2, int(self.h * 0.92))))
 
 
 # ----------------------------
 # Competition runner
 # ----------------------------
-def run_competition(screen):
+def run_competition(screen, initials: str = None):
     total = 1
     for i in range(4):
-        res = run_game_by_index(screen, i)
+        res = run_game_by_index(screen, i, initials)
         if res["result"] == "quit":
             return {"result": "quit", "score": total}
         total *= int(res["score"])
@@ -1005,19 +1411,34 @@ def main():
     pygame.mixer.pre_init(44100, -16, 2, 512)
     pygame.init()
 
+    # Alla fonter (launcher + spel) skapas här, en gång per process.
+    FONTS.prewarm(GAME_FONTS, LAUNCHER_FONT_SIZES)
+
+    GOVERNOR.enabled = QUALITY_GOVERNOR
+    GOVERNOR.log = print
+    GOVERNOR.set_fps(FPS)
+    for name, levels in QUALITY_KNOBS.items():
+        GOVERNOR.register(name, levels)
 
     pygame.display.set_caption(TITLE)
 
     # Flags that can help on some setups (esp. Desktop)
     flags = pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF
-    screen = pygame.display.set_mode((0, 0), flags)
+
+    # Spelen får presenter.surface som `screen`; deras display.flip() skalar
+    # den till fönstret.
+    presenter = open_display(RENDER_SIZE, RENDER_SCALE, RENDER_BACKEND, flags, TITLE, COLOR_DEPTH)
+    presenter.install()
+    screen = presenter.surface
     clock = pygame.time.Clock()
 
     menu = MainMenu(screen)
     highs = HighscoreScene(screen)
+    # pactl körs i volymtråden; huvudloopen väntar aldrig på den.
+    VOLUME.start()
     vol_hud = VolumeHUD(screen)
     # valfritt: sätt startvolym direkt när spelet startar
-    vol_hud.set_value(set_system_volume_percent(50), show_seconds=1.5)
+    vol_hud.set_value(VOLUME.set(50), show_seconds=1.5)
 
     enter_down = False
 
@@ -1040,6 +1461,9 @@ def main():
     initials_ui = None
     score_ui = None
 
+    renderer = DirtyRenderer(enabled=DIRTY_RECTS)
+    last_scene = None
+
     while True:
         jk.update()
         dt = clock.tick(FPS) / 1000.0
@@ -1062,15 +1486,19 @@ def main():
                 if event.key == pygame.K_LEFT:
                     enter_down = True
 
+                # F2 = nästa scanline-nivå (+ uppmätt kostnad per nivå)
+                if event.key == pygame.K_F2:
+                    tier = POSTFX.cycle()
+                    renderer.invalidate()
+                    print("Scanlines:", tier, POSTFX.stats())
+
 
 
                 # Enter + Upp/Ner => volym
                 if enter_down and event.key == pygame.K_UP:
-                    newv = change_system_volume(+5, vol_hud.value)
-                    vol_hud.set_value(newv)
+                    vol_hud.set_value(VOLUME.change(+5))
                 elif enter_down and event.key == pygame.K_DOWN:
-                    newv = change_system_volume(-5, vol_hud.value)
-                    vol_hud.set_value(newv)
+                    vol_hud.set_value(VOLUME.change(-5))
 
             elif event.type == pygame.KEYUP:
                 if event.key == pygame.K_LEFT:
@@ -1090,7 +1518,7 @@ def main():
                         pending = None
                         initials_ui = None
 
-                        res = run_game_by_index(screen, idx)
+                        res = run_game_by_index(screen, idx, initials)
                         if res["result"] == "quit":
                             state = "menu"
                             current = menu
@@ -1107,7 +1535,7 @@ def main():
                         pending = None
                         initials_ui = None
 
-                        res = run_competition(screen)
+                        res = run_competition(screen, initials)
                         if res["result"] == "quit":
                             state = "menu"
                             current = menu
@@ -1164,15 +1592,16 @@ def main():
                     continue
 
         # Update & draw
-        if state == "initials":
-            initials_ui.update(dt)
-            initials_ui.draw()
-        else:
-            current.update(dt)
-            current.draw()
+        scene = initials_ui if state == "initials" else current
+        if scene is not last_scene:
+            # Ny scen (eller tillbaka från ett spel): hela skärmen är okänd.
+            renderer.invalidate()
+            last_scene = scene
+        scene.update(dt)
+        scene.draw(renderer)
         vol_hud.update(dt)
-        vol_hud.draw()
-        pygame.display.flip()
+        renderer.mark(vol_hud.draw())
+        renderer.present()
 
 
 
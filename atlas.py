@@ -0,0 +1,189 @@
+# atlas.py
+from collections import OrderedDict
+import pygame
+from present import COLORKEY, convert_sprite, conversion_path
+
+# ----------------------------
+# Sprite atlas
+# ----------------------------
+# Spelens skalade sprites (fågel, rör, spöken, skepp, tintade varianter)
+# packas in i ett eller ett fåtal stora ark per upplösning i stället för
+# många små ytor. region(name) ger en subsurface, en vy in i arket, så
+# befintlig kod (blit, get_rect, TRANSFORMS) fungerar oförändrad; blit()
+# ritar med käll-rect direkt från arket.
+#
+# ATLASES håller färdiga atlaser per (spel, upplösning). Modulen laddas
+# inte om mellan spelstarter, så andra starten varken läser PNG:er eller
+# skalar om.
+#
+# Varje sprite konverteras efter sin alpha-sort (present.convert_sprite)
+# och hamnar på ett ark i samma format: ogenomskinliga på ett convert()-ark,
+# binära på ett colorkey-ark, resten på ett ark med per-pixel alpha.
+#
+# Helskärmsbakgrunder (own_sheet=True) och sprites som inte ryms i max_size
+# får ett eget ark i exakt sin storlek: de delar aldrig ark med småsprites,
+# men cachas per upplösning som resten.
+
+
+class Atlas:
+    """
+    Shelf packer: add() sprites, then build(). Sprites are sorted by
+    height and laid out in rows; a sprite that does not fit starts a new
+    sheet. `padding` transparent pixels separate neighbours so filtered
+    scaling of a region never bleeds into the next one. Sprites larger
+    than max_size (with padding) get an exactly-sized sheet of their own.
+    """
+    def __init__(self, max_size: int = 2048, padding: int = 1, label: str = ""):
+        self.max_size = int(max_size)
+        self.padding = int(padding)
+        self.label = label
+        self.sheets = []
+        self._pending = OrderedDict()  # name -> (Surface, alpha kind, own sheet)
+        self._areas = {}               # name -> (sheet index, Rect)
+        self._regions = {}             # name -> subsurface
+
+    def add(self, name: str, surf: pygame.Surface, kind: str = None, own_sheet: bool = False):
+        """
+        kind: the source image's present.alpha_kind, None = classify surf.
+        own_sheet: keep the sprite out of the shared sheets (backgrounds).
+        """
+        if name in self._pending or name in self._areas:
+            raise ValueError(f"atlas already has a sprite named {name!r}")
+        self._pending[name] = (surf, kind, own_sheet)
+        return self
+
+    def build(self):
+        """Pack everything added so far into new sheet(s)."""
+        groups = OrderedDict((path, []) for path in ("convert", "colorkey", "convert_alpha"))
+        display = pygame.display.get_init() and pygame.display.get_surface() is not None
+        alone = []  # (path, name, surf)
+        limit = self.max_size - 2 * self.padding
+        for name, (surf, kind, own_sheet) in self._pending.items():
+            if display:
+                full = f"{self.label}/{name}" if self.label else name
+                surf = convert_sprite(surf, kind=kind, name=full)
+            path = conversion_path(surf) if display else "convert_alpha"
+            w, h = surf.get_size()
+            if own_sheet or w > limit or h > limit:
+                alone.append((path, name, surf))
+            else:
+                groups[path].append((name, surf))
+        self._pending.clear()
+
+        for path, items in groups.items():
+            for w, h, placed in self._layout(items):
+                self._add_sheet(path, w, h, placed, display)
+        for path, name, surf in alone:
+            self._add_sheet(path, *surf.get_size(), [(name, surf, 0, 0)], display)
+        return self
+
+    def _layout(self, items):
+        pad = self.padding
+        items = sorted(items, key=lambda kv: (-kv[1].get_height(), kv[0]))
+        # Placera först, allokera arken sedan (i exakt storlek).
+        layouts = []  # [(w, h, [(name, surf, x, y), ...])]
+        cur, x, y, row_h, used_w = [], pad, pad, 0, 0
+        for name, surf in items:
+            w, h = surf.get_size()
+            if x + w + pad > self.max_size:
+                x, y, row_h = pad, y + row_h + pad, 0
+            if y + h + pad > self.max_size:
+                layouts.append((used_w, y + row_h + pad, cur))
+                cur, x, y, row_h, used_w = [], pad, pad, 0, 0
+            cur.append((name, surf, x, y))
+            x += w + pad
+            row_h = max(row_h, h)
+            used_w = max(used_w, x)
+        if cur:
+            layouts.append((used_w, y + row_h + pad, cur))
+        return layouts
+
+    def _add_sheet(self, path, w, h, placed, display):
+        if path == "convert_alpha":
+            sheet = pygame.Surface((w, h), pygame.SRCALPHA)
+            sheet.fill((0, 0, 0, 0))
+            for name, surf, sx, sy in placed:
+                # MAX mot genomskinligt svart = exakt kopia, även alpha.
+                sheet.blit(surf, (sx, sy), special_flags=pygame.BLEND_RGBA_MAX)
+            if display:
+                sheet = sheet.convert_alpha()
+        else:
+            # Skärmens format; colorkey-arket har nyckelfärgen som bakgrund
+            # och varje region får colorkey (+ ytalpha) för sig.
+            sheet = pygame.Surface((w, h), 0, pygame.display.get_surface())
+            sheet.fill(COLORKEY if path == "colorkey" else (0, 0, 0))
+            for name, surf, sx, sy in placed:
+                alpha = surf.get_alpha()
+                surf.set_alpha(None)
+                sheet.blit(surf, (sx, sy))
+                surf.set_alpha(alpha)
+            if path == "colorkey":
+                sheet.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        idx = len(self.sheets)
+        self.sheets.append(sheet)
+        for name, surf, sx, sy in placed:
+            rect = pygame.Rect(sx, sy, *surf.get_size())
+            region = sheet.subsurface(rect)
+            if path == "colorkey":
+                region.set_colorkey(COLORKEY, pygame.RLEACCEL)
+                if surf.get_alpha() is not None:
+                    region.set_alpha(surf.get_alpha(), pygame.RLEACCEL)
+            self._areas[name] = (idx, rect)
+            self._regions[name] = region
+
+    def __contains__(self, name) -> bool:
+        return name in self._areas
+
+    def names(self):
+        return list(self._areas)
+
+    def region(self, name: str) -> pygame.Surface:
+        """The sprite as a subsurface of its sheet (same object every call)."""
+        return self._regions[name]
+
+    def area(self, name: str):
+        """(sheet, Rect) for source-rect blits."""
+        idx, rect = self._areas[name]
+        return self.sheets[idx], rect
+
+    def blit(self, dst: pygame.Surface, name: str, pos, special_flags: int = 0) -> pygame.Rect:
+        """Source-rect blit from the sheet; ignores a region's surface alpha."""
+        idx, rect = self._areas[name]
+        return dst.blit(self.sheets[idx], pos, rect, special_flags)
+
+    def stats(self) -> dict:
+        sheet_px = sum(s.get_width() * s.get_height() for s in self.sheets)
+        used_px = sum(r.w * r.h for _i, r in self._areas.values())
+        return {
+            "sprites": len(self._areas),
+            "sheets": [s.get_size() for s in self.sheets],
+            "fill": round(used_px / sheet_px, 2) if sheet_px else 0.0,
+        }
+
+
+class AtlasCache:
+    """(name, size, ...) -> built Atlas; build(atlas) adds the sprites."""
+    def __init__(self, max_items: int = 8):
+        self.max_items = int(max_items)
+        self._cache = OrderedDict()
+        self.builds = 0
+
+    def get(self, key, build, max_size: int = 2048) -> Atlas:
+        a = self._cache.get(key)
+        if a is not None:
+            self._cache.move_to_end(key)
+            return a
+        a = Atlas(max_size, label=str(key[0]))
+        build(a)
+        a.build()
+        self.builds += 1
+        self._cache[key] = a
+        while len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+        return a
+
+    def clear(self):
+        self._cache.clear()
+
+
+ATLASES = AtlasCache()
@@ -0,0 +1,135 @@
+# gfx_cache.py
+import weakref
+from collections import OrderedDict
+import pygame
+
+# ----------------------------
+# Rotation / scale cache
+# ----------------------------
+# pygame.transform.rotate/rotozoom allokerar och filtrerar en ny yta varje
+# anrop. Vinkeln kvantiseras till `step` grader, så en fågel som lutar
+# -25..70 grader blir högst ~50 olika ytor som sedan bara blittas.
+
+
+class TransformCache:
+    """
+    LRU cache: (source surface, quantized angle, scale) -> transformed Surface.
+    Source surfaces are tracked weakly and get a serial key, so a freed
+    surface's id() can never alias a new one.
+    """
+    def __init__(self, step: float = 2.0, max_items: int = 512):
+        self.step = float(step)
+        self.max_items = int(max_items)
+        self._cache = OrderedDict()
+        self._serials = weakref.WeakKeyDictionary()
+        self._next_serial = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _serial(self, src) -> int:
+        s = self._serials.get(src)
+        if s is None:
+            s = self._serials[src] = self._next_serial
+            self._next_serial += 1
+        return s
+
+    def quantize(self, angle: float) -> float:
+        if self.step <= 0:
+            return float(angle) % 360.0
+        return (round(angle / self.step) * self.step) % 360.0
+
+    def get(self, src: pygame.Surface, angle: float, scale: float = 1.0) -> pygame.Surface:
+        qa = self.quantize(angle)
+        scale = round(float(scale), 3)
+        key = (self._serial(src), qa, scale)
+        s = self._cache.get(key)
+        if s is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return s
+
+        self.misses += 1
+        if scale == 1.0:
+            s = pygame.transform.rotate(src, qa)
+            if src.get_colorkey() is not None:
+                # rotate behåller nyckeln men inte RLE-flaggan
+                s.set_colorkey(src.get_colorkey(), pygame.RLEACCEL)
+        else:
+            s = pygame.transform.rotozoom(src, qa, scale)
+        self._cache[key] = s
+        while len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return s
+
+    def prewarm(self, src: pygame.Surface, start: float, stop: float, scale: float = 1.0):
+        """Transform every quantized angle in [start, stop] up front."""
+        step = self.step if self.step > 0 else 1.0
+        a = start
+        while a <= stop + 1e-9:
+            self.get(src, a, scale)
+            a += step
+
+    def blit(self, dst: pygame.Surface, src: pygame.Surface, center, angle: float, scale: float = 1.0):
+        s = self.get(src, angle, scale)
+        return dst.blit(s, s.get_rect(center=(int(center[0]), int(center[1]))))
+
+    def stats(self) -> dict:
+        return {"items": len(self._cache), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self):
+        self._cache.clear()
+
+
+TRANSFORMS = TransformCache()
+
+
+# ----------------------------
+# Static backdrop cache
+# ----------------------------
+# Rutnät, overlay och paneler som ser likadana ut varje frame ritas en gång
+# till en opak yta i skärmens format; sedan är bakgrunden en enda blit.
+# Modulen laddas inte om mellan spelstarter, så lagren överlever dem.
+
+
+class BackgroundCache:
+    """
+    LRU cache: (name, size, layout) -> opaque Surface in `like`'s format.
+    draw(surf) renders the backdrop onto the new surface once; layout is
+    any hashable describing what else the backdrop depends on.
+    """
+    def __init__(self, max_items: int = 8):
+        self.max_items = int(max_items)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, like: pygame.Surface, draw, layout=()) -> pygame.Surface:
+        key = (name, like.get_size(), like.get_bitsize(), layout)
+        s = self._cache.get(key)
+        if s is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return s
+
+        self.misses += 1
+        s = pygame.Surface(like.get_size(), 0, like)
+        draw(s)
+        self._cache[key] = s
+        while len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+        return s
+
+    def blit(self, dst: pygame.Surface, name: str, draw, layout=()):
+        """Cover all of dst with the cached backdrop."""
+        return dst.blit(self.get(name, dst, draw, layout), (0, 0))
+
+    def stats(self) -> dict:
+        return {"items": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        self._cache.clear()
+
+
+BACKGROUNDS = BackgroundCache()
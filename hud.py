@@ -0,0 +1,158 @@
+# hud.py
+import pygame
+import text_render
+
+# ----------------------------
+# Retained-mode HUD widgets
+# ----------------------------
+# Varje widget håller sin färdigrenderade yta och komponerar om den bara
+# när det visade värdet (texten) faktiskt ändras. Texten byggs ur den delade
+# glyf-atlasen (text_render.glyphs), så en timer som ändras varje frame
+# rasteriserar aldrig om några tecken.
+#
+# HUD.draw(surf) blittar alla widgets, för spel som ritar om hela skärmen
+# varje frame. HUD.draw(surf, background) ritar bara om widgets som ändrats
+# (gamla och nya ytan återställs från den statiska bakgrunden först) och
+# returnerar de rektanglarna, så att spelet kan skicka dem till
+# display.update(rects) i stället för att flippa hela skärmen (Game_4).
+
+
+class Widget:
+    def __init__(self, pos=(0, 0), anchor: str = "topleft"):
+        self.pos = (int(pos[0]), int(pos[1]))
+        self.anchor = anchor
+        self.surface = None
+        self.rect = pygame.Rect(self.pos, (0, 0))
+        self.dirty = True
+        self.renders = 0
+        self._drawn_rect = None  # rect vid senaste draw()
+
+    def set_pos(self, pos):
+        pos = (int(pos[0]), int(pos[1]))
+        if pos != self.pos:
+            self.pos = pos
+            self._place()
+            self.dirty = True
+
+    def _place(self):
+        if self.surface is None:
+            self.rect = pygame.Rect(self.pos, (0, 0))
+        else:
+            self.rect = self.surface.get_rect(**{self.anchor: self.pos})
+
+    def _set_surface(self, surf):
+        self.surface = surf
+        self.renders += 1
+        self._place()
+        self.dirty = True
+
+    def draw(self, surf):
+        """Blit the cached surface. Returns the rects that changed, or []."""
+        if self.surface is not None:
+            surf.blit(self.surface, self.rect)
+        return self._changes()
+
+    def _changes(self):
+        if not self.dirty:
+            return []
+        self.dirty = False
+        changed = [self.rect.copy()]
+        if self._drawn_rect is not None and self._drawn_rect != self.rect:
+            changed.append(self._drawn_rect)
+        self._drawn_rect = self.rect.copy()
+        return changed
+
+
+class Label(Widget):
+    """Static (or rarely changing) text."""
+    def __init__(self, font, text: str, color, pos=(0, 0), anchor: str = "topleft"):
+        super().__init__(pos, anchor)
+        self.font = font
+        self.color = color
+        self.text = None
+        self.set_text(text)
+
+    def set_text(self, text: str):
+        text = str(text)
+        if text == self.text:
+            return False
+        self.text = text
+        self._set_surface(text_render.glyphs(self.font, self.color).compose(text))
+        return True
+
+
+class Field(Label):
+    """Bound value shown through fmt; re-renders only when the formatted text changes."""
+    def __init__(self, font, color, pos=(0, 0), fmt: str = "{}", value=None, anchor: str = "topleft"):
+        self.fmt = fmt
+        self.value = value
+        super().__init__(font, fmt.format(value) if value is not None else "", color, pos, anchor)
+
+    def set(self, value):
+        self.value = value
+        return self.set_text(self.fmt.format(value))
+
+
+class HintBlock(Widget):
+    """Several lines baked into one surface (control hints etc.)."""
+    def __init__(self, font, lines, color, pos=(0, 0), line_h: int = None, anchor: str = "topleft"):
+        super().__init__(pos, anchor)
+        self.font = font
+        self.color = color
+        self.line_h = line_h or font.get_linesize()
+        self.lines = None
+        self.set_lines(lines)
+
+    def set_lines(self, lines):
+        lines = tuple(lines)
+        if lines == self.lines:
+            return False
+        self.lines = lines
+        atlas = text_render.glyphs(self.font, self.color)
+        sizes = [atlas.size(s) for s in lines]
+        w = max([sw for sw, _sh in sizes], default=1)
+        h = max(1, self.line_h * (len(sizes) - 1) + (sizes[-1][1] if sizes else 0))
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        for i, s in enumerate(lines):
+            # MAX mot den tomma ytan = exakt kopia av glyferna.
+            surf.blit(atlas.render(s), (0, i * self.line_h), special_flags=pygame.BLEND_RGBA_MAX)
+        self._set_surface(surf)
+        return True
+
+
+class HUD:
+    """Ordered widget container."""
+    def __init__(self):
+        self.widgets = []
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        return widget
+
+    def draw(self, surf, background=None):
+        """
+        Without background: blit every widget (the caller repainted surf).
+        With the static background the HUD sits on: redraw only what
+        changed since the last draw, leaving the rest of surf untouched.
+        Returns the rects that changed since the last draw.
+        """
+        if background is None:
+            dirty = []
+            for w in self.widgets:
+                dirty.extend(w.draw(surf))
+            return dirty
+
+        dirty = [r for w in self.widgets for r in w._changes()]
+        if not dirty:
+            return dirty
+        for r in dirty:
+            surf.blit(background, r, r)
+        # Även oförändrade grannar som återställningen skar i.
+        for w in self.widgets:
+            if w.surface is not None and w.rect.collidelist(dirty) != -1:
+                surf.blit(w.surface, w.rect)
+        return dirty
+
+    def invalidate(self):
+        for w in self.widgets:
+            w.dirty = True
@@ -0,0 +1,134 @@
+# particles.py
+import numpy as np
+import pygame
+from sprite_batch import STAMPS
+
+# ----------------------------
+# NumPy particle engine (Game_1 + Game_4)
+# ----------------------------
+# Partiklarna låg som dicts/objekt och ritades med en ny SRCALPHA-yta per
+# partikel (Game_1) eller via en SRCALPHA-yta i skärmstorlek per frame
+# (Game_4). Här ligger de i arrayer (x, y, vx, vy, life, ttl, size, färg):
+# update är några array-operationer, och draw blittar färdiga cirklar ur
+# STAMPS, nycklade på (radie, alpha-hink, färg), med ett blits-anrop.
+# Inget ritas eller allokeras utanför de levande partiklarnas bounding box.
+
+_rng = np.random.default_rng()
+
+
+def rng():
+    """The engine's random generator (games draw burst parameters from it)."""
+    return _rng
+
+
+class ParticleSystem:
+    """
+    drag:    velocity *= (1 - drag * dt) per step
+    gravity: px/s^2 added to vy per step
+    shrink:  radius = size * (1 - shrink + shrink * life/ttl), at least 1 px
+    buckets: alpha levels (255 * life/ttl is rounded to one of them)
+    """
+    def __init__(self, drag=0.0, gravity=0.0, shrink=0.0, buckets=16):
+        self.drag = float(drag)
+        self.gravity = float(gravity)
+        self.shrink = float(shrink)
+        self.buckets = max(2, int(buckets))
+        self.palette = []  # färgindex -> RGB
+        self._color_idx = {}
+        self.clear()
+
+    def clear(self):
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.vx = np.empty(0)
+        self.vy = np.empty(0)
+        self.life = np.empty(0)
+        self.ttl = np.empty(0)
+        self.size = np.empty(0)
+        self.color = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.x)
+
+    def _color(self, rgb) -> int:
+        rgb = tuple(int(c) for c in rgb[:3])
+        i = self._color_idx.get(rgb)
+        if i is None:
+            i = self._color_idx[rgb] = len(self.palette)
+            self.palette.append(rgb)
+        return i
+
+    def emit(self, x, y, vx, vy, ttl, size, color):
+        """Add particles; every argument but color may be a scalar or an array."""
+        vx = np.asarray(vx, dtype=float)
+        n = int(np.broadcast(vx, np.asarray(vy), np.asarray(ttl), np.asarray(size)).size)
+        if n == 0:
+            return
+
+        def col(v):
+            return np.broadcast_to(np.asarray(v, dtype=float), (n,))
+
+        ttl = col(ttl)
+        self.x = np.concatenate((self.x, col(x)))
+        self.y = np.concatenate((self.y, col(y)))
+        self.vx = np.concatenate((self.vx, col(vx)))
+        self.vy = np.concatenate((self.vy, col(vy)))
+        self.life = np.concatenate((self.life, ttl))
+        self.ttl = np.concatenate((self.ttl, ttl))
+        self.size = np.concatenate((self.size, col(size)))
+        self.color = np.concatenate((self.color, np.full(n, self._color(color), dtype=np.int64)))
+
+    def update(self, dt):
+        if not len(self.x):
+            return
+        self.life -= dt
+        alive = self.life > 0
+        if not alive.all():
+            for name in ("x", "y", "vx", "vy", "life", "ttl", "size", "color"):
+                setattr(self, name, getattr(self, name)[alive])
+        if self.drag:
+            k = 1.0 - self.drag * dt
+            self.vx *= k
+            self.vy *= k
+        if self.gravity:
+            self.vy += self.gravity * dt
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+    def _stamp(self, r, alpha, color):
+        def draw(s):
+            pygame.draw.circle(s, (*self.palette[color], alpha), (r + 1, r + 1), r)
+        surf, _off = STAMPS.custom(("particle", r, alpha, self.palette[color]),
+                                   (2 * r + 2, 2 * r + 2), draw, opaque=False)
+        return surf
+
+    def draw(self, dst: pygame.Surface):
+        """Blit every live particle; returns the covered Rect, or None."""
+        if not len(self.x):
+            return None
+        f = self.life / self.ttl
+        r = np.maximum(1, (self.size * (1.0 - self.shrink + self.shrink * f)).astype(np.int64))
+        levels = self.buckets - 1
+        alpha = ((np.clip(255.0 * f, 0, 255).astype(np.int64) * levels + 127) // 255) * 255 // levels
+        vis = alpha > 0
+        if not vis.all():
+            if not vis.any():
+                return None
+            r, alpha = r[vis], alpha[vis]
+        # trunkerar mot noll, som int()
+        px = self.x[vis].astype(np.int64) - r - 1
+        py = self.y[vis].astype(np.int64) - r - 1
+
+        x0, y0 = int(px.min()), int(py.min())
+        x1, y1 = int((px + 2 * r + 2).max()), int((py + 2 * r + 2).max())
+        box = pygame.Rect(x0, y0, x1 - x0, y1 - y0).clip(dst.get_clip())
+        if not box.w or not box.h:
+            return None
+
+        # En stamp per unik (radie, alpha, färg), sedan ett blits-anrop.
+        keys = np.stack((r, alpha, self.color[vis]), axis=1)
+        uniq, inv = np.unique(keys, axis=0, return_inverse=True)
+        stamps = [self._stamp(int(a), int(b), int(c)) for a, b, c in uniq]
+        dst.blits([(stamps[i], pos) for i, pos in zip(inv.ravel().tolist(), zip(px.tolist(), py.tolist()))],
+                  doreturn=False)
+        return box
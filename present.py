@@ -0,0 +1,441 @@
+# present.py
+import os
+import time
+import weakref
+import numpy as np
+import pygame
+from quality import GOVERNOR
+
+# ----------------------------
+# Virtual resolution + scaled presentation
+# ----------------------------
+# Launchern och spelen ritar på en yta i fast intern upplösning (t.ex.
+# 640x360 eller 960x540). Presenter skalar den till fönstret en gång per
+# frame. Spelen ritar på `screen` de får i run(screen) och anropar
+# pygame.display.flip()/update(); install() styr de anropen hit, så ingen
+# ritkod i spelen behöver ändras.
+#
+# Två backends:
+#   "software" - Presenter: transform.scale/smoothscale in i fönstrets yta
+#   "gpu"      - GpuPresenter: ytan laddas upp till en streaming-textur
+#                (bara ändrade rects) och pygame._sdl2-renderaren skalar
+#                och presenterar. Faller tillbaka till "software" om SDL
+#                inte kan skapa en renderer.
+# Presentern matar också quality.GOVERNOR: varje flip()/update() är slutet
+# på en frame, och CPU-tiden (time.thread_time, huvudtråden) sedan förra
+# presentationen är framens arbetstid. Tick-väntan och vsync-väntan räknas
+# inte. Alla spel presenterar via display.flip/update, så governorn ser
+# varje spel utan att något spel själv behöver anropa sample().
+#
+# Overlays: launcherns scanlines och glöd är cachade ytor som ligger över
+# bilden. Med GPU-backenden köar launchern dem med overlay() i stället för
+# att blitta; varje yta laddas upp EN gång som textur och ritas över
+# frame-texturen vid presentationen. Spelen ritar fortfarande allt på
+# `screen` i ritordning (HUD över sprites), så deras sprites komponeras
+# på CPU:n som förut. active() ger den installerade presentern.
+
+SCALE_MODES = ("nearest", "smooth")
+BACKENDS = ("software", "gpu")
+DEPTHS = (32, 16)
+
+# 16-bit-läget: ytor utan per-pixel alpha får den här färgen som colorkey.
+COLORKEY = (255, 0, 255)
+
+
+# ----------------------------
+# Display depth + sprite conversion
+# ----------------------------
+# Med depth=16 öppnas skärmen i 16 bpp (halva minnesbandbredden för fill,
+# scanlines och skalning på en Pi 3). Cachade ytor konverteras då till
+# skärmens format; per-pixel alpha blir colorkey (+ ytalpha om spriten är
+# halvgenomskinlig), vilket SDL blittar snabbt (RLE) i 16 bpp.
+#
+# Även i 32 bpp väljs formatet efter vad bilden faktiskt använder:
+#   "opaque"   -> convert()        (ingen alpha alls, t.ex. bakgrunder)
+#   "colorkey" -> colorkey+RLE     (bara helt genomskinligt/helt synligt)
+#   "alpha"    -> convert_alpha()  (mjuka kanter, skuggor)
+# Klassa källbilden (alpha_kind) innan den skalas: smoothscale gör 255 till
+# 253 vid nedskalning och ger binära sprites mjuka kanter.
+
+_active = None  # installerad presenter (install/uninstall)
+
+ALPHA_KINDS = ("opaque", "colorkey", "alpha")
+_ALPHA_LO, _ALPHA_HI = 5, 250  # tolerans för smoothscale-avrundning
+
+
+def display_depth() -> int:
+    s = pygame.display.get_surface() if pygame.display.get_init() else None
+    return s.get_bitsize() if s is not None else 32
+
+
+def low_depth() -> bool:
+    return display_depth() <= 16
+
+
+def alpha_kind(surf: pygame.Surface) -> str:
+    """"opaque", "colorkey" (alpha is only ~0 or ~255) or "alpha"."""
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return "opaque" if surf.get_colorkey() is None else "colorkey"
+    a = pygame.surfarray.array_alpha(surf)
+    if a.min() >= _ALPHA_HI:
+        return "opaque"
+    if ((a <= _ALPHA_LO) | (a >= _ALPHA_HI)).all():
+        return "colorkey"
+    return "alpha"
+
+
+def _keyed(surf: pygame.Surface, threshold: int, kind: str) -> pygame.Surface:
+    if not surf.get_flags() & pygame.SRCALPHA:
+        surf = surf.convert_alpha()  # colorkey -> alpha 0
+    a = pygame.surfarray.array_alpha(surf)
+    top = int(a.max())
+    keep = a >= max(1, min(threshold, (top + 1) // 2))
+    out = surf.convert()
+    if not keep.all():
+        px = pygame.surfarray.pixels2d(out)
+        key = out.map_rgb(COLORKEY)
+        px[(px == key) & keep] ^= 1  # synlig pixel med nyckelfärgen: ändra lägsta bit
+        px[~keep] = key
+        del px
+        out.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    # Binär källa: bara en nedtonad variant (t.ex. frusna spöken) ska bli
+    # genomskinlig, inte skalningens mjuka kanter.
+    level = top if kind == "colorkey" or not keep.any() else int(np.median(a[keep]))
+    if level < _ALPHA_HI:
+        out.set_alpha(level, pygame.RLEACCEL)
+    return out
+
+
+def convert_sprite(surf: pygame.Surface, threshold: int = 128, kind: str = None,
+                   name: str = None) -> pygame.Surface:
+    """
+    Convert to display format by alpha kind (alpha_kind(surf) if not
+    given): convert(), colorkey + RLEACCEL, or convert_alpha(). In 16-bit
+    mode "alpha" is keyed too: pixels below `threshold` alpha (relative to
+    the sprite's own max) become the key and the median alpha of the rest
+    becomes surface alpha (for "colorkey", the max alpha). Soft edges
+    become hard. With `name` the result is recorded in ASSETS.
+    """
+    kind = kind or alpha_kind(surf)
+    if kind not in ALPHA_KINDS:
+        raise ValueError(f"unknown alpha kind: {kind!r}")
+    if kind == "opaque":
+        out = surf.convert()
+    elif kind == "alpha" and not low_depth():
+        out = surf.convert_alpha()
+    else:
+        out = _keyed(surf, threshold, kind)
+    if name is not None:
+        ASSETS.note(name, kind, out)
+    return out
+
+
+def conversion_path(surf: pygame.Surface) -> str:
+    """How a converted surface blits: "convert", "colorkey" or "convert_alpha"."""
+    if surf.get_masks()[3]:
+        return "convert_alpha"
+    return "convert" if surf.get_colorkey() is None else "colorkey"
+
+
+class AssetReport:
+    """name -> (source kind, conversion path, size, surface alpha)."""
+    def __init__(self):
+        self._items = {}
+        self._new = []
+
+    def note(self, name: str, kind: str, surf: pygame.Surface):
+        if name not in self._items:
+            self._new.append(name)
+        self._items[name] = (kind, conversion_path(surf), surf.get_size(), surf.get_alpha())
+
+    def lines(self, new_only: bool = False):
+        """One line per asset; new_only = those noted since the last call."""
+        names = self._new if new_only else list(self._items)
+        self._new = []
+        out = []
+        for name in names:
+            kind, path, (w, h), alpha = self._items[name]
+            extra = f" alpha={alpha}" if alpha is not None and path != "convert_alpha" else ""
+            out.append(f"{name:<24} {w}x{h:<6} {kind:<8} -> {path}{extra}")
+        return out
+
+    def stats(self) -> dict:
+        counts = {}
+        for _kind, path, _size, _alpha in self._items.values():
+            counts[path] = counts.get(path, 0) + 1
+        return counts
+
+
+ASSETS = AssetReport()
+
+
+def fit_rect(window_size, size, mode):
+    """(factor, dest Rect): integer factor for nearest, 0 = smooth aspect fit."""
+    ww, wh = window_size
+    vw, vh = size
+    k = min(ww // vw, wh // vh)
+    if mode == "nearest" and k >= 1:
+        factor = k
+        dw, dh = vw * k, vh * k
+    else:
+        factor = 0
+        f = min(ww / vw, wh / vh)
+        dw, dh = max(1, int(vw * f)), max(1, int(vh * f))
+    return factor, pygame.Rect((ww - dw) // 2, (wh - dh) // 2, dw, dh)
+
+
+def _rect_list(rects):
+    if isinstance(rects, pygame.Rect) or (len(rects) == 4 and isinstance(rects[0], (int, float))):
+        return [rects]
+    return rects
+
+
+def active():
+    """The installed presenter, or None."""
+    return _active
+
+
+class Presenter:
+    """
+    window: the real display surface (from set_mode)
+    size:   internal render size, or None = draw straight on the window
+    mode:   "nearest" = integer scale, letterboxed (falls back to smooth
+            when the window is smaller than size)
+            "smooth"  = aspect-fit smoothscale
+    gpu:    False; callers draw overlays themselves (see GpuPresenter)
+    """
+    gpu = False
+
+    def __init__(self, window: pygame.Surface, size=None, mode: str = "nearest"):
+        if mode not in SCALE_MODES:
+            raise ValueError(f"unknown scale mode: {mode!r}")
+        self.window = window
+        self.mode = mode
+        self.size = tuple(size) if size else None
+        self.factor = 1
+        self.dest = window.get_rect()
+        self._dest_surf = None
+        self._orig = None  # (flip, update, get_surface) när installerad
+        self._work_t = None  # thread_time vid förra presentationen
+
+        if self.size is None or self.size == window.get_size():
+            self.size = None
+            self.surface = window
+            return
+
+        self.surface = pygame.Surface(self.size, 0, window)
+        self._layout()
+
+    @property
+    def scaled(self) -> bool:
+        return self.size is not None
+
+    def _layout(self):
+        # factor 0 = icke-heltal: alltid hela ytan via smoothscale
+        self.factor, self.dest = fit_rect(self.window.get_size(), self.size, self.mode)
+        self._dest_surf = self.window.subsurface(self.dest)
+        self.window.fill((0, 0, 0))  # letterbox-kanter, ritas aldrig över
+
+    # -- presentation --
+    def _frame_done(self):
+        now = time.thread_time()
+        if self._work_t is not None:
+            GOVERNOR.sample((now - self._work_t) * 1000.0)
+        self._work_t = now
+
+    def _scale_all(self):
+        # smoothscale kräver 24/32 bpp: 16-bitsläget skalar alltid nearest.
+        if self.factor or self.surface.get_bitsize() < 24:
+            pygame.transform.scale(self.surface, self.dest.size, self._dest_surf)
+        else:
+            pygame.transform.smoothscale(self.surface, self.dest.size, self._dest_surf)
+
+    def flip(self):
+        if self.scaled:
+            self._scale_all()
+        self._display_flip()
+        self._frame_done()
+
+    def update(self, rects=None):
+        if rects is None:
+            return self.flip()
+        rects = _rect_list(rects)
+        if not self.scaled:
+            self._display_update(rects)
+            return self._frame_done()
+        if not self.factor:
+            # smoothscale filtrerar över rect-kanterna: skala hela ytan.
+            return self.flip()
+
+        k = self.factor
+        ox, oy = self.dest.topleft
+        bounds = self.surface.get_rect()
+        src, dst = self.surface, self._dest_surf
+        out = []
+        for r in rects:
+            if not r:
+                continue
+            r = pygame.Rect(r).clip(bounds)
+            if not (r.w and r.h):
+                continue
+            big = pygame.Rect(r.x * k, r.y * k, r.w * k, r.h * k)
+            pygame.transform.scale(src.subsurface(r), big.size, dst.subsurface(big))
+            out.append(big.move(ox, oy))
+        self._display_update(out)
+        self._frame_done()
+
+    def get_surface(self):
+        return self.surface
+
+    # -- display hooks --
+    def _display_flip(self):
+        (self._orig[0] if self._orig else pygame.display.flip)()
+
+    def _display_update(self, rects):
+        (self._orig[1] if self._orig else pygame.display.update)(rects)
+
+    def install(self):
+        """
+        Route pygame.display.flip/update/get_surface through this presenter
+        (also unscaled: the presenter times every frame for the governor).
+        """
+        global _active
+        if self._orig is not None:
+            return
+        d = pygame.display
+        self._orig = (d.flip, d.update, d.get_surface)
+        d.flip, d.update, d.get_surface = self.flip, self.update, self.get_surface
+        _active = self
+
+    def uninstall(self):
+        global _active
+        if self._orig is None:
+            return
+        d = pygame.display
+        d.flip, d.update, d.get_surface = self._orig
+        self._orig = None
+        if _active is self:
+            _active = None
+
+
+class GpuPresenter(Presenter):
+    """
+    pygame._sdl2.video backend. The render surface is uploaded to one
+    streaming texture and the renderer scales it to the window, so the
+    CPU never touches window-sized pixels. update(rects) uploads only
+    those rects. overlay(surf, pos) queues a cached surface (scanlines,
+    glow) for this frame: it is uploaded once as a static texture and
+    drawn over the frame texture, in queue order, at the next present.
+    accelerated: 1 = hardware only, 0 = SDL's software renderer (works
+    headless), -1 = whatever SDL picks.
+    """
+    gpu = True
+
+    def __init__(self, size=None, mode: str = "nearest", title: str = "",
+                 accelerated: int = -1, window_size=None, fullscreen: bool = True):
+        if mode not in SCALE_MODES:
+            raise ValueError(f"unknown scale mode: {mode!r}")
+        from pygame._sdl2 import video
+
+        # convert()/convert_alpha() kräver ett videoläge: en dold 1x1-yta
+        # ger pixelformatet, fönstret vi visar ägs av Renderer.
+        fmt = pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        window_size = tuple(window_size or pygame.display.get_desktop_sizes()[0])
+        self.window = video.Window(title, size=window_size, fullscreen_desktop=fullscreen)
+        try:
+            self.renderer = video.Renderer(self.window, accelerated=accelerated)
+        except Exception:
+            self.window.destroy()
+            raise
+
+        self.mode = mode
+        self.size = tuple(size) if size else window_size
+        self.surface = pygame.Surface(self.size, 0, fmt)
+        self.factor, self.dest = fit_rect(self.window.size, self.size, mode)
+        self._dest_surf = None
+        self._orig = None
+        self._work_t = None
+
+        # Filtret väljs när texturen skapas: nearest för heltalsskala.
+        os.environ["SDL_RENDER_SCALE_QUALITY"] = "0" if self.factor else "1"
+        self.texture = video.Texture(self.renderer, self.size, streaming=True)
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.uploads = 0
+        self.overlays = []  # [(Texture, Rect i intern upplösning)] för nästa present
+        self._textures = weakref.WeakKeyDictionary()  # Surface -> Texture
+        self.texture_uploads = 0
+        self._sx = self.dest.w / self.size[0]
+        self._sy = self.dest.h / self.size[1]
+
+    def overlay(self, surf: pygame.Surface, pos):
+        """
+        Draw surf (a cached surface that never changes) at pos over this
+        frame. The texture is keyed by the surface object, so pass the same
+        object every frame.
+        """
+        tex = self._textures.get(surf)
+        if tex is None:
+            from pygame._sdl2 import video
+            tex = self._textures[surf] = video.Texture.from_surface(self.renderer, surf)
+            self.texture_uploads += 1
+        self.overlays.append((tex, pygame.Rect(pos, surf.get_size())))
+
+    @property
+    def scaled(self) -> bool:
+        return True
+
+    def _present(self):
+        r = self.renderer
+        r.clear()
+        self.texture.draw(dstrect=self.dest)
+        if self.overlays:
+            ox, oy, sx, sy = self.dest.x, self.dest.y, self._sx, self._sy
+            for tex, q in self.overlays:
+                x, y = ox + round(q.x * sx), oy + round(q.y * sy)
+                tex.draw(dstrect=(x, y, ox + round(q.right * sx) - x, oy + round(q.bottom * sy) - y))
+            self.overlays.clear()
+        r.present()
+
+    def flip(self):
+        self.texture.update(self.surface)
+        self.uploads += 1
+        self._present()
+        self._frame_done()
+
+    def update(self, rects=None):
+        if rects is None:
+            return self.flip()
+        bounds = self.surface.get_rect()
+        src, tex = self.surface, self.texture
+        for r in _rect_list(rects):
+            if not r:
+                continue
+            r = pygame.Rect(r).clip(bounds)
+            if r.w and r.h:
+                tex.update(src.subsurface(r), r)
+                self.uploads += 1
+        self._present()
+        self._frame_done()
+
+
+def open_display(size=None, mode: str = "nearest", backend: str = "software",
+                 flags: int = pygame.FULLSCREEN, title: str = "", depth: int = 32):
+    """
+    Open the display and return its presenter. backend "gpu" falls back to
+    the software presenter (and a normal set_mode window) on any failure.
+    depth 16 is a request: the driver may still hand back 32 bpp, and the
+    GPU backend always renders in 32.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown render backend: {backend!r}")
+    if depth not in DEPTHS:
+        raise ValueError(f"unsupported color depth: {depth!r}")
+    if backend == "gpu":
+        try:
+            return GpuPresenter(size, mode, title)
+        except Exception as e:
+            print("GPU backend unavailable, using software:", e)
+    window = pygame.display.set_mode((0, 0), flags, depth if depth != 32 else 0)
+    if depth != 32 and window.get_bitsize() != depth:
+        print(f"{depth}-bit display not available, using {window.get_bitsize()}-bit")
+    return Presenter(window, size, mode)
@@ -0,0 +1,129 @@
+# quality.py
+from collections import deque
+
+# ----------------------------
+# Adaptive quality governor
+# ----------------------------
+# En varm/throttlad Pi tappar frames med effektbudgetar som är satta för en
+# kall. Governorn får arbetstiden per frame (utan tick-väntan) från
+# present.Presenter vid varje flip/update, tittar på en percentil över de
+# senaste framesen och stegar en gemensam kvalitetsnivå upp eller ner, med
+# hysteres så att den inte fladdrar. Effekterna läser sina
+# värden via knobs: GOVERNOR.get("stars", 1.0).
+#
+# Modulen laddas inte om mellan spelstarter, så nivån följer med från
+# launchern in i spelen och tillbaka.
+
+
+class Knob:
+    """One setting with a value per tier (tier 0 = full quality)."""
+    def __init__(self, name: str, levels):
+        if not levels:
+            raise ValueError(f"knob {name!r} needs at least one level")
+        self.name = name
+        self.levels = tuple(levels)
+
+    def at(self, tier: int):
+        return self.levels[min(tier, len(self.levels) - 1)]
+
+
+class Governor:
+    """
+    sample(ms) takes the work time of one frame; present.Presenter calls
+    it on every flip()/update(), so games never sample themselves.
+    Every `interval` frames, once `window` frames are collected, the
+    `percentile` frame time is compared with the budget (1000 / fps):
+      above high * budget for down_after checks in a row -> tier + 1
+      below low * budget for up_after checks in a row   -> tier - 1
+    The window is cleared after every step, so a new tier is judged on
+    its own frames.
+    """
+    def __init__(self, max_tier: int = 3, window: int = 90, interval: int = 30,
+                 percentile: float = 0.9, high: float = 0.9, low: float = 0.55,
+                 down_after: int = 2, up_after: int = 6):
+        self.max_tier = int(max_tier)
+        self.interval = int(interval)
+        self.percentile = float(percentile)
+        self.high = float(high)
+        self.low = float(low)
+        self.down_after = int(down_after)
+        self.up_after = int(up_after)
+
+        self.enabled = True
+        self.tier = 0
+        self.budget_ms = 1000.0 / 30
+        self.last_ms = 0.0  # senast uppmätta percentil
+        self.knobs = {}
+        self.log = None     # t.ex. print; anropas vid varje nivåbyte
+
+        self._times = deque(maxlen=int(window))
+        self._n = 0
+        self._over = 0
+        self._under = 0
+
+    def _reset(self):
+        self._times.clear()
+        self._n = 0
+        self._over = 0
+        self._under = 0
+
+    def set_fps(self, fps: float):
+        budget = 1000.0 / float(fps)
+        if budget != self.budget_ms:
+            self.budget_ms = budget
+            self._reset()
+
+    def register(self, name: str, levels) -> Knob:
+        """Add (or replace, e.g. after a game reload) a knob."""
+        knob = self.knobs[name] = Knob(name, levels)
+        return knob
+
+    def get(self, name: str, default=None):
+        knob = self.knobs.get(name)
+        return default if knob is None else knob.at(self.tier)
+
+    def sample(self, ms: float):
+        if not self.enabled:
+            return
+        times = self._times
+        times.append(float(ms))
+        self._n += 1
+        if self._n < self.interval or len(times) < times.maxlen:
+            return
+        self._n = 0
+
+        p = sorted(times)[int(self.percentile * (len(times) - 1))]
+        self.last_ms = p
+        if p > self.budget_ms * self.high:
+            self._over += 1
+            self._under = 0
+        elif p < self.budget_ms * self.low:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.down_after and self.tier < self.max_tier:
+            self.set_tier(self.tier + 1)
+        elif self._under >= self.up_after and self.tier > 0:
+            self.set_tier(self.tier - 1)
+
+    def set_tier(self, tier: int):
+        tier = max(0, min(self.max_tier, int(tier)))
+        if tier == self.tier:
+            return
+        self.tier = tier
+        self._reset()
+        if self.log is not None:
+            self.log(f"Quality tier {tier}: p{int(self.percentile * 100)} "
+                     f"{self.last_ms:.1f} ms / budget {self.budget_ms:.1f} ms {self.values()}")
+
+    def values(self) -> dict:
+        return {name: k.at(self.tier) for name, k in self.knobs.items()}
+
+    def stats(self) -> dict:
+        return {"tier": self.tier, "p_ms": round(self.last_ms, 2),
+                "budget_ms": round(self.budget_ms, 2), "knobs": self.values()}
+
+
+GOVERNOR = Governor()
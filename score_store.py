@@ -0,0 +1,506 @@
+# score_store.py
+import os
+import time
+import heapq
+import queue
+import atexit
+import bisect
+import threading
+from itertools import chain
+from datetime import date, timedelta
+
+# ----------------------------
+# Config
+# ----------------------------
+MAX_SCORES = 10
+
+# Hur många toppresultat vi håller i minnet per lista (totalt och per dag).
+# Hela historiken ligger kvar i .log-filen.
+TOP_K = 100
+
+LOG_EXT = ".log"
+
+# Hur ofta (sekunder) vi får stat:a en fil för att se om någon annan ändrat den.
+# En stat per sekund är gratis jämfört med att läsa + parsa + sortera varje frame.
+STAT_INTERVAL = 1.0
+
+# Writer-tråden väntar så här länge efter första jobbet för att samla ihop
+# en skur av inskick till en enda skrivning + fsync per fil.
+COALESCE_SEC = 0.25
+
+
+def _norm_initials(initials: str) -> str:
+    return ((initials or "").upper() + "AAA")[:3]
+
+
+def _fmt(entry) -> str:
+    ini, sc, dd = entry
+    return f"{ini},{int(sc)},{dd}\n"
+
+
+def parse_scores(text: str):
+    """
+    Parse a score board text into [(initials, score, iso_date), ...].
+    Accepts "INI,score,date", "INI score" and a single bare integer.
+    Lines starting with "#" are markers (see import_legacy) and skipped.
+    """
+    text = (text or "").strip()
+    if not text:
+        return []
+    if text.isdigit():
+        return [("AAA", int(text), "")]
+
+    out = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) >= 2:
+            ini = _norm_initials(parts[0])
+            try:
+                sc = int(parts[1])
+            except Exception:
+                continue
+            dd = parts[2] if len(parts) >= 3 else ""
+            out.append((ini, sc, dd))
+        else:
+            sp = line.split()
+            if len(sp) >= 2:
+                ini = _norm_initials(sp[0])
+                try:
+                    sc = int(sp[1])
+                except Exception:
+                    continue
+                out.append((ini, sc, ""))
+    return out
+
+
+def _stat_key(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def atomic_write(path: str, text: str):
+    """
+    Crash-safe replace: write a temp file next to the target, fsync it and
+    rename it over the old file. A power cut leaves either the old or the
+    new board, never a truncated one.
+    """
+    d = os.path.dirname(path) or "."
+    tmp = os.path.join(d, f".{os.path.basename(path)}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    try:
+        fd = os.open(d, os.O_RDONLY)
+    except OSError:
+        return  # t.ex. Windows: kan inte öppna kataloger
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ScoreWriter:
+    """
+    Background write-behind thread. submit() never touches the disk; the
+    thread collects a burst of jobs and commits each file once:
+    appends are concatenated in order, replaces keep only the newest text.
+    """
+    def __init__(self, on_commit=None, coalesce: float = COALESCE_SEC):
+        self.on_commit = on_commit
+        self.coalesce = float(coalesce)
+        self._q = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.commits = 0
+        self.submits = 0
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, key, path: str, text: str, append: bool = False):
+        self.submits += 1
+        self._ensure_thread()
+        self._q.put((key, path, text, append))
+
+    def _run(self):
+        while True:
+            job = self._q.get()
+            batch = [job]
+            deadline = time.monotonic() + self.coalesce
+            while True:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=left))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        appends = {}   # path -> [text, ...] i ordning
+        replaces = {}  # path -> senaste text
+        counts = {}    # key -> antal jobb
+        paths = {}     # key -> {path, ...}
+        for key, path, text, append in batch:
+            if append:
+                appends.setdefault(path, []).append(text)
+            else:
+                replaces[path] = text
+            counts[key] = counts.get(key, 0) + 1
+            paths.setdefault(key, set()).add(path)
+
+        failed = set()
+        for path, parts in appends.items():
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(parts))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self.commits += 1
+            except Exception as e:
+                failed.add(path)
+                print("score write error:", path, repr(e))
+
+        for path, text in replaces.items():
+            try:
+                atomic_write(path, text)
+                self.commits += 1
+            except Exception as e:
+                failed.add(path)
+                print("score write error:", path, repr(e))
+
+        if self.on_commit is not None:
+            for key, n in counts.items():
+                self.on_commit(key, n, not (paths[key] & failed))
+
+        for _ in batch:
+            self._q.task_done()
+
+    def flush(self):
+        """Block until every submitted write is on disk (call at shutdown)."""
+        if self._thread is not None and self._thread.is_alive():
+            self._q.join()
+
+
+class _Board:
+    """
+    In-memory index over one game's full score history.
+
+    - top: min-heap with the TOP_K best entries overall
+    - by_day: iso-date -> min-heap with that day's TOP_K best
+    - days: sorted list of iso-dates, so a date range is two bisects
+    - ranked: every item, for paging the whole history. Appends are O(1);
+      the list is sorted once on the first rows() after a change, so a
+      log replay or a burst of inserts costs one (mostly presorted) sort
+    Items are (score, -seq, entry): equal scores rank oldest first, same
+    as the old stable sort. version bumps on every change.
+    """
+    __slots__ = ("top", "by_day", "days", "ranked", "_sorted", "count", "version", "stat", "checked_at", "_views")
+
+    def __init__(self):
+        self.top = []
+        self.by_day = {}
+        self.days = []
+        self.ranked = []
+        self._sorted = True
+        self.count = 0
+        self.version = 0
+        self.stat = None
+        self.checked_at = 0.0
+        self._views = {}
+
+    @staticmethod
+    def _push(heap, item):
+        if len(heap) < TOP_K:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def _index(self, entry):
+        item = (entry[1], -self.count, entry)
+        self.count += 1
+        self._push(self.top, item)
+
+        d = entry[2]
+        if d:
+            heap = self.by_day.get(d)
+            if heap is None:
+                heap = self.by_day[d] = []
+                bisect.insort(self.days, d)
+            self._push(heap, item)
+        return item
+
+    def insert(self, entry):
+        self.extend((entry,))
+
+    def extend(self, entries):
+        for e in entries:
+            self.ranked.append(self._index(e))
+        self._sorted = False
+        self.version += 1
+        self._views.clear()
+
+    def rows(self, start: int, stop: int):
+        """Entries ranked start..stop-1 (0 = best)."""
+        if not self._sorted:
+            # Sorteras först när någon bläddrar i historiken.
+            self.ranked.sort()
+            self._sorted = True
+        n = len(self.ranked)
+        start = max(0, start)
+        stop = min(n, stop)
+        if start >= stop:
+            return []
+        return [it[2] for it in reversed(self.ranked[n - stop:n - start])]
+
+    def query(self, n: int, since: str = None, until: str = None):
+        key = (n, since, until)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        if since is None and until is None:
+            items = heapq.nlargest(n, self.top)
+        else:
+            lo = 0 if since is None else bisect.bisect_left(self.days, since)
+            hi = len(self.days) if until is None else bisect.bisect_right(self.days, until)
+            heaps = [self.by_day[d] for d in self.days[lo:hi]]
+            items = heapq.nlargest(n, chain.from_iterable(heaps))
+
+        view = [it[2] for it in items]
+        self._views[key] = view
+        return view
+
+
+class ScoreStore:
+    """
+    Process-wide score boards kept in memory.
+
+    Every game has an append-only history log (Game_1.log etc.) that is
+    the source of truth, plus the classic top-10 file (Game_1.txt) which
+    is rewritten as a snapshot. Each log is read once; after that it is
+    only re-read when the inode/mtime/size of the log or the .txt changes
+    on disk (stat throttled to STAT_INTERVAL seconds). A .txt that was
+    edited by hand after the last log write wins: its entries become the
+    new top list and the log is rewritten. Inserts and queries are O(log n).
+    """
+    def __init__(self, root: str, max_scores: int = MAX_SCORES, stat_interval: float = STAT_INTERVAL):
+        self.root = root
+        self.max_scores = int(max_scores)
+        self.stat_interval = float(stat_interval)
+        self._boards = {}  # fname -> _Board
+        self._pending = {}  # fname -> writes not yet on disk
+        self._lock = threading.Lock()
+        self.writer = ScoreWriter(on_commit=self._on_commit)
+
+    def path(self, fname: str) -> str:
+        return os.path.join(self.root, fname)
+
+    def log_path(self, fname: str) -> str:
+        return os.path.splitext(self.path(fname))[0] + LOG_EXT
+
+    def _read(self, p: str):
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                return parse_scores(f.read())
+        except Exception:
+            return []
+
+    def _stat(self, fname: str):
+        return (_stat_key(self.log_path(fname)), _stat_key(self.path(fname)))
+
+    def _hand_edited(self, board, stat, top) -> bool:
+        """True if the .txt is newer than the log and no longer matches it."""
+        log_stat, txt_stat = stat
+        if txt_stat is None or txt_stat[1] < log_stat[1]:
+            # Äldre .txt = writern hann inte skriva snapshoten (krasch), loggen gäller.
+            return False
+        return top != board.query(self.max_scores)
+
+    def _load(self, fname: str):
+        board = _Board()
+        log = self.log_path(fname)
+        board.stat = self._stat(fname)
+
+        if board.stat[0] is not None:
+            board.extend(self._read(log))
+            top = self._read(self.path(fname))
+            if self._hand_edited(board, board.stat, top):
+                # Handredigerad topplista: den ersätter loggens topp, historiken
+                # under topp-listan behålls. Loggen skrivs om till det nya läget.
+                top.sort(key=lambda t: t[1], reverse=True)
+                entries = top + board.rows(self.max_scores, board.count)
+                stat, board = board.stat, _Board()
+                board.stat = stat
+                board.extend(entries)
+                self._submit(fname, log, "".join(_fmt(e) for e in entries), append=False)
+        else:
+            # Första gången: så historiken med den gamla topp-10-listan.
+            entries = self._read(self.path(fname))
+            entries.sort(key=lambda t: t[1], reverse=True)
+            if entries:
+                self._submit(fname, log, "".join(_fmt(e) for e in entries), append=True)
+            board.extend(entries)
+
+        board.checked_at = time.monotonic()
+        self._boards[fname] = board
+        return board
+
+    def _board(self, fname: str):
+        board = self._boards.get(fname)
+        if board is None:
+            return self._load(fname)
+
+        now = time.monotonic()
+        if now - board.checked_at >= self.stat_interval:
+            board.checked_at = now
+            with self._lock:
+                # Minnet är nyare än disken medan writern jobbar: läs inte om.
+                if self._pending.get(fname):
+                    return board
+            if self._stat(fname) != board.stat:
+                return self._load(fname)
+        return board
+
+    def _submit(self, fname: str, path: str, text: str, append: bool):
+        with self._lock:
+            self._pending[fname] = self._pending.get(fname, 0) + 1
+        self.writer.submit(fname, path, text, append=append)
+
+    def _on_commit(self, fname, count, ok):
+        # Körs i writer-tråden.
+        with self._lock:
+            left = max(0, self._pending.get(fname, 0) - count)
+            self._pending[fname] = left
+            board = self._boards.get(fname)
+            if board is not None and left == 0 and ok:
+                board.stat = self._stat(fname)
+
+    def top(self, fname: str, n: int = None, since: str = None, until: str = None):
+        """
+        Best-first list of (initials, score, iso_date). since/until are
+        inclusive iso-dates. Cached until the board changes; do not mutate.
+        """
+        n = self.max_scores if n is None else min(int(n), TOP_K)
+        return self._board(fname).query(n, since, until)
+
+    def top_today(self, fname: str, n: int = None):
+        d = date.today().isoformat()
+        return self.top(fname, n, since=d, until=d)
+
+    def top_weekend(self, fname: str, n: int = None):
+        """Top list for Saturday-Sunday of the current week."""
+        today = date.today()
+        sat = today + timedelta(days=5 - today.weekday())
+        sun = sat + timedelta(days=1)
+        return self.top(fname, n, since=sat.isoformat(), until=sun.isoformat())
+
+    def leader(self, fname: str):
+        scores = self.top(fname, 1)
+        return scores[0] if scores else None
+
+    def count(self, fname: str) -> int:
+        return self._board(fname).count
+
+    def version(self, fname: str) -> int:
+        """Changes whenever the board's contents change (cheap to poll)."""
+        return self._board(fname).version
+
+    def rows(self, fname: str, start: int, stop: int):
+        """Slice of the full history by rank (0 = best), any depth."""
+        return self._board(fname).rows(start, stop)
+
+    def add(self, fname: str, initials: str, score: int, day: str = None):
+        entry = (_norm_initials(initials), int(score), day or date.today().isoformat())
+
+        board = self._board(fname)
+        board.insert(entry)
+
+        # Disken tar writer-tråden hand om; UI:t väntar aldrig.
+        self._submit(fname, self.log_path(fname), _fmt(entry), append=True)
+        snapshot = board.query(self.max_scores)
+        self._submit(fname, self.path(fname), "".join(_fmt(e) for e in snapshot), append=False)
+        return snapshot
+
+    def import_legacy(self, fname: str, legacy_fname: str, initials: str = "AAA") -> int:
+        """
+        One-time import of an old bare-integer score file (one score per
+        line, no initials/dates) into fname's history. The old file is
+        renamed to *.migrated once the import is on disk. The entries go
+        to the log together with a "#imported <legacy_fname>" marker, so
+        a failed rename never imports the same scores twice.
+        """
+        src = self.path(legacy_fname)
+        if not os.path.exists(src):
+            return 0
+        try:
+            if os.path.samefile(src, self.path(fname)):
+                return 0  # skiftlägesokänsligt filsystem: samma fil
+        except OSError:
+            pass
+
+        scores = []
+        try:
+            with open(src, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        scores.append(int(line.strip()))
+                    except ValueError:
+                        pass
+        except Exception:
+            return 0
+
+        board = self._board(fname)
+        marker = f"#imported {legacy_fname}\n"
+        entries = [(_norm_initials(initials), sc, "") for sc in sorted(scores, reverse=True)]
+        if entries and self._logged(fname, marker):
+            entries = []  # redan importerad, bara namnbytet misslyckades förra gången
+        if entries:
+            board.extend(entries)
+            self._submit(fname, self.log_path(fname), marker + "".join(_fmt(e) for e in entries), append=True)
+            snapshot = board.query(self.max_scores)
+            self._submit(fname, self.path(fname), "".join(_fmt(e) for e in snapshot), append=False)
+
+        # Engångsjobb: vänta in disken innan gamla filen flyttas undan.
+        self.flush()
+        try:
+            os.replace(src, src + ".migrated")
+        except OSError as e:
+            print("score migrate error:", src, repr(e))
+        return len(entries)
+
+    def _logged(self, fname: str, line: str) -> bool:
+        """True if the log already holds this exact line (after pending writes)."""
+        self.flush()
+        try:
+            with open(self.log_path(fname), "r", encoding="utf-8") as f:
+                return any(l == line for l in f)
+        except OSError:
+            return False
+
+    def flush(self):
+        self.writer.flush()
+
+    def invalidate(self, fname: str = None):
+        if fname is None:
+            self._boards.clear()
+        else:
+            self._boards.pop(fname, None)
+
+
+STORE = ScoreStore(os.path.dirname(os.path.abspath(__file__)))
+atexit.register(STORE.flush)
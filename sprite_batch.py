@@ -0,0 +1,193 @@
+# sprite_batch.py
+import time
+from collections import OrderedDict
+import pygame
+from present import convert_sprite
+
+# ----------------------------
+# Batched sprite drawing
+# ----------------------------
+# Väggar, piller, block och fiender var hundratals blit/draw.rect-anrop per
+# frame, och på en Pi är det Python-overheaden per anrop som kostar, inte
+# pixlarna. Spelen lägger (yta, position) i en SpriteBatch under ritningen
+# och flush() ritar varje lager med ett enda Surface.blits-anrop (fblits
+# där pygame har det). Former (rundade rects, cirklar) blir "stamps": ritas
+# en gång med pygame.draw till en liten yta och blittas sedan, pixel för
+# pixel samma som att rita direkt på skärmen.
+#
+# Modulen laddas inte om mellan spelstarter, så stamps och statistik lever
+# kvar; launchern skriver ut BATCH.stats() när ett spel avslutas.
+
+_HAS_FBLITS = hasattr(pygame.Surface, "fblits")
+
+
+def _opaque(color):
+    # pygame.draw på skärmen (utan per-pixel alpha) ignorerar färgens alpha.
+    return tuple(color[:3])
+
+
+class StampCache:
+    """
+    LRU cache of pre-drawn shapes: key -> (Surface, (dx, dy)).
+    Shapes are drawn with alpha 0 outside and 255 inside (unless
+    opaque=False), so they convert to colorkey surfaces and blitting one
+    gives the same pixels as the draw call (present.convert_sprite).
+    """
+    def __init__(self, max_items: int = 1024):
+        self.max_items = int(max_items)
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _store(self, key, surf, offset):
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            surf = convert_sprite(surf)
+        self._cache[key] = (surf, offset)
+        while len(self._cache) > self.max_items:
+            self._cache.popitem(last=False)
+        return surf, offset
+
+    def _get(self, key):
+        v = self._cache.get(key)
+        if v is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return v
+
+    def rect(self, w: int, h: int, color, radius: int = 0, width: int = 0):
+        color = _opaque(color)
+        key = ("rect", w, h, color, radius, width)
+        v = self._get(key)
+        if v is not None:
+            return v
+        self.misses += 1
+        s = pygame.Surface((max(0, w), max(0, h)), pygame.SRCALPHA)
+        pygame.draw.rect(s, color, (0, 0, w, h), width=width, border_radius=radius)
+        return self._store(key, s, (0, 0))
+
+    def circle(self, r: int, color, width: int = 0):
+        """Offset is relative to the circle's center."""
+        color = _opaque(color)
+        key = ("circle", r, color, width)
+        v = self._get(key)
+        if v is not None:
+            return v
+        self.misses += 1
+        c = r + 1
+        s = pygame.Surface((2 * c + 1, 2 * c + 1), pygame.SRCALPHA)
+        pygame.draw.circle(s, color, (c, c), r, width)
+        box = s.get_bounding_rect()
+        return self._store(key, s.subsurface(box).copy(), (box.x - c, box.y - c))
+
+    def custom(self, key, size, draw, opaque: bool = True):
+        """draw(surf) onto a transparent surface of `size`; cached under key."""
+        key = ("custom", key)
+        v = self._get(key)
+        if v is not None:
+            return v
+        self.misses += 1
+        s = pygame.Surface(size, pygame.SRCALPHA)
+        draw(s)
+        if opaque:
+            a = pygame.surfarray.pixels_alpha(s)
+            a[a > 0] = 255
+            del a
+        return self._store(key, s, (0, 0))
+
+    def stats(self) -> dict:
+        return {"items": len(self._cache), "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        self._cache.clear()
+
+
+STAMPS = StampCache()
+
+
+class SpriteBatch:
+    """
+    Collects blits per layer; flush(dst) draws the layers in ascending
+    order, one blits call each, and empties the batch. Within a layer
+    sprites keep the order they were added in.
+    """
+    def __init__(self, stamps: StampCache = None):
+        self.stamps = stamps or STAMPS
+        self._layers = {}
+        self.flushes = 0
+        self.calls = 0
+        self.sprites = 0
+        self.max_batch = 0
+        self.last_sizes = ()
+        self.flush_ms = 0.0  # glidande medel per flush
+
+    def _seq(self, layer):
+        seq = self._layers.get(layer)
+        if seq is None:
+            seq = self._layers[layer] = []
+        return seq
+
+    def add(self, surf: pygame.Surface, pos, layer: int = 0):
+        self._seq(layer).append((surf, pos))
+
+    def rect(self, rect, color, radius: int = 0, width: int = 0, layer: int = 0):
+        """Batched pygame.draw.rect(dst, color, rect, width, border_radius=radius)."""
+        x, y, w, h = rect
+        if w <= 0 or h <= 0:
+            return
+        surf, _off = self.stamps.rect(w, h, color, radius, width)
+        self._seq(layer).append((surf, (x, y)))
+
+    def circle(self, center, r: int, color, width: int = 0, layer: int = 0):
+        """Batched pygame.draw.circle(dst, color, center, r, width)."""
+        if r < 1:
+            return
+        surf, (dx, dy) = self.stamps.circle(r, color, width)
+        self._seq(layer).append((surf, (center[0] + dx, center[1] + dy)))
+
+    def flush(self, dst: pygame.Surface):
+        if not self._layers:
+            return
+        t0 = time.perf_counter()
+        sizes = []
+        for layer in sorted(self._layers):
+            seq = self._layers[layer]
+            if not seq:
+                continue
+            if _HAS_FBLITS:
+                dst.fblits(seq)
+            else:
+                dst.blits(seq, doreturn=False)
+            sizes.append(len(seq))
+        self._layers.clear()
+
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.flush_ms = ms if not self.flushes else self.flush_ms * 0.95 + ms * 0.05
+        self.flushes += 1
+        self.calls += len(sizes)
+        self.sprites += sum(sizes)
+        self.max_batch = max(self.max_batch, max(sizes, default=0))
+        self.last_sizes = tuple(sizes)
+
+    def clear(self):
+        """Drop anything queued (e.g. after a game exits mid-frame)."""
+        self._layers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "flushes": self.flushes,
+            "blits_calls": self.calls,
+            "sprites": self.sprites,
+            "avg_batch": round(self.sprites / self.calls, 1) if self.calls else 0,
+            "max_batch": self.max_batch,
+            "last_sizes": self.last_sizes,
+            "flush_ms": round(self.flush_ms, 3),
+            "stamps": self.stamps.stats(),
+        }
+
+    def reset_stats(self):
+        self.flushes = self.calls = self.sprites = self.max_batch = 0
+        self.last_sizes = ()
+        self.flush_ms = 0.0
+
+
+BATCH = SpriteBatch()
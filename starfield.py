@@ -0,0 +1,176 @@
+# starfield.py
+import numpy as np
+import pygame
+from quality import GOVERNOR
+
+# ----------------------------
+# Shared NumPy starfield (launcher + Game_5)
+# ----------------------------
+# Alla stjärnor ligger i arrayer (x, y, z, speed): update är några få
+# array-operationer och draw skriver pixlarna direkt via surfarray i
+# stället för en fill()/circle() per stjärna. Launcherns scener delar en
+# instans (shared()), så stjärnorna fortsätter där de var vid scenbyte.
+
+_rng = np.random.default_rng()
+
+
+def _footprint(shape: str, n: int):
+    """(dx, dy) offsets for one star of size class n."""
+    if shape == "square":
+        d = np.arange(n)
+        return np.repeat(d, n), np.tile(d, n)
+    # Samma pixlar som pygame.draw.circle(surf, c, center, n)
+    s = pygame.Surface((2 * n + 3, 2 * n + 3), depth=8)
+    pygame.draw.circle(s, 1, (n + 1, n + 1), n)
+    xs, ys = np.nonzero(pygame.surfarray.array2d(s))
+    return xs - (n + 1), ys - (n + 1)
+
+
+class Starfield:
+    """
+    count:  stars at full quality (scaled by the "stars" quality knob)
+    speed:  (lo, hi) px/s, speed = lo + (hi - lo) * z
+    levels: ((z upper bound, size), ...) in ascending z
+    shape:  "square" (size x size at the star) or "circle" (radius = size)
+    color:  fixed RGB, or None = gray 120 + 120 * z
+    margin: stars respawn at y = -margin after passing h + margin
+    """
+    def __init__(self, w, h, count=180, speed=(50, 230), levels=((0.35, 1), (0.75, 2), (2.0, 3)),
+                 shape="square", color=None, margin=10):
+        self.w = w
+        self.h = h
+        self.speed = speed
+        self.levels = tuple(levels)
+        self.shape = shape
+        self.color = color
+        self.margin = margin
+        self.base_count = int(count)
+
+        self.foot = [_footprint(shape, size) for _z, size in self.levels]
+        self._luts = {}  # pixelformat -> gray LUT
+
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.z = np.empty(0)
+        self.spd = np.empty(0)
+        self._fit(self.base_count)
+
+    # -- population --
+    def _fit(self, n: int):
+        have = len(self.x)
+        if n <= have:
+            self.x, self.y, self.z, self.spd = self.x[:n], self.y[:n], self.z[:n], self.spd[:n]
+            return
+        k = n - have
+        z = _rng.random(k)
+        x = _rng.integers(0, self.w + 1, k).astype(float)
+        y = _rng.integers(0, self.h + 1, k).astype(float)
+        lo, hi = self.speed
+        self.x = np.concatenate((self.x, x))
+        self.y = np.concatenate((self.y, y))
+        self.z = np.concatenate((self.z, z))
+        self.spd = np.concatenate((self.spd, lo + (hi - lo) * z))
+
+    def set_count(self, count: int):
+        self.base_count = int(count)
+
+    def __len__(self):
+        return len(self.x)
+
+    def resize(self, w, h):
+        if (w, h) == (self.w, self.h):
+            return
+        self.w = w
+        self.h = h
+        np.clip(self.x, 0, w, out=self.x)
+        np.clip(self.y, 0, h, out=self.y)
+
+    # -- per frame --
+    def update(self, dt, count=None):
+        """Move all stars; count (if given) replaces base_count, e.g. per scene."""
+        if count is not None:
+            self.base_count = int(count)
+        # Kvalitetsnivån styr hur många av stjärnorna som används.
+        want = int(self.base_count * GOVERNOR.get("stars", 1.0))
+        if want != len(self.x):
+            self._fit(want)
+
+        self.y += self.spd * dt
+        out = self.y > self.h + self.margin
+        k = int(out.sum())
+        if k:
+            z = _rng.random(k)
+            lo, hi = self.speed
+            self.x[out] = _rng.integers(0, self.w + 1, k)
+            self.y[out] = -self.margin
+            self.z[out] = z
+            self.spd[out] = lo + (hi - lo) * z
+
+    def _classes(self):
+        """Size class index per star."""
+        bounds = np.array([zb for zb, _s in self.levels])
+        return np.minimum(np.searchsorted(bounds, self.z, side="right"), len(self.levels) - 1)
+
+    def _colors(self, surf):
+        if self.color is not None:
+            return np.full(len(self.x), surf.map_rgb(self.color), dtype=np.int64)
+        key = (surf.get_bitsize(), surf.get_masks())
+        lut = self._luts.get(key)
+        if lut is None:
+            lut = self._luts[key] = np.array([surf.map_rgb((c, c, c)) for c in range(256)], dtype=np.int64)
+        return lut[(120 + 120 * self.z).astype(np.int64)]
+
+    def draw(self, surf):
+        if not len(self.x):
+            return
+        xi = self.x.astype(np.int64)  # trunkerar mot noll, som int()
+        yi = self.y.astype(np.int64)
+        cls = self._classes()
+        cols = self._colors(surf)
+        w, h = surf.get_size()
+
+        px, py, pc = [], [], []
+        for i, (dx, dy) in enumerate(self.foot):
+            m = cls == i
+            if not m.any():
+                continue
+            px.append((xi[m][:, None] + dx[None, :]).ravel())
+            py.append((yi[m][:, None] + dy[None, :]).ravel())
+            pc.append(np.repeat(cols[m], len(dx)))
+        px = np.concatenate(px)
+        py = np.concatenate(py)
+        pc = np.concatenate(pc)
+        inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+
+        try:
+            pix = pygame.surfarray.pixels2d(surf)
+        except ValueError:
+            # 24-bit ytor saknar pixels2d: en fill per pixel
+            for x, y, c in zip(px[inside], py[inside], pc[inside]):
+                surf.fill(surf.unmap_rgb(int(c)), (int(x), int(y), 1, 1))
+            return
+        pix[px[inside], py[inside]] = pc[inside]
+        del pix  # släpp låset på ytan
+
+    def rects(self):
+        """Rects that draw() covers this frame."""
+        xi = self.x.astype(np.int64)
+        yi = self.y.astype(np.int64)
+        sizes = np.array([s for _z, s in self.levels])[self._classes()]
+        if self.shape == "square":
+            return [pygame.Rect(x, y, s, s) for x, y, s in zip(xi.tolist(), yi.tolist(), sizes.tolist())]
+        return [pygame.Rect(x - s, y - s, 2 * s + 1, 2 * s + 1)
+                for x, y, s in zip(xi.tolist(), yi.tolist(), sizes.tolist())]
+
+
+_shared = None
+
+
+def shared(w, h) -> Starfield:
+    """The launcher's starfield, one instance for all scenes."""
+    global _shared
+    if _shared is None:
+        _shared = Starfield(w, h)
+    else:
+        _shared.resize(w, h)
+    return _shared
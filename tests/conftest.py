@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# Spelen och modulerna ligger platt i repo-roten.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
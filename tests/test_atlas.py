@@ -0,0 +1,66 @@
+# tests/test_atlas.py
+import pygame
+import pytest
+
+from atlas import Atlas
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((64, 64))
+    yield
+    pygame.display.quit()
+
+
+def _sprite(w, h, color, alpha=255):
+    s = pygame.Surface((w, h), pygame.SRCALPHA)
+    s.fill((*color, alpha))
+    return s
+
+
+def _same_pixels(a, b, tol=2):
+    w, h = a.get_size()
+    return (w, h) == b.get_size() and all(
+        abs(ca - cb) <= tol
+        for x in range(0, w, 7) for y in range(0, h, 7)
+        for ca, cb in zip(a.get_at((x, y)), b.get_at((x, y))))
+
+
+def _on_black(surf, blit):
+    dst = pygame.Surface((surf.get_width() + 4, surf.get_height() + 4))
+    dst.fill((0, 0, 0))
+    blit(dst, (2, 2))
+    return dst
+
+
+@pytest.mark.parametrize("alpha", [255, 128])
+def test_sprite_larger_than_max_size_gets_own_sheet(display, alpha):
+    big = _sprite(300, 90, (10, 200, 30), alpha)   # bredare än max_size
+    tall = _sprite(20, 140, (200, 10, 30), alpha)  # högre än max_size
+    small = _sprite(16, 16, (30, 10, 200), alpha)
+    atlas = Atlas(max_size=128, label="test")
+    atlas.add("big", big).add("tall", tall).add("small", small).build()
+
+    assert sorted(atlas.names()) == ["big", "small", "tall"]
+    sizes = atlas.stats()["sheets"]
+    assert (300, 90) in sizes and (20, 140) in sizes
+    assert all(max(s) <= 128 for s in sizes if s not in ((300, 90), (20, 140)))
+
+    for name, src in (("big", big), ("tall", tall), ("small", small)):
+        assert atlas.region(name).get_size() == src.get_size()
+        want = _on_black(src, lambda d, p: d.blit(src, p))
+        got = _on_black(src, lambda d, p: d.blit(atlas.region(name), p))
+        assert _same_pixels(got, want)
+
+
+def test_own_sheet_without_display():
+    pygame.display.quit()
+    bg = _sprite(200, 100, (50, 60, 70))
+    atlas = Atlas(max_size=2048)
+    atlas.add("bg", bg, own_sheet=True).add("bird", _sprite(10, 8, (255, 255, 0))).build()
+
+    assert len(atlas.sheets) == 2
+    sheet, rect = atlas.area("bg")
+    assert sheet.get_size() == (200, 100) and rect.topleft == (0, 0)
+    assert _same_pixels(atlas.region("bg"), bg)
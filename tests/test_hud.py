@@ -0,0 +1,43 @@
+# tests/test_hud.py
+import pygame
+import pytest
+
+import hud
+import text_render
+
+
+@pytest.fixture
+def font():
+    pygame.font.init()
+    return text_render.FONTS.sys("consolas", 18)
+
+
+def test_draw_with_background_redraws_only_changes(font):
+    bg = pygame.Surface((200, 100))
+    bg.fill((10, 20, 30))
+    screen = bg.copy()
+
+    h = hud.HUD()
+    label = h.add(hud.Label(font, "SCORE", (200, 200, 200), (4, 4)))
+    value = h.add(hud.Field(font, (255, 255, 255), (4, 30), value=7))
+    first = h.draw(screen, bg)
+    assert label.rect in first and value.rect in first
+
+    # Inget ändrat: inga rects, skärmen orörd.
+    before = screen.copy()
+    screen.fill((255, 0, 0), label.rect)  # skulle synas om labeln ritades om
+    assert h.draw(screen, bg) == []
+    assert screen.get_at(label.rect.center) == pygame.Color(255, 0, 0)
+
+    screen = before
+    old = value.rect.copy()
+    value.set(123456)
+    dirty = h.draw(screen, bg)
+    assert value.rect in dirty and old in dirty
+    assert label.rect.collidelist(dirty) == -1
+
+    # Samma pixlar som att rita om allt på en ren bakgrund.
+    ref = bg.copy()
+    h.invalidate()
+    h.draw(ref)
+    assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(ref, "RGB")
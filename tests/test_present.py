@@ -0,0 +1,69 @@
+# tests/test_present.py
+import time
+
+import pygame
+import pytest
+
+from present import GpuPresenter, Presenter
+from quality import GOVERNOR
+
+
+@pytest.fixture
+def window():
+    pygame.display.init()
+    yield pygame.display.set_mode((64, 48))
+    pygame.display.quit()
+
+
+def _busy(ms):
+    t = time.thread_time()
+    while (time.thread_time() - t) * 1000 < ms:
+        pass
+
+
+@pytest.mark.parametrize("size", [None, (32, 24)])
+def test_every_present_samples_the_governor(window, size, monkeypatch):
+    samples = []
+    monkeypatch.setattr(GOVERNOR, "sample", samples.append)
+    p = Presenter(window, size)
+    p.install()
+    try:
+        for _ in range(4):
+            _busy(5)
+            pygame.display.flip()
+        time.sleep(0.05)  # väntan (tick/vsync) räknas inte som arbete
+        pygame.display.update([pygame.Rect(0, 0, 8, 8)])
+    finally:
+        p.uninstall()
+
+    assert len(samples) == 4  # första presentationen startar bara klockan
+    assert all(3 <= ms < 40 for ms in samples[:3])
+    assert samples[3] < 20
+
+
+def test_gpu_overlays_upload_once_and_draw_over_the_frame():
+    pygame.display.init()
+    try:
+        p = GpuPresenter((32, 24), "nearest", "t", accelerated=0, window_size=(64, 48), fullscreen=False)
+    except Exception as e:
+        pygame.display.quit()
+        pytest.skip(f"no SDL renderer: {e}")
+    try:
+        p.surface.fill((200, 0, 0))
+        dot = pygame.Surface((4, 4), pygame.SRCALPHA)
+        dot.fill((0, 0, 255, 255))
+        for _ in range(3):
+            p.overlay(dot, (8, 8))
+            p.flip()
+        assert p.texture_uploads == 1
+        assert not p.overlays
+
+        out = p.renderer.to_surface()
+        assert out.get_at((16, 16))[:3] == (0, 0, 255)  # (8, 8) skalat x2
+        assert out.get_at((8, 8))[:3] == (200, 0, 0)
+
+        p.flip()  # kön töms vid varje presentation
+        assert p.renderer.to_surface().get_at((16, 16))[:3] == (200, 0, 0)
+    finally:
+        p.window.destroy()
+        pygame.display.quit()
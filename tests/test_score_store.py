@@ -0,0 +1,108 @@
+# tests/test_score_store.py
+import os
+
+from score_store import ScoreStore, parse_scores
+
+
+def _store(tmp_path):
+    return ScoreStore(str(tmp_path), stat_interval=0.0)
+
+
+def _touch_after(path, other):
+    # Se till att filen ser nyare ut än other även med grov mtime-upplösning.
+    ns = os.stat(other).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(ns, ns))
+
+
+def test_hand_edited_txt_is_picked_up(tmp_path):
+    store = _store(tmp_path)
+    for ini, sc in (("AAA", 10), ("BBB", 30), ("CHT", 9999), ("DDD", 20)):
+        store.add("Game_1.txt", ini, sc, day="2024-01-01")
+    store.flush()
+    assert store.leader("Game_1.txt")[0] == "CHT"
+
+    # Någon plockar bort fuskaren för hand.
+    txt = tmp_path / "Game_1.txt"
+    txt.write_text("BBB,30,2024-01-01\nDDD,20,2024-01-01\nAAA,10,2024-01-01\n", encoding="utf-8")
+    _touch_after(txt, tmp_path / "Game_1.log")
+
+    assert [e[0] for e in store.top("Game_1.txt")] == ["BBB", "DDD", "AAA"]
+
+    # Nästa inskick får inte skriva tillbaka den gamla listan.
+    store.add("Game_1.txt", "EEE", 25, day="2024-01-02")
+    store.flush()
+    saved = parse_scores(txt.read_text(encoding="utf-8"))
+    assert [e[0] for e in saved] == ["BBB", "EEE", "DDD", "AAA"]
+    assert "CHT" not in (tmp_path / "Game_1.log").read_text(encoding="utf-8")
+
+    # En ny store (omstart) ser samma sak.
+    assert _store(tmp_path).top("Game_1.txt") == saved
+
+
+def test_hand_edit_keeps_history_below_top(tmp_path):
+    store = ScoreStore(str(tmp_path), max_scores=2, stat_interval=0.0)
+    for sc in (50, 40, 30, 20):
+        store.add("Game_2.txt", "AAA", sc, day="2024-01-01")
+    store.flush()
+
+    txt = tmp_path / "Game_2.txt"
+    txt.write_text("ZZZ,45,2024-01-01\n", encoding="utf-8")
+    _touch_after(txt, tmp_path / "Game_2.log")
+
+    assert store.rows("Game_2.txt", 0, 10) == [
+        ("ZZZ", 45, "2024-01-01"),
+        ("AAA", 30, "2024-01-01"),
+        ("AAA", 20, "2024-01-01"),
+    ]
+
+
+def test_stale_txt_after_crash_does_not_drop_scores(tmp_path):
+    store = _store(tmp_path)
+    store.add("Game_3.txt", "AAA", 10, day="2024-01-01")
+    store.flush()
+    # Krasch mellan logg och snapshot: loggen har ett resultat som .txt saknar.
+    log = tmp_path / "Game_3.log"
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("BBB,20,2024-01-01\n")
+    _touch_after(log, tmp_path / "Game_3.txt")
+
+    assert [e[0] for e in _store(tmp_path).top("Game_3.txt")] == ["BBB", "AAA"]
+
+
+def test_import_legacy_is_idempotent(tmp_path, monkeypatch):
+    (tmp_path / "game_5.txt").write_text("120\n80\n", encoding="utf-8")
+
+    # Namnbytet till .migrated misslyckas (t.ex. skrivskyddad katalog).
+    real_replace = os.replace
+
+    def no_migrate(src, dst):
+        if dst.endswith(".migrated"):
+            raise PermissionError(dst)
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", no_migrate)
+    assert _store(tmp_path).import_legacy("Game_5.txt", "game_5.txt") == 2
+
+    # Nästa start: samma fil ligger kvar men får inte importeras igen.
+    store = _store(tmp_path)
+    assert store.import_legacy("Game_5.txt", "game_5.txt") == 0
+    assert store.count("Game_5.txt") == 2
+    assert [e[1] for e in store.top("Game_5.txt")] == [120, 80]
+
+    monkeypatch.setattr(os, "replace", real_replace)
+    store.import_legacy("Game_5.txt", "game_5.txt")
+    assert (tmp_path / "game_5.txt.migrated").exists()
+    assert _store(tmp_path).count("Game_5.txt") == 2
+
+
+def test_rows_rank_whole_history(tmp_path):
+    store = _store(tmp_path)
+    scores = [5, 50, 20, 50, 1, 35]
+    for i, sc in enumerate(scores):
+        store.add("Game_4.txt", "ABCDEF"[i] * 3, sc, day="2024-01-01")
+    # Lika poäng: äldst först.
+    assert [e[0] for e in store.rows("Game_4.txt", 0, 10)] == ["BBB", "DDD", "FFF", "CCC", "AAA", "EEE"]
+    store.add("Game_4.txt", "GGG", 40, day="2024-01-02")
+    assert [e[1] for e in store.rows("Game_4.txt", 1, 4)] == [50, 40, 35]
+    store.flush()
+    assert _store(tmp_path).rows("Game_4.txt", 0, 10) == store.rows("Game_4.txt", 0, 10)
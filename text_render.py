@@ -0,0 +1,213 @@
+# text_render.py
+import weakref
+from collections import OrderedDict
+from itertools import accumulate
+import pygame
+
+# ----------------------------
+# Font service (shared by launcher + games)
+# ----------------------------
+# Spelen laddas om med importlib.reload vid varje start, men den här modulen
+# gör inte det. Fonter som skapas här överlever alltså mellan spelstarter,
+# och launchern förvärmer dem vid boot så att ingen SysFont-sökning sker
+# när ett spel startar.
+
+
+class FontService:
+    """
+    Process-wide font cache.
+    - get(size): the launcher's arcade font (via self.loader)
+    - sys(name, size, bold): pygame.font.SysFont, as the games use
+    """
+    def __init__(self, loader=None):
+        self.loader = loader
+        self._fonts = {}
+        self.created = 0
+
+    def get(self, size: int) -> pygame.font.Font:
+        key = ("launcher", size)
+        f = self._fonts.get(key)
+        if f is None:
+            if self.loader is not None:
+                f = self.loader(size)
+            else:
+                f = pygame.font.SysFont("consolas", size, bold=True)
+            self._fonts[key] = f
+            self.created += 1
+        return f
+
+    def sys(self, name: str, size: int, bold: bool = False) -> pygame.font.Font:
+        key = ("sys", name, size, bool(bold))
+        f = self._fonts.get(key)
+        if f is None:
+            f = pygame.font.SysFont(name, size, bold=bold)
+            self._fonts[key] = f
+            self.created += 1
+        return f
+
+    def prewarm(self, sys_specs=(), sizes=()):
+        """sys_specs: [(name, size, bold), ...]; sizes: launcher font sizes."""
+        for name, size, bold in sys_specs:
+            self.sys(name, size, bold)
+        for size in sizes:
+            self.get(size)
+
+    def clear(self):
+        self._fonts.clear()
+
+
+FONTS = FontService()
+
+
+# ----------------------------
+# Glyph atlas text (for HUD text that changes every frame)
+# ----------------------------
+# font.render() rasteriserar hela strängen varje gång. Här rasteriseras varje
+# tecken EN gång per (font, färg) in i en atlas-yta, och strängar byggs sedan
+# med en enda Surface.blits() av delrektanglar. En sträng som ritas igen
+# (t.ex. "SCORE: 120" flera frames i rad) komponeras till en egen yta och
+# blir då en enda blit tills den byts ut.
+
+STRING_CACHE = 48
+
+PREWARM = (
+    " 0123456789"
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "abcdefghijklmnopqrstuvwxyz"
+    ".,:;-+/%()[]!?<>=_#*'\"ÅÄÖåäö•"
+)
+
+
+class GlyphAtlas:
+    """
+    All glyphs of one font in one color, packed side by side on a single
+    SRCALPHA surface. Unknown characters are rasterized on first use.
+    Strings that are drawn again are composed once and kept in a
+    small LRU (STRING_CACHE entries).
+    """
+    def __init__(self, font: pygame.font.Font, color, antialias: bool = True):
+        self.font = font
+        self.color = tuple(color)
+        self.antialias = antialias
+        self.height = font.get_height()
+        self.surface = None
+        self.rects = {}  # ch -> Rect in self.surface
+        self._x = 0
+        self._strings = OrderedDict()  # text -> Surface | None (sedd en gång)
+        self._add(PREWARM)
+
+    def _add(self, chars):
+        new = []
+        for ch in chars:
+            if ch not in self.rects and ch not in (c for c, _g in new):
+                new.append((ch, self.font.render(ch, self.antialias, self.color)))
+        if not new:
+            return
+
+        need = self._x + sum(g.get_width() for _c, g in new)
+        if self.surface is None or need > self.surface.get_width():
+            cap = max(need, 2 * (self.surface.get_width() if self.surface else 0))
+            grown = pygame.Surface((cap, self.height), pygame.SRCALPHA)
+            if self.surface is not None:
+                grown.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.surface = grown
+
+        for ch, g in new:
+            w = g.get_width()
+            # MAX mot en tom (0,0,0,0)-yta = exakt kopia, ingen mörk kant.
+            self.surface.blit(g, (self._x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.rects[ch] = pygame.Rect(self._x, 0, w, self.height)
+            self._x += w
+
+    def _glyph_rects(self, text: str):
+        rects = self.rects
+        try:
+            return [rects[ch] for ch in text]
+        except KeyError:
+            self._add(text)
+            return [rects[ch] for ch in text]
+
+    def size(self, text: str):
+        s = self._strings.get(text)
+        if s is not None:
+            return s.get_size()
+        return (sum(r.w for r in self._glyph_rects(text)), self.height)
+
+    def _blit_glyphs(self, surf, rs, x0: int, y: int):
+        atlas = self.surface
+        xs = accumulate([r.w for r in rs], initial=x0)
+        surf.blits([(atlas, (x, y), r) for x, r in zip(xs, rs)], doreturn=False)
+
+    def compose(self, text: str) -> pygame.Surface:
+        """
+        New surface with text composed from the atlas (not cached), for
+        callers that keep their own retained surface, e.g. the hud widgets.
+        """
+        rs = self._glyph_rects(text)
+        surf = pygame.Surface((max(1, sum(r.w for r in rs)), self.height), pygame.SRCALPHA)
+        self._blit_glyphs_max(surf, rs)
+        return surf
+
+    def render(self, text: str) -> pygame.Surface:
+        """Composed surface for text (cached)."""
+        strings = self._strings
+        s = strings.get(text)
+        if s is None:
+            s = strings[text] = self.compose(text)
+            if len(strings) > STRING_CACHE:
+                strings.popitem(last=False)
+        strings.move_to_end(text)
+        return s
+
+    def _blit_glyphs_max(self, surf, rs):
+        atlas = self.surface
+        xs = accumulate([r.w for r in rs], initial=0)
+        mx = pygame.BLEND_RGBA_MAX
+        surf.blits([(atlas, (x, 0), r, mx) for x, r in zip(xs, rs)], doreturn=False)
+
+    def draw(self, surf: pygame.Surface, text: str, pos) -> pygame.Rect:
+        """Blit text with its top-left at pos. Returns the covered rect."""
+        x0, y = int(pos[0]), int(pos[1])
+        strings = self._strings
+        if text in strings:
+            s = self.render(text)
+            return surf.blit(s, (x0, y))
+
+        # Första gången: rita glyferna direkt, komponera om strängen kommer igen.
+        strings[text] = None
+        if len(strings) > STRING_CACHE:
+            strings.popitem(last=False)
+        rs = self._glyph_rects(text)
+        if rs:
+            self._blit_glyphs(surf, rs, x0, y)
+        return pygame.Rect(x0, y, sum(r.w for r in rs), self.height)
+
+    def draw_centered(self, surf: pygame.Surface, text: str, center) -> pygame.Rect:
+        w, h = self.size(text)
+        return self.draw(surf, text, (int(center[0]) - w // 2, int(center[1]) - h // 2))
+
+
+class GlyphCache:
+    """(font, color) -> GlyphAtlas. Fonts are weak keys, so atlases die with their font."""
+    def __init__(self):
+        self._atlases = weakref.WeakKeyDictionary()  # font -> {color: GlyphAtlas}
+
+    def get(self, font: pygame.font.Font, color) -> GlyphAtlas:
+        per_font = self._atlases.get(font)
+        if per_font is None:
+            per_font = self._atlases[font] = {}
+        key = tuple(color)
+        atlas = per_font.get(key)
+        if atlas is None:
+            atlas = per_font[key] = GlyphAtlas(font, key)
+        return atlas
+
+    def clear(self):
+        self._atlases.clear()
+
+
+GLYPHS = GlyphCache()
+
+
+def glyphs(font: pygame.font.Font, color) -> GlyphAtlas:
+    return GLYPHS.get(font, color)
@@ -0,0 +1,113 @@
+# volume.py
+import re
+import threading
+import subprocess
+
+# ----------------------------
+# System volume (pactl) in a worker thread
+# ----------------------------
+# pactl tar 10-50 ms per anrop på en Pi, och tidigare körde vi två per
+# knapptryck direkt i huvudloopen. Nu sätter change()/set() bara ett mål
+# och returnerar direkt; tråden skriver senaste målet med ett anrop, så en
+# skur av tryck medan pactl kör blir ett enda anrop.
+
+_VOL_RE = re.compile(r"(\d+)%")
+
+
+def clamp(x, a, b):
+    return a if x < a else b if x > b else x
+
+
+def _pactl(cmd_list):
+    # cmd_list = ["set-sink-volume", "@DEFAULT_SINK@", "50%"] etc
+    try:
+        subprocess.run(
+            ["pactl"] + cmd_list,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        return True
+    except Exception:
+        return False
+
+
+def get_system_volume_percent(default=50) -> int:
+    try:
+        out = subprocess.check_output(
+            ["pactl", "get-sink-volume", "@DEFAULT_SINK@"],
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        m = _VOL_RE.search(out)
+        if m:
+            return clamp(int(m.group(1)), 0, 150)  # pactl kan visa >100%
+    except Exception:
+        pass
+    return int(default)
+
+
+def set_system_volume_percent(p: int, unmute: bool = True):
+    p = int(clamp(p, 0, 100))
+    _pactl(["set-sink-volume", "@DEFAULT_SINK@", f"{p}%"])
+    if unmute:
+        _pactl(["set-sink-mute", "@DEFAULT_SINK@", "0"])
+    return p
+
+
+class VolumeWorker:
+    """
+    Background volume control. `value` is the published level: it is
+    updated at once by set()/change() and by the initial read, so
+    callers never wait on pactl. The thread applies only the newest
+    target and unmutes the sink in the same write (as before: it may
+    have been muted from outside since the last press).
+    """
+    def __init__(self, default: int = 50):
+        self.value = int(default)
+        self.ready = False   # True när första läsningen eller skrivningen är klar
+        self.writes = 0
+        self.requests = 0
+        self._target = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        """Start the thread; it reads the current level first."""
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="volume", daemon=True)
+                self._thread.start()
+
+    def set(self, p: int) -> int:
+        with self._cond:
+            self.value = self._target = int(clamp(p, 0, 100))
+            self.requests += 1
+            self._cond.notify()
+            return self.value
+
+    def change(self, delta: int) -> int:
+        # Utgå från publicerat värde (= senaste målet), inte från pactl.
+        return self.set(self.value + int(delta))
+
+    def _run(self):
+        v = get_system_volume_percent(self.value)
+        with self._cond:
+            if self._target is None:
+                self.value = int(clamp(v, 0, 100))
+                self.ready = True
+        while True:
+            with self._cond:
+                while self._target is None:
+                    self._cond.wait()
+                p, self._target = self._target, None
+            set_system_volume_percent(p)
+            with self._cond:
+                self.writes += 1
+                self.ready = True
+
+    def stats(self) -> dict:
+        return {"value": self.value, "requests": self.requests, "writes": self.writes}
+
+
+VOLUME = VolumeWorker()